@@ -0,0 +1,183 @@
+"""
+Times how long it takes to draw each screen of the game, on each resolution, with no window.
+
+Run it from the root of the project:
+
+    python -m benchmarks.frame_times --frames 200
+    python -m benchmarks.frame_times --save-baseline
+    python -m benchmarks.frame_times --tolerance 0.25
+
+A headless story (see `Story.headless_screen`) is drawn with SDL's dummy video driver. Each frame is a call to
+`Story.screen_manager` followed by the display flip, like a full redraw of the game loop. The p50, p95 and p99
+frame times of every screen are compared to the ones of the baseline file, when it exists, and the benchmark
+exits with an error when any of them got slower than the tolerance allows.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List
+
+import pygame
+
+from configs import Config
+from engine import States, Story
+from managers.font_manager import FontManagerInstance
+from managers.image_manager import ImageManagerInstance
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "frame_times_baseline.json")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(times: List[float], percent: float) -> float:
+    """
+    Returns a percentile of some times, using the nearest rank method.
+    """
+    ordered = sorted(times)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def build_story(resolution: str) -> Story:
+    """
+    Creates a small headless story using the images of a resolution.
+    """
+    story_config = Config()
+    story_config.set_resolution(resolution)
+    story = Story(config=story_config, no_translation=True, headless=True)
+    story.add_scene("start", "You wake up in a mysterious room.", "Doggo", "doggo.png")
+    story.add_choice("start", "Go through the door", "door_scene")
+    story.add_choice("start", "Look out the window", "end_scene")
+    story.add_scene("door_scene", "You find a hallway.", "Doggo", "doggo.png")
+    story.add_choice("door_scene", "Go back", "start")
+    story.add_choice("door_scene", "Get out of here", "end_scene")
+    story.selected_language = "English"
+    return story
+
+
+def screens(states: States) -> Dict[str, object]:
+    return {
+        "language_menu": states.language_menu,
+        "main_menu": states.main_menu,
+        "about": states.about,
+        "help": states.help,
+        "dialogue": states.game,
+        "choice": "in_choice",
+    }
+
+
+def measure(story: Story, state, frames: int, warmup: int) -> Dict[str, float]:
+    """
+    Draws a screen many times and returns its frame time percentiles (in milliseconds).
+    """
+    story.current_game_state = state
+    times = []
+    for frame in range(warmup + frames):
+        started = time.perf_counter()
+        story.screen_manager()
+        story.present()
+        if frame >= warmup:
+            times.append((time.perf_counter() - started) * 1000)
+    return {f"p{percent}": percentile(times, percent) for percent in PERCENTILES}
+
+
+def run(frames: int, warmup: int, cold: bool) -> Dict[str, Dict[str, float]]:
+    """
+    Measures every screen on every resolution.
+
+    Args:
+        frames (int): How many frames of each screen are timed.
+        warmup (int): How many frames of each screen are drawn before timing them.
+        cold (bool): Whether the image and text caches are cleared before each screen.
+
+    Returns:
+        dict: The frame time percentiles of each screen, by "resolution/screen".
+    """
+    results = {}
+    for resolution in Config().available_resolutions:
+        story = build_story(resolution)
+        for name, state in screens(story.possible_game_states).items():
+            if cold:
+                ImageManagerInstance.clear()
+                FontManagerInstance.clear()
+            results[f"{resolution}/{name}"] = measure(story, state, frames, warmup)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Prints the results next to the baseline.
+
+    Returns:
+        list: The screens (and percentiles) that got slower than the tolerance allows.
+    """
+    regressions = []
+    header = "".join(f"{f'p{percent}':>10}" for percent in PERCENTILES)
+    print(f"{'screen':<24}{header}  (ms, change from baseline)")
+    for screen, times in results.items():
+        row = f"{screen:<24}"
+        for percent in PERCENTILES:
+            key = f"p{percent}"
+            row += f"{times[key]:>10.3f}"
+            expected = baseline.get(screen, {}).get(key)
+            if expected:
+                change = times[key] / expected - 1
+                row += f" {change:+.0%}"
+                if change > tolerance:
+                    regressions.append(f"{screen} {key}")
+        print(row)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame time benchmark")
+    parser.add_argument(
+        "--frames", type=int, default=100, help="Frames timed per screen"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="Frames drawn before timing"
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Clear the image and text caches before each screen",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="The baseline file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save the results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="How much slower (0.2 = 20%%) than the baseline a percentile can get",
+    )
+    args = parser.parse_args()
+
+    results = run(args.frames, args.warmup, args.cold)
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, args.tolerance)
+    pygame.quit()
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"Slower than the baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares how long it takes to show an image decoded from its PNG file and built from its raw dump.
+
+Run it from the root of the project:
+
+    python -m benchmarks.image_loading --repeat 20
+
+A full screen image is made for each resolution tier and loaded both ways. Each load is followed by a blit
+to a screen-sized surface, so the time to actually read the pixels of the memory-mapped dump is counted too.
+Files are read from the OS page cache after the first run, like the images of a game that was just opened.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import pygame
+
+from configs import config
+from managers.surface_cache import RawSurfaceCache
+
+TIERS = {
+    "hd": (1280, 720),
+    "fullhd": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+def measure(load, target: pygame.Surface, repeat: int) -> float:
+    """
+    Returns the median time (in milliseconds) of loading and blitting an image.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        target.blit(load(), (0, 0))
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def run(repeat: int) -> None:
+    source = pygame.image.load(f"{config.image_path}doggo.png")
+    os.makedirs(config.cache_dir, exist_ok=True)
+    print(
+        f"{'tier':<8}{'size':>12}{'png':>10}{'raw':>10}"
+        f"{'png (ms)':>12}{'raw (ms)':>12}{'speedup':>10}"
+    )
+    # The images have to be inside the game resources to get a raw dump
+    with tempfile.TemporaryDirectory(
+        dir=config.cache_dir
+    ) as images, tempfile.TemporaryDirectory() as dumps:
+        raw_cache = RawSurfaceCache(directory=dumps)
+        for tier, size in TIERS.items():
+            path = os.path.join(images, f"{tier}.png")
+            pygame.image.save(pygame.transform.smoothscale(source, size), path)
+            dump_path = raw_cache.write(path)
+            target = pygame.Surface(size)
+
+            png_time = measure(lambda: pygame.image.load(path), target, repeat)
+            raw_time = measure(lambda: raw_cache.load(path), target, repeat)
+            print(
+                f"{tier:<8}{'%dx%d' % size:>12}"
+                f"{os.path.getsize(path) // 1024:>8}KB{os.path.getsize(dump_path) // 1024:>8}KB"
+                f"{png_time:>12.2f}{raw_time:>12.2f}{png_time / raw_time:>9.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PNG decoding vs raw dumps benchmark")
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="How many times each image is loaded"
+    )
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
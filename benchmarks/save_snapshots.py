@@ -0,0 +1,116 @@
+"""
+Compares saving and loading a session as JSON and as a binary snapshot (see `SessionSnapshot`).
+
+Run it from the root of the project:
+
+    python -m benchmarks.save_snapshots --repeat 50
+
+A story with thousands of scenes is played for longer and longer playthroughs, and each session (scene,
+language, played scenes and flags) is saved to and loaded from a save store on a temporary directory,
+as a JSON document and as snapshots with and without zlib compression. Saving includes encoding the
+session, loading includes decoding it.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+from managers.save_manager import SaveStore
+from managers.snapshot_manager import SessionSnapshot
+
+SCENES = 5000
+PLAYTHROUGHS = (100, 1000, 10000)
+
+
+def build_session(length: int, scenes: list) -> SessionSnapshot:
+    """
+    Plays a story going forward most of the time, like players do, and sometimes back.
+    """
+    rng = random.Random(length)
+    index, path = 0, []
+    for _ in range(length):
+        path.append(scenes[index])
+        index = max(0, min(len(scenes) - 1, index + rng.choice((1, 1, 2, 3, -1))))
+    flags = {f"flag_{number}": rng.choice((True, 1, "met")) for number in range(20)}
+    return SessionSnapshot(path[-1], "English", path, flags)
+
+
+def json_codec(snapshot: SessionSnapshot, scene_positions: dict):
+    encode = lambda: {  # noqa: E731
+        "state": snapshot.scene,
+        "language": snapshot.language,
+        "path": snapshot.path,
+        "flags": snapshot.flags,
+    }
+    return encode, lambda data: data
+
+
+def snapshot_codec(level: int):
+    def codec(snapshot: SessionSnapshot, scene_positions: dict):
+        return (
+            lambda: snapshot.encode(scene_positions, level),
+            SessionSnapshot.decode,
+        )
+
+    return codec
+
+
+def measure(store: SaveStore, encode, decode, repeat: int):
+    """
+    Returns the median save and load times (in milliseconds) and the size of the save (in bytes).
+    """
+    save_times, load_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        store.add(encode())
+        save_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        decode(store.latest()["data"])
+        load_times.append((time.perf_counter() - started) * 1000)
+    data = encode()
+    size = len(data) if isinstance(data, bytes) else len(json.dumps(data))
+    return statistics.median(save_times), statistics.median(load_times), size
+
+
+def run(repeat: int) -> None:
+    scene_order = [
+        f"chapter_{index // 100}_scene_{index % 100}" for index in range(SCENES)
+    ]
+    scene_positions = {scene: index for index, scene in enumerate(scene_order)}
+    codecs = {
+        "json": json_codec,
+        "snapshot": snapshot_codec(0),
+        "snapshot+zlib": snapshot_codec(6),
+    }
+    print(
+        f"{'choices':>8}  {'format':<14}{'size':>10}{'save (ms)':>12}{'load (ms)':>12}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        store = SaveStore(directory)
+        for length in PLAYTHROUGHS:
+            snapshot = build_session(length, scene_order)
+            for name, codec in codecs.items():
+                encode, decode = codec(snapshot, scene_positions)
+                save_time, load_time, size = measure(store, encode, decode, repeat)
+                print(
+                    f"{length:>8}  {name:<14}{size:>9}B{save_time:>12.3f}{load_time:>12.3f}"
+                )
+                store.prune(0)
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs snapshot saves benchmark")
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="How many times each save is made"
+    )
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Measures how long each frame of the transitions between scenes (see `SceneTransition`) takes to draw, on every
+resolution tier.
+
+Run it from the root of the project:
+
+    python -m benchmarks.transitions --frames 120
+
+Each transition is drawn from a scene to the next one, both filling the screen with the images of the tier, on
+an offscreen display (SDL's dummy video driver), for as many frames as its configured duration lasts at the
+target frame rate, with the game time advancing one frame each time. A frame includes drawing the transition
+and sending the screen to the display, and the transition holds the target frame rate if its slowest frames
+(p95) fit in the time of a frame. The benchmark fails (exits with status 1) if any transition doesn't hold it.
+
+If NumPy is installed, a crossfade blended with `pygame.surfarray` (from the difference between both frames,
+computed once) is measured too, for comparison with the blends of SDL the transitions use.
+"""
+
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+import pygame
+
+from configs import config
+from managers.transition_manager import TRANSITIONS, SceneTransition
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TIERS = {"hd": (1365, 768), "fullhd": (1920, 1080), "4k": (3840, 2160)}
+
+
+def scene_frame(size: tuple, tier: str, image: str) -> pygame.Surface:
+    """
+    Returns an image of a tier covering the whole screen, like the frame of a scene.
+    """
+    picture = pygame.image.load(
+        config.resource_path(f"resources/images/{tier}/{image}")
+    )
+    return pygame.transform.smoothscale(picture, size).convert()
+
+
+def transition_frames(screen, previous, following, kind, duration):
+    """
+    Returns a function drawing a transition between two frames, like the game does, at a time of the game.
+    """
+    transition = SceneTransition()
+    screen.blit(previous, (0, 0))
+    transition.start(screen, kind, duration, 0, config.transition_easing)
+    screen.blit(following, (0, 0))
+    transition.capture_target(screen)
+    return lambda now: transition.draw(screen, now)
+
+
+def numpy_crossfade_frames(screen, previous, following, duration):
+    """
+    Returns a function drawing a crossfade with NumPy, from the difference between both frames computed once.
+    """
+    source = pygame.surfarray.pixels3d(previous).astype(numpy.int16)
+    difference = pygame.surfarray.pixels3d(following) - source
+
+    def draw(now: int) -> None:
+        blended = difference * round(min(now / duration, 1) * 256)
+        blended >>= 8
+        blended += source
+        pixels = pygame.surfarray.pixels3d(screen)
+        pixels[...] = blended
+        del pixels
+
+    return draw
+
+
+def measure(draw, frames: int, duration: int) -> list:
+    """
+    Returns how long (in milliseconds) each frame of a transition took to draw and send to the display.
+    """
+    times = []
+    for frame in range(1, frames + 1):
+        started = time.perf_counter()
+        draw(frame * duration // frames)
+        pygame.display.flip()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def run(frames: int, fps: int) -> bool:
+    """
+    Measures every transition on every resolution tier.
+
+    Returns:
+        bool: Whether every transition holds the target frame rate on every tier (the NumPy crossfade, only
+            measured for comparison, doesn't count).
+    """
+    budget = 1000 / fps
+    duration = config.transition_duration
+    print(f"Target: {fps} fps ({budget:.2f} ms per frame)")
+    print(
+        f"{'tier':<8}{'transition':<18}{'mean (ms)':>10}{'p95 (ms)':>10}{'fps':>8}  holds"
+    )
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    missed = []
+    for tier, size in TIERS.items():
+        screen = pygame.display.set_mode(size)
+        previous = scene_frame(size, tier, "doggo.png")
+        following = scene_frame(size, tier, "boilerplate.png")
+
+        transitions = {
+            kind: transition_frames(screen, previous, following, kind, duration)
+            for kind in TRANSITIONS
+            if kind != "cut"
+        }
+        if numpy is not None:
+            transitions["crossfade (numpy)"] = numpy_crossfade_frames(
+                screen, previous, following, duration
+            )
+
+        for name, draw in transitions.items():
+            times = sorted(measure(draw, frames, duration))
+            mean = statistics.fmean(times)
+            p95 = times[min(len(times) - 1, math.ceil(len(times) * 0.95) - 1)]
+            print(
+                f"{tier:<8}{name:<18}{mean:>10.2f}{p95:>10.2f}{1000 / mean:>8.0f}"
+                f"  {'yes' if p95 <= budget else 'no'}"
+            )
+            if p95 > budget and name in TRANSITIONS:
+                missed.append(f"{tier} {name}")
+    pygame.quit()
+
+    if missed:
+        print(f"Missed the target frame rate: {', '.join(missed)}")
+    return not missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scene transitions benchmark")
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=math.ceil(config.transition_duration * config.fps / 1000),
+        help="How many frames each transition is drawn for",
+    )
+    parser.add_argument(
+        "--fps", type=int, default=config.fps, help="The target frame rate"
+    )
+    args = parser.parse_args()
+    if not run(args.frames, args.fps):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
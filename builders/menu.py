@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Dict, List
 import pygame
 
 from configs import Config, config
+from managers.font_manager import FontManagerInstance
 
 if TYPE_CHECKING:
     from engine import Story
@@ -45,10 +46,10 @@ class MenuBuilder:
         self.active_item_color: tuple[int, int, int] = self.colors["active_pink"]
         self.menu_font_size: int = self.config.sizes["medium"]
         self.menu_items: List[str] = self.story.menu_items
-        self.language_menu_font: pygame.font.Font = pygame.font.Font(
+        self.language_menu_font: pygame.font.Font = FontManagerInstance.get_font(
             None, self.menu_font_size
         )
-        self.main_menu_font: pygame.font.Font = pygame.font.Font(
+        self.main_menu_font: pygame.font.Font = FontManagerInstance.get_font(
             None, self.menu_font_size
         )
 
@@ -61,7 +62,9 @@ class MenuBuilder:
         """
         self.screen.fill(self.bg_color)
         for index, language in enumerate(self.story.languages):
-            label = self.language_menu_font.render(language, True, self.font_color)
+            label = FontManagerInstance.render(
+                language, self.language_menu_font, True, self.font_color
+            )
             x = self.width // 2
             y = (
                 (self.height // 2)
@@ -71,8 +74,8 @@ class MenuBuilder:
             label_rect = label.get_rect(center=(x, y))
 
             if index == self.active_item_index:
-                label = self.language_menu_font.render(
-                    language, True, self.active_item_color
+                label = FontManagerInstance.render(
+                    language, self.language_menu_font, True, self.active_item_color
                 )
 
             self.screen.blit(label, label_rect.topleft)
@@ -96,7 +99,9 @@ class MenuBuilder:
         pygame.draw.rect(self.screen, self.colors["white"], menu_bg_rect)
 
         for index, item in enumerate(menu_items):
-            label = self.main_menu_font.render(item, True, self.font_color)
+            label = FontManagerInstance.render(
+                item, self.main_menu_font, True, self.font_color
+            )
             x = 10
             y = (
                 (self.height // 2)
@@ -106,8 +111,8 @@ class MenuBuilder:
             label_rect = label.get_rect(x=x, centery=y)
 
             if index == self.active_item_index:
-                label = self.main_menu_font.render(
-                    item, True, self.active_item_color
+                label = FontManagerInstance.render(
+                    item, self.main_menu_font, True, self.active_item_color
                 )  # Change text color for active item
 
             self.screen.blit(label, label_rect.topleft)
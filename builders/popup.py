@@ -3,17 +3,21 @@ from typing import Any, Dict
 import pygame
 
 from configs import config
+from managers.font_manager import FontManagerInstance
 
 
 class PopupBuilder:
     def init_popup(
-        screen: pygame.Surface, mode: str = "save_success"
+        screen: pygame.Surface, mode: str = "save_success", now: int = None
     ) -> Dict[str, Any]:
         popup_settings: Dict[str, Dict[str, Any]] = config.popup_settings
 
-        font = pygame.font.Font(None, popup_settings[mode]["font_size"])
-        text_surf = font.render(
-            popup_settings[mode]["message"], True, popup_settings[mode]["text_color"]
+        font = FontManagerInstance.get_font(None, popup_settings[mode]["font_size"])
+        text_surf = FontManagerInstance.render(
+            popup_settings[mode]["message"],
+            font,
+            True,
+            popup_settings[mode]["text_color"],
         )
         text_rect = text_surf.get_rect(center=popup_settings[mode]["position"])
 
@@ -22,7 +26,8 @@ class PopupBuilder:
         bg_surf.fill(popup_settings[mode]["bg_color"])
         bg_rect = bg_surf.get_rect(center=popup_settings[mode]["position"])
 
-        start_time = pygame.time.get_ticks()
+        # The time of the game (see `Story.ticks`), or of pygame
+        start_time = pygame.time.get_ticks() if now is None else now
 
         return {
             "text_surf": text_surf,
@@ -33,8 +38,10 @@ class PopupBuilder:
             "duration": popup_settings[mode]["duration"] * 1000,
         }
 
-    def draw_popup(screen: pygame.Surface, popup_info: Dict[str, Any]) -> bool:
-        current_time: pygame.time = pygame.time.get_ticks()
+    def draw_popup(
+        screen: pygame.Surface, popup_info: Dict[str, Any], now: int = None
+    ) -> bool:
+        current_time: int = pygame.time.get_ticks() if now is None else now
 
         if current_time - popup_info["start_time"] < popup_info["duration"]:
             screen.blit(popup_info["bg_surf"], popup_info["bg_rect"])
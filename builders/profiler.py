@@ -0,0 +1,45 @@
+import pygame
+
+from configs import config
+from managers.font_manager import FontManagerInstance
+from managers.profile_manager import PHASES, FrameProfiler
+
+
+class ProfilerOverlayBuilder:
+    def draw_overlay(screen: pygame.Surface, profiler: FrameProfiler) -> pygame.Rect:
+        """
+        Draws the frame timings of the profiler over the top left corner of the screen.
+
+        Args:
+            screen (pygame.Surface): The screen to draw on.
+            profiler (FrameProfiler): The profiler with the timings.
+
+        Returns:
+            pygame.Rect: The area of the screen the overlay was drawn on.
+        """
+        summary = profiler.summary()
+        font = FontManagerInstance.get_font(None, config.sizes["small"])
+        lines = [f"{'phase':<16}{'mean':>8}{'p95':>8}{'max':>8}  (ms)"] + [
+            f"{phase:<16}{times['mean']:>8.2f}{times['p95']:>8.2f}{times['max']:>8.2f}"
+            for phase, times in summary.items()
+        ]
+        # The numbers change every frame, so they are rendered straight from the
+        # font instead of filling the rendered texts cache with them
+        surfaces = [font.render(line, True, config.colors["green"]) for line in lines]
+        line_height = font.get_linesize()
+        rect = pygame.Rect(
+            0,
+            0,
+            max(surface.get_width() for surface in surfaces) + config.padding,
+            line_height * len(surfaces) + config.padding,
+        )
+        background = pygame.Surface(rect.size)
+        background.set_alpha(192)
+        background.fill(config.colors["black"])
+        screen.blit(background, rect)
+        for index, surface in enumerate(surfaces):
+            screen.blit(
+                surface,
+                (config.padding // 2, config.padding // 2 + index * line_height),
+            )
+        return rect
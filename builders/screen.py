@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 import pygame
 
 from configs import Config, config
+from managers.font_manager import FontManagerInstance
+from managers.image_manager import ImageManagerInstance
 from resources.buttons import ChoicesButton, DialogueButton
 from resources.texts import TextManagerInstance
 
@@ -30,8 +32,10 @@ class ScreenBuilder:
         self.screen = self.story.screen
         self.language = self.story.selected_language
         self.config = config
-        self.text_font = pygame.font.Font(None, self.config.sizes["small"])
-        self.dialogue_font = pygame.font.Font(None, self.config.sizes["medium"])
+        self.text_font = FontManagerInstance.get_font(None, self.config.sizes["small"])
+        self.dialogue_font = FontManagerInstance.get_font(
+            None, self.config.sizes["medium"]
+        )
 
     def build_about_screen(self) -> None:
         """
@@ -48,9 +52,9 @@ class ScreenBuilder:
         self.screen.fill(self.config.colors["black"])
 
         title_text = TextManagerInstance.static_texts["about"][self.language][0]
-        title_font = pygame.font.Font(None, self.config.sizes["large"])
-        title_surface = title_font.render(
-            title_text, True, self.config.colors["active_pink"]
+        title_font = FontManagerInstance.get_font(None, self.config.sizes["large"])
+        title_surface = FontManagerInstance.render(
+            title_text, title_font, True, self.config.colors["active_pink"]
         )
         title_rect = title_surface.get_rect(
             center=(self.config.width // 2, self.config.height // 4)
@@ -61,8 +65,8 @@ class ScreenBuilder:
         about_lines = about_text.split("\n")
 
         for i, line in enumerate(about_lines):
-            line_surface = self.text_font.render(
-                line, True, self.config.colors["regular_pink"]
+            line_surface = FontManagerInstance.render(
+                line, self.text_font, True, self.config.colors["regular_pink"]
             )
             line_rect = line_surface.get_rect(
                 center=(
@@ -87,9 +91,9 @@ class ScreenBuilder:
         self.screen.fill(self.config.colors["black"])
 
         title_text = TextManagerInstance.static_texts["help"][self.language][0]
-        title_font = pygame.font.Font(None, self.config.sizes["large"])
-        title_surface = title_font.render(
-            title_text, True, self.config.colors["active_pink"]
+        title_font = FontManagerInstance.get_font(None, self.config.sizes["large"])
+        title_surface = FontManagerInstance.render(
+            title_text, title_font, True, self.config.colors["active_pink"]
         )
         title_rect = title_surface.get_rect(
             center=(self.config.width // 2, self.config.height // 4)
@@ -100,8 +104,8 @@ class ScreenBuilder:
         about_lines = about_text.split("\n")
 
         for i, line in enumerate(about_lines):
-            line_surface = self.text_font.render(
-                line, True, self.config.colors["regular_pink"]
+            line_surface = FontManagerInstance.render(
+                line, self.text_font, True, self.config.colors["regular_pink"]
             )
             line_rect = line_surface.get_rect(
                 center=(
@@ -130,7 +134,7 @@ class ScreenBuilder:
         self.screen.fill(self.config.colors["white"])
 
         if character_image:
-            character = pygame.image.load(character_image)
+            character = ImageManagerInstance.load(character_image)
             character_rect = character.get_rect(
                 center=(self.config.width // 2, (self.config.height // 5) * 2)
             )
@@ -148,8 +152,8 @@ class ScreenBuilder:
         )
 
         # Character name
-        name_text_surface = self.dialogue_font.render(
-            character_name, True, self.config.colors["black"]
+        name_text_surface = FontManagerInstance.render(
+            character_name, self.dialogue_font, True, self.config.colors["black"]
         )
         name_text_rect = name_text_surface.get_rect(
             bottomleft=(
@@ -162,8 +166,8 @@ class ScreenBuilder:
         # Dialogue text
         dialogue_lines = dialogue.split("\n")
         for i, line in enumerate(dialogue_lines):
-            line_surface = self.dialogue_font.render(
-                line, True, self.config.colors["white"]
+            line_surface = FontManagerInstance.render(
+                line, self.dialogue_font, True, self.config.colors["white"]
             )
             line_rect = line_surface.get_rect(
                 topleft=(
@@ -175,7 +179,7 @@ class ScreenBuilder:
             )
             self.screen.blit(line_surface, line_rect)
 
-        button_font = pygame.font.Font(None, self.config.sizes["ui"])
+        button_font = FontManagerInstance.get_font(None, self.config.sizes["ui"])
         dialogue_buttons = [
             DialogueButton(
                 self.screen,
@@ -233,13 +237,33 @@ class ScreenBuilder:
                 40,
                 self.text_font,
                 self.config.colors["black"],
-                (
-                    self.config.colors["active_pink"]
-                    if self.story.active_item_index == i
-                    else self.config.colors["white"]
-                ),
+                self.choice_color(i),
             )
             self.story.choices_items.append(button)
 
         for button in self.story.choices_items:
             button.draw()
+
+    def choice_color(self, index: int) -> tuple:
+        """
+        Returns the text color of a choice, highlighted if it's the active one.
+        """
+        if self.story.active_item_index == index:
+            return self.config.colors["active_pink"]
+        return self.config.colors["white"]
+
+    def redraw_choices(self, rects: list) -> None:
+        """
+        Draws again only the choices on some areas of the choice screen (like the ones whose highlight changed),
+        instead of building the whole screen.
+
+        Args:
+            rects (list): The areas of the screen to draw again.
+
+        Returns:
+            None
+        """
+        for index, button in enumerate(self.story.choices_items):
+            if button.rect.collidelist(rects) != -1:
+                button.text_color = self.choice_color(index)
+                button.draw()
@@ -2,9 +2,24 @@ import argparse
 import json
 import os
 import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 
-from configs import config
+import pygame
+
+from configs import RESOLUTION_ENV, Config, config
+from engine import load_story
+from errors.story import StoryCohesionError
+from managers.archive_manager import AssetArchive
+from managers.asset_manager import AssetPipeline
+from managers.build_manager import BuildManifest
+from managers.simulation_manager import PlaythroughSimulator
+from managers.surface_cache import RawSurfaceCache
+
+ARCHIVE_NAME = os.path.basename(config.asset_archive_path)
+RESOLUTION_HOOK_NAME = "resolution_hook.py"
 
 
 def run_tests():
@@ -12,15 +27,29 @@ def run_tests():
         subprocess.run(["python", "-m", "pytest", "tests"], check=True)
     except subprocess.CalledProcessError:
         print("Tests didn't passed. Aborting build.")
-        return
+        return False
+    return True
 
 
-def check_cohesion():
+def check_cohesion(source_dir):
+    # Load the story headless, in this same process: no window is opened
+    # and nothing is translated just to check the scene graph
     try:
-        subprocess.run(["python", "main.py", "--check-cohesion"], check=True)
-    except subprocess.CalledProcessError:
+        story = load_story(source_dir)
+        story.check_story()
+    except (StoryCohesionError, ValueError) as exc:
+        print(exc)
         print("Story is not cohesive. Aborting build.")
-        return
+        return False
+    return True
+
+
+def compile_text_catalog():
+    # Translate the static texts once here, so the built game loads them
+    # from the catalog instead of translating them on every launch
+    from resources.texts import TextManagerInstance
+
+    return TextManagerInstance.compile_catalog()
 
 
 def format_code():
@@ -30,16 +59,296 @@ def format_code():
     subprocess.run(["black", "."], check=True)
 
 
-def build_visual_novel(source_dir, output_dir, platforms, resolutions, languages):
+def target_config(resolution):
+    # Each target gets its own config, so targets built at the same
+    # time don't change each other's resolution and image paths
+    resolution_config = Config()
+    resolution_config.set_resolution(resolution)
+    return resolution_config
+
+
+def write_resolution_hook(path, resolution):
+    """
+    Writes the PyInstaller runtime hook that makes a built game start on the resolution it was built for.
+
+    The hook runs before the game imports its config, so `Config` picks the resolution up from the environment
+    and looks for the images (and the icon) of that resolution on the asset archive.
+    """
+    with open(path, "w") as hook_file:
+        hook_file.write(
+            "import os\n\n"
+            f"os.environ.setdefault({RESOLUTION_ENV!r}, {resolution!r})\n"
+        )
+    return path
+
+
+def target_paths(output_dir, platform, resolution):
+    """
+    Returns the dist and work paths of a target.
+    """
+    target = f"{platform.lower()}_{resolution.lower()}"
+    return (
+        os.path.join(output_dir, f"dist_{target}"),
+        os.path.join(output_dir, f"build_{target}"),
+    )
+
+
+def pyinstaller_args(
+    platform, resolution, source_dir, dist_path, work_path, text_catalog_path
+):
+    """
+    Returns the command that builds the visual novel for a platform and resolution,
+    or None if the platform can't be built from this script.
+    """
+    resolution_config = target_config(resolution)
+    match platform.lower():
+        case "macos":
+            # MacOSx build command
+            command = ["pyinstaller"]
+            icon = f"{resolution_config.game_icon}.icns"
+            name = f"{resolution_config.caption}_MacOSx"
+        case "linux":
+            # Linux build command
+            command = ["pyinstaller"]
+            icon = f"{resolution_config.game_icon}.png"
+            name = f"{resolution_config.caption}_Linux"
+        case "windows":
+            # Windows build command using Wine
+            command = ["wine", "pyinstaller"]
+            icon = f"{resolution_config.game_icon}.png"
+            name = f"{resolution_config.caption}_Windows"
+        case _:
+            return None
+    # The compiled story ships next to the game, where config.story_bundle_path finds it
+    story_bundle = (
+        [f"--add-data={resolution_config.story_bundle_path}:."]
+        if os.path.exists(resolution_config.story_bundle_path)
+        else []
+    )
+    return command + [
+        "--icon=%s" % icon,
+        "--name=%s" % name,
+        f"--add-data={os.path.join(work_path, ARCHIVE_NAME)}:./resources/",
+        f"--add-data={text_catalog_path}:./resources/",
+        *story_bundle,
+        f"--runtime-hook={os.path.join(work_path, RESOLUTION_HOOK_NAME)}",
+        "--onefile",
+        "--distpath=%s" % dist_path,
+        "--workpath=%s" % work_path,
+        "--specpath=%s" % work_path,
+        "--windowed",
+        source_dir,
+    ]
+
+
+def build_target(platform, resolution, source_dir, output_dir, text_catalog_path):
+    """
+    Builds the visual novel for a single platform and resolution, writing the output of the build to its own log file.
+
+    Args:
+        platform (str): The platform to build for.
+        resolution (str): The resolution to build for.
+        source_dir (str): The directory containing the source files of the visual novel.
+        output_dir (str): The directory where the built files will be saved.
+        text_catalog_path (str): The path of the compiled static texts catalog.
+
+    Returns:
+        dict: The platform, resolution, whether the build succeeded, the error (if any), the log path and
+            how long the build took (in seconds).
+    """
+    started = time.perf_counter()
+    dist_path, work_path = target_paths(output_dir, platform, resolution)
+    log_path = os.path.join(work_path, "build.log")
+    result = {
+        "platform": platform,
+        "resolution": resolution,
+        "success": False,
+        "error": None,
+        "log": log_path,
+        "duration": 0.0,
+    }
+
+    args = pyinstaller_args(
+        platform, resolution, source_dir, dist_path, work_path, text_catalog_path
+    )
+    if args is None:
+        result["error"] = (
+            f"Platform {platform} is not supported for direct building from this script."
+        )
+        result["log"] = None
+    else:
+        try:
+            os.makedirs(dist_path, exist_ok=True)
+            os.makedirs(work_path, exist_ok=True)
+            # The game starts on the resolution it was built for
+            resolution_config = target_config(resolution)
+            write_resolution_hook(
+                os.path.join(work_path, RESOLUTION_HOOK_NAME),
+                resolution_config.resolution,
+            )
+            # The images of the resolution ship packed on a single archive,
+            # so the game doesn't have to unpack and open each one of them
+            AssetArchive.pack_folder(
+                os.path.join(work_path, ARCHIVE_NAME),
+                resolution_config.image_path,
+                prefix=f"resources/images/{resolution_config.resolution}",
+                raw=resolution_config.archive_raw_images,
+            )
+            with open(log_path, "w") as log_file:
+                subprocess.run(
+                    args, check=True, stdout=log_file, stderr=subprocess.STDOUT
+                )
+            result["success"] = True
+        except subprocess.CalledProcessError as exc:
+            result["error"] = f"{args[0]} exited with code {exc.returncode}"
+        except (OSError, pygame.error) as exc:
+            result["error"] = str(exc)
+
+    result["duration"] = time.perf_counter() - started
+    return result
+
+
+def build_targets(source_dir, output_dir, targets, text_catalog_path, jobs=None):
+    """
+    Builds (platform, resolution) targets, running up to `jobs` builds at the same time.
+
+    Args:
+        source_dir (str): The directory containing the source files of the visual novel.
+        output_dir (str): The directory where the built files will be saved.
+        targets (list): The (platform, resolution) pairs to build.
+        text_catalog_path (str): The path of the compiled static texts catalog.
+        jobs (int, optional): The maximum number of builds running at the same time. Defaults to the number of CPUs.
+
+    Returns:
+        list: The result of each target (see `build_target`), in the order they were requested.
+    """
+    targets = [
+        (platform, resolution, source_dir, output_dir, text_catalog_path)
+        for platform, resolution in targets
+    ]
+    jobs = min(jobs or os.cpu_count() or 1, len(targets))
+    if jobs <= 1:
+        return [build_target(*target) for target in targets]
+
+    # PyInstaller runs are independent from each other, so
+    # they run on separate processes, each with its own paths
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(build_target, *target) for target in targets]
+        return [future.result() for future in futures]
+
+
+def plan_targets(
+    manifest,
+    source_digest,
+    source_dir,
+    output_dir,
+    platforms,
+    resolutions,
+    text_catalog_path,
+    force=False,
+):
+    """
+    Finds out which targets have to be rebuilt, comparing their inputs with the ones of their last build.
+
+    The inputs of a target are the source tree, the images of its resolution, the static texts catalog,
+    the compiled story (if any) and its configuration (the PyInstaller command, which covers the platform, resolution, icon and name).
+
+    Args:
+        manifest (BuildManifest): The manifest of the last build.
+        source_digest (str): The digest of the source tree.
+        source_dir (str): The directory containing the source files of the visual novel.
+        output_dir (str): The directory where the built files will be saved.
+        platforms (list): A list of platforms to build for.
+        resolutions (list): A list of resolutions to build for.
+        text_catalog_path (str): The path of the compiled static texts catalog.
+        force (bool, optional): Whether every target is rebuilt. Defaults to False.
+
+    Returns:
+        list: The (platform, resolution, inputs, reasons) of each target. Targets that are up to date have no reasons.
+    """
+    plan = []
+    for platform in platforms:
+        for resolution in resolutions:
+            dist_path, work_path = target_paths(output_dir, platform, resolution)
+            args = pyinstaller_args(
+                platform,
+                resolution,
+                source_dir,
+                dist_path,
+                work_path,
+                text_catalog_path,
+            )
+            inputs = {
+                "source": source_digest,
+                "assets": manifest.tree_digest(target_config(resolution).image_path),
+                "texts": (
+                    manifest.file_digest(text_catalog_path)
+                    if os.path.exists(text_catalog_path)
+                    else None
+                ),
+                "story": (
+                    manifest.file_digest(config.story_bundle_path)
+                    if os.path.exists(config.story_bundle_path)
+                    else None
+                ),
+                "config": manifest.digest(
+                    [args, target_config(resolution).archive_raw_images]
+                ),
+            }
+            if force:
+                reasons = ["forced"]
+            else:
+                reasons = manifest.changes(f"{platform}_{resolution}", inputs)
+                if not reasons and not os.path.exists(dist_path):
+                    reasons = ["output missing"]
+            plan.append((platform, resolution, inputs, reasons))
+    return plan
+
+
+def print_build_summary(results, wall_time):
+    """
+    Prints the result of each target, the failures and how much time the parallel builds saved.
+    """
+    summed_time = sum(result["duration"] for result in results)
+    failures = [result for result in results if not result["success"]]
+    for result in results:
+        status = "OK" if result["success"] else "FAILED"
+        log = f" (log: {result['log']})" if result["log"] else ""
+        print(
+            f"  [{status}] {result['platform']} {result['resolution']} "
+            f"in {result['duration']:.1f}s{log}"
+        )
+    print(
+        f"Built {len(results) - len(failures)} of {len(results)} targets in {wall_time:.1f}s "
+        f"({summed_time:.1f}s of build time in total)"
+    )
+    if failures:
+        print("Failed targets:")
+        for result in failures:
+            print(f"  {result['platform']} {result['resolution']}: {result['error']}")
+
+
+def build_visual_novel(
+    source_dir, output_dir, platforms, resolutions, languages, jobs=None, force=False
+):
     """
     Build a visual novel for the specified platforms, resolutions, and languages.
 
+    Every (platform, resolution) pair is built independently, and up to `jobs` of them are built at the same time.
+    The output of each build goes to a build.log file on its work path.
+
+    The inputs of each build are saved to a manifest on the output directory: the pre-build steps (cohesion check,
+    tests and formatting) only run when the source files changed, and targets whose inputs didn't change since
+    their last successful build are skipped.
+
     Args:
         source_dir (str): The directory containing the source files of the visual novel.
         output_dir (str): The directory where the built files will be saved.
         platforms (list): A list of platforms to build for (e.g., ['linux', 'windows']).
         resolutions (list): A list of resolutions to build for (e.g., ['hd', 'fullhd', '4k']).
         languages (list): A list of languages to include in the built visual novel.
+        jobs (int, optional): The maximum number of builds running at the same time. Defaults to the number of CPUs.
+        force (bool, optional): Whether every step and target runs, even if nothing changed. Defaults to False.
 
     Returns:
         None
@@ -48,77 +357,182 @@ def build_visual_novel(source_dir, output_dir, platforms, resolutions, languages
     print(f"With resolutions: {resolutions}")
     print(f"And languages: {languages}")
 
-    # Make sure the story is cohesive
-    # before building
-    check_cohesion()
+    manifest = BuildManifest(os.path.join(output_dir, "build_manifest.json"))
+    # The build output is never part of the source tree, even when it's built inside the project
+    output_paths = [output_dir] + [
+        path
+        for platform in platforms
+        for resolution in resolutions
+        for path in target_paths(output_dir, platform, resolution)
+    ]
 
-    # Run tests before building
-    run_tests()
+    def source_digest():
+        return manifest.tree_digest(".", extensions=(".py",), exclude=output_paths)
 
-    # Make sure the code is formatted before building
-    format_code()
+    source_changed = force or manifest.source != source_digest()
+    if source_changed:
+        # Make sure the story is cohesive
+        # before building
+        if not check_cohesion(source_dir):
+            return
 
-    for platform in platforms:
-        for resolution in resolutions:
-            config.resolution = (
-                resolution if resolution in config.available_resolutions else "hd"
-            )
-            dist_path = os.path.join(
-                output_dir, f"dist_{platform.lower()}_{resolution.lower()}"
-            )
-            work_path = os.path.join(
-                output_dir, f"build_{platform.lower()}_{resolution.lower()}"
-            )
-            os.makedirs(dist_path, exist_ok=True)
-            os.makedirs(work_path, exist_ok=True)
-            match platform.lower():
-                case "macos":
-                    # MacOSx build command
-                    pyinstaller_args = [
-                        "pyinstaller",
-                        "--icon=%s" % f"{config.game_icon}.icns",
-                        "--name=%s" % f"{config.caption}_MacOSx",
-                        f"--add-data={config.image_path}*:./resources/images/{resolution}/",
-                        "--onefile",
-                        "--distpath=%s" % dist_path,
-                        "--workpath=%s" % work_path,
-                        "--windowed",
-                        source_dir,
-                    ]
-                    subprocess.run(pyinstaller_args, check=True)
-                case "linux":
-                    # Linux build command
-                    pyinstaller_args = [
-                        "pyinstaller",
-                        "--icon=%s" % f"{config.game_icon}.png",
-                        "--name=%s" % f"{config.caption}_Linux",
-                        f"--add-data={config.image_path}*:./resources/images/{resolution}/",
-                        "--onefile",
-                        "--distpath=%s" % dist_path,
-                        "--workpath=%s" % work_path,
-                        "--windowed",
-                        source_dir,
-                    ]
-                    subprocess.run(pyinstaller_args, check=True)
-                case "windows":
-                    # Windows build command using Wine
-                    pyinstaller_args = [
-                        "wine",
-                        "pyinstaller",
-                        "--icon=%s" % f"{config.game_icon}.png",
-                        "--name=%s" % f"{config.caption}_Windows",
-                        f"--add-data={config.image_path}*:./resources/images/{resolution}/",
-                        "--onefile",
-                        "--distpath=%s" % dist_path,
-                        "--workpath=%s" % work_path,
-                        "--windowed",
-                        source_dir,
-                    ]
-                    subprocess.run(pyinstaller_args, check=True)
-                case _:
-                    print(
-                        f"Platform {platform} is not supported for direct building from this script."
-                    )
+        # Run tests before building
+        if not run_tests():
+            return
+
+        # Make sure the code is formatted before building
+        format_code()
+        manifest.source = source_digest()
+    else:
+        print(
+            "Source files didn't change, skipping the cohesion check, tests and formatting."
+        )
+
+    text_catalog_path = config.text_catalog_path
+    if source_changed or not os.path.exists(text_catalog_path):
+        text_catalog_path = compile_text_catalog()
+
+    plan = plan_targets(
+        manifest,
+        manifest.source,
+        source_dir,
+        output_dir,
+        platforms,
+        resolutions,
+        text_catalog_path,
+        force,
+    )
+    for platform, resolution, _, reasons in plan:
+        if reasons:
+            print(f"Rebuilding {platform} {resolution}: {', '.join(reasons)}")
+        else:
+            print(f"Skipping {platform} {resolution}: up to date")
+
+    targets = [
+        (platform, resolution) for platform, resolution, _, reasons in plan if reasons
+    ]
+    if targets:
+        started = time.perf_counter()
+        results = build_targets(
+            source_dir, output_dir, targets, text_catalog_path, jobs
+        )
+        print_build_summary(results, time.perf_counter() - started)
+        inputs = {
+            (platform, resolution): target_inputs
+            for platform, resolution, target_inputs, _ in plan
+        }
+        for result in results:
+            target = (result["platform"], result["resolution"])
+            manifest.record("_".join(target), inputs[target], result["success"])
+    else:
+        print("Every target is up to date.")
+    manifest.save()
+
+
+def derive_assets(resolutions=None, jobs=None, force=False):
+    """
+    Derives the images of each resolution from the master images, skipping the ones whose master didn't change.
+
+    Args:
+        resolutions (list, optional): The resolutions to derive. Defaults to every resolution but the masters one.
+        jobs (int, optional): The maximum number of images processed at the same time. Defaults to the number of CPUs.
+        force (bool, optional): Whether every image is derived again. Defaults to False.
+
+    Returns:
+        bool: Whether every image could be derived.
+    """
+    pipeline = AssetPipeline()
+    print(f"Deriving images from {pipeline.master_dir()}")
+    report = pipeline.run(resolutions, jobs, force)
+    for target in report["derived"]:
+        print(f"  Derived {target}")
+    print(
+        f"Derived {len(report['derived'])} images, "
+        f"{len(report['cached'])} were up to date, {len(report['failed'])} failed"
+    )
+    for failure in report["failed"]:
+        print(f"  {failure}")
+    return not report["failed"]
+
+
+def write_raw_images(resolutions=None):
+    """
+    Writes the pre-decoded (raw) dumps of the images of each resolution, so the game doesn't decode their PNG files.
+
+    Args:
+        resolutions (list, optional): The resolutions whose images are dumped. Defaults to every available resolution.
+
+    Returns:
+        list: The paths of the written dumps.
+    """
+    raw_cache = RawSurfaceCache()
+    dumps = raw_cache.write_folders(
+        config.resource_path(f"resources/images/{resolution}")
+        for resolution in resolutions or config.available_resolutions
+    )
+    print(f"Wrote {len(dumps)} raw images to {raw_cache.directory}")
+    return dumps
+
+
+def simulate_story(
+    entry_point, runs=10000, jobs=None, seed=None, exhaustive=False, max_steps=1000
+):
+    """
+    Plays the story many times without rendering it and reports how players can go through it.
+
+    Args:
+        entry_point (str): The path of the script that defines the story.
+        runs (int, optional): How many playthroughs are simulated (the limit, on exhaustive mode). Defaults to 10000.
+        jobs (int, optional): The maximum number of processes playing random playthroughs. Defaults to the number of CPUs.
+        seed (int, optional): The seed of the random choices. Defaults to a random one.
+        exhaustive (bool, optional): Whether every playthrough is simulated instead of random ones. Defaults to False.
+        max_steps (int, optional): How many choices a playthrough can make before it's considered stuck.
+
+    Returns:
+        bool: Whether some playthrough reached the end and none got stuck.
+    """
+    try:
+        story = load_story(entry_point)
+    except ValueError as exc:
+        print(exc)
+        return False
+    simulator = PlaythroughSimulator(story.scenes, story.choices)
+    if exhaustive:
+        report = simulator.explore(runs, max_steps)
+    else:
+        report = simulator.run(runs, jobs, seed, max_steps)
+    print(report)
+    return report.is_playable
+
+
+def replay_session(recording, entry_point="main.py"):
+    """
+    Plays a recorded session of the story back, with no window and as fast as possible, and reports how long
+    its frames took and where the game ended.
+
+    Args:
+        recording (str): The path of the recording (see the PYNOVEL_RECORD environment variable).
+        entry_point (str, optional): The path of the script that defines the story. Defaults to main.py.
+
+    Returns:
+        dict: The result of the replay (see `Story.replay`), or None if it couldn't be replayed.
+    """
+    try:
+        story = load_story(entry_point)
+        story.profiler.enable()
+        result = story.replay(recording)
+    except (OSError, ValueError) as exc:
+        print(exc)
+        return None
+    print(
+        f"Replayed {result['frame_count']} frames in {result['duration']:.2f}s, "
+        f"ended on state {result['game_state']}, scene \"{result['scene']}\""
+    )
+    for phase, times in story.profiler.summary().items():
+        print(
+            f"  {phase:<16}mean {times['mean']:.3f}ms  p95 {times['p95']:.3f}ms  max {times['max']:.3f}ms"
+        )
+    return result
 
 
 def main():
@@ -137,11 +551,101 @@ def main():
         required=True,
     )
 
+    build_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum number of targets built at the same time (defaults to the number of CPUs)",
+    )
+
+    build_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run every build step and rebuild every target, even if nothing changed",
+    )
+
     build_parser.add_argument(
         "source_dir", help="Source directory of your visual novel"
     )
     build_parser.add_argument("output_dir", help="Output directory for the project")
 
+    assets_parser = subparsers.add_parser(
+        "assets",
+        help="Derive the images of each resolution from the master images",
+    )
+    assets_parser.add_argument(
+        "--resolutions",
+        help="Comma-separated list of resolutions to derive (defaults to every resolution but the masters one)",
+    )
+    assets_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum number of images processed at the same time (defaults to the number of CPUs)",
+    )
+    assets_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Derive every image, even the ones whose master didn't change",
+    )
+
+    raw_parser = subparsers.add_parser(
+        "raw-images",
+        help="Pre-decode the images, so the game loads them without decoding their PNG files",
+    )
+    raw_parser.add_argument(
+        "--resolutions",
+        help="Comma-separated list of resolutions (defaults to every resolution)",
+    )
+
+    simulate_parser = subparsers.add_parser(
+        "simulate",
+        help="Play the story many times without rendering it and report coverage, endings and stuck states",
+    )
+    simulate_parser.add_argument(
+        "--runs",
+        type=int,
+        default=10000,
+        help="Number of playthroughs (the maximum, with --exhaustive)",
+    )
+    simulate_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum number of processes playing at the same time (defaults to the number of CPUs)",
+    )
+    simulate_parser.add_argument(
+        "--seed", type=int, help="Seed of the random choices, to repeat a simulation"
+    )
+    simulate_parser.add_argument(
+        "--exhaustive",
+        action="store_true",
+        help="Play every way through the story that doesn't play a scene twice",
+    )
+    simulate_parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=1000,
+        help="Number of choices after which a playthrough is considered stuck",
+    )
+    simulate_parser.add_argument(
+        "entry_point",
+        nargs="?",
+        default="main.py",
+        help="Script that defines the story (defaults to main.py)",
+    )
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Play a recorded session back with no window, as fast as possible",
+    )
+    replay_parser.add_argument(
+        "recording", help="Recording made with the PYNOVEL_RECORD environment variable"
+    )
+    replay_parser.add_argument(
+        "entry_point",
+        nargs="?",
+        default="main.py",
+        help="Script that defines the story (defaults to main.py)",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -161,7 +665,30 @@ def main():
             platforms,
             resolutions,
             languages,
+            jobs=args.jobs,
+            force=args.force,
+        )
+    elif args.command == "assets":
+        derive_assets(
+            args.resolutions.split(",") if args.resolutions else None,
+            jobs=args.jobs,
+            force=args.force,
         )
+    elif args.command == "raw-images":
+        write_raw_images(args.resolutions.split(",") if args.resolutions else None)
+    elif args.command == "simulate":
+        if not simulate_story(
+            args.entry_point,
+            runs=args.runs,
+            jobs=args.jobs,
+            seed=args.seed,
+            exhaustive=args.exhaustive,
+            max_steps=args.max_steps,
+        ):
+            sys.exit(1)
+    elif args.command == "replay":
+        if replay_session(args.recording, args.entry_point) is None:
+            sys.exit(1)
     else:
         print("Use --help to see available commands")
 
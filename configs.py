@@ -2,6 +2,10 @@ import os
 import sys
 from typing import Dict, List
 
+# Setting this environment variable changes the default resolution of the game (built games set it to
+# the resolution they were built for, see the build command)
+RESOLUTION_ENV = "PYNOVEL_RESOLUTION"
+
 
 class Config:
     """
@@ -9,9 +13,12 @@ class Config:
 
     Attributes:
         available_resolutions (list): A list of available resolutions.
-        resolution (str): The default resolution of the game.
+        resolution (str): The default resolution of the game (or the one set on the PYNOVEL_RESOLUTION environment variable).
         image_path (str): The path to the images folder.
         game_icon (str): The path to the game icon.
+        master_resolution (str): The resolution of the master images the other resolutions are derived from.
+        resolution_scales (dict): How much the master images are resized for each resolution.
+        asset_manifest_path (str): The path of the content hashes the derived images were made from.
         colors (dict): A dictionary mapping color names to RGB values.
         sizes (dict): A dictionary mapping size names to corresponding values.
         padding (int): The padding value (for the dialogue box).
@@ -20,7 +27,27 @@ class Config:
         caption (str): The caption of the game window.
         available_languages (dict): A dictionary mapping language codes to language names. This can be modified to add or remove languages.
         languages (list): A list of available language names to be shown on the language menu.
+        cache_dir (str): The directory where the engine keeps its caches.
+        translation_cache_path (str): The path of the persistent translation cache.
+        text_catalog_path (str): The path of the precompiled static texts catalog.
+        story_bundle_path (str): The path of the compiled story bundle.
+        asset_archive_path (str): The path of the packed asset archive of built games.
+        archive_raw_images (bool): Whether built games store their images as raw pixels on the asset archive.
+        raw_image_dir (str): The folder of the pre-decoded images (see the raw-images command).
+        translation_batch_size (int): The maximum number of texts sent to the translator at once.
+        translation_concurrency (int): The maximum number of translation batches sent at the same time.
         popup_settings (dict): A dictionary containing settings for different popup messages.
+        image_cache_budget (int): The maximum amount of bytes the decoded images cache can take.
+        prefetch_depth (int): How many choices ahead the images of the next scenes are loaded in background.
+        prefetch_budget (int): The maximum amount of bytes of images loaded in background after each scene change.
+        text_cache_size (int): The maximum number of rendered texts kept in cache.
+        fps (int): The maximum number of frames drawn per second.
+        profiler_frames (int): How many frames the frame profiler keeps (see the F3 overlay).
+        save_compression_level (int): The zlib compression level of saved games, 0 for no compression.
+        transition (str): How the game goes from a scene to the next one ("cut", "fade", "crossfade", "slide" or "wipe").
+        transition_duration (int): How long the transition between scenes takes (in milliseconds).
+        transition_easing (str): How the transition speeds up and slows down ("linear", "ease_in", "ease_out" or "ease_in_out").
+        idle_timeout (int): The maximum time (in milliseconds) the game waits for an event when nothing is animating. 0 disables the idle mode.
     """
 
     def resource_path(self, relative_path):
@@ -31,16 +58,41 @@ class Config:
 
         return os.path.join(base_path, relative_path)
 
-    def __init__(self):
-        self.available_resolutions: List[str] = ["hd", "fullhd", "4k"]
-
-        # You can change the default resolution of the game here
-        self.resolution: str = "hd"
+    def language_code(self, language: str) -> str:
+        """
+        Returns the code of a language from its name (e.g. "pt" for "Portuguese").
+        """
+        return list(self.available_languages.keys())[
+            list(self.available_languages.values()).index(language)
+        ]
+
+    def set_resolution(self, resolution: str) -> None:
+        """
+        Changes the resolution of the game, along with the paths of the images and the game icon.
+        Unknown resolutions fall back to "hd".
+        """
+        self.resolution: str = (
+            resolution if resolution in self.available_resolutions else "hd"
+        )
         self.image_path: str = self.resource_path(
             f"resources/images/{self.resolution}/"
         )
         self.game_icon: str = f"{self.image_path}icon"
 
+    def __init__(self):
+        self.available_resolutions: List[str] = ["hd", "fullhd", "4k"]
+
+        # You can change the default resolution of the game here
+        self.set_resolution(os.environ.get(RESOLUTION_ENV, "hd"))
+
+        # You can change which images the other resolutions are derived from (see the assets command) here
+        self.master_resolution: str = "4k"
+        self.resolution_scales: Dict[str, float] = {
+            "hd": 1 / 3,
+            "fullhd": 1 / 2,
+            "4k": 1.0,
+        }
+
         # You can change the colors of the game here
         self.colors: Dict[str, tuple[int, int, int]] = {
             "white": (255, 255, 255),
@@ -81,6 +133,31 @@ class Config:
         }
         self.languages: List[str] = [lang for lang in self.available_languages.values()]
 
+        # You can change where the engine keeps its caches (translations, builds...) here
+        self.cache_dir: str = os.path.join(os.path.abspath("."), ".pynovel_cache")
+        self.translation_cache_path: str = os.path.join(
+            self.cache_dir, "translations.sqlite3"
+        )
+        self.asset_manifest_path: str = os.path.join(
+            self.cache_dir, "assets_manifest.json"
+        )
+        self.raw_image_dir: str = os.path.join(self.cache_dir, "raw_images")
+
+        # You can change where the precompiled static texts (menus, about, help...) are read from here
+        self.text_catalog_path: str = self.resource_path("resources/texts_catalog.json")
+
+        # You can change where the compiled story (see Story.compile) is read from here
+        self.story_bundle_path: str = self.resource_path("story.pnb")
+
+        # You can change where the packed assets of built games are read from, and whether their
+        # images are stored decoded (bigger, but no PNG decoding when a scene is shown) here
+        self.asset_archive_path: str = self.resource_path("resources/assets.pna")
+        self.archive_raw_images: bool = False
+
+        # You can change how many texts are sent to the translator at once, and how many batches run at the same time here
+        self.translation_batch_size: int = 50
+        self.translation_concurrency: int = 4
+
         # You can change the popup settings here
         self.popup_settings: Dict[str, Dict[str, any]] = {
             "save_success": {
@@ -121,5 +198,32 @@ class Config:
             },
         }
 
+        # You can change how much memory the decoded images can take here (in bytes)
+        self.image_cache_budget: int = 256 * 1024 * 1024
+
+        # You can change how many choices ahead (and how many bytes of) images are loaded in background here
+        self.prefetch_depth: int = 2
+        self.prefetch_budget: int = 64 * 1024 * 1024
+
+        # You can change how many rendered texts are kept in memory here
+        self.text_cache_size: int = 512
+
+        # You can change the frame rate cap of the game here
+        self.fps: int = 60
+
+        # You can change how long the game sleeps waiting for input on static screens here (in milliseconds)
+        self.idle_timeout: int = 250
+
+        # You can change how many frames the frame profiler keeps here
+        self.profiler_frames: int = 600
+
+        # You can change the zlib compression level of saved games here (0 for no compression)
+        self.save_compression_level: int = 6
+
+        # You can change the transition between scenes, how long it takes and how it speeds up and slows down here
+        self.transition: str = "cut"
+        self.transition_duration: int = 400
+        self.transition_easing: str = "ease_in_out"
+
 
 config = Config()
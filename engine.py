@@ -1,21 +1,37 @@
+import hashlib
+import os
+import runpy
 import sys
-from typing import List
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
 
 import pygame
-from googletrans import Translator
 
 from builders.menu import MenuBuilder
 from builders.popup import PopupBuilder
+from builders.profiler import ProfilerOverlayBuilder
 from builders.screen import ScreenBuilder
 from configs import Config, config
 from errors.story import StoryCohesionError
 from handlers.menu import MenuHandler
 from handlers.screen import ScreenHandler
+from managers import profile_manager
+from managers.bundle_manager import StoryBundle
+from managers.cohesion_manager import CohesionAnalyzer, CohesionReport
+from managers.font_manager import FontManagerInstance
+from managers.image_manager import ImageManagerInstance
+from managers.prefetch_manager import ImagePrefetcher
+from managers.profile_manager import FrameProfiler
+from managers.replay_manager import RECORD_ENV, InputRecorder, InputReplayer
+from managers.save_manager import SaveAndLoadManager, SaveWriter
+from managers.scheduler_manager import Scheduler
+from managers.snapshot_manager import SessionSnapshot
+from managers.transition_manager import SceneTransition
+from managers.translation_manager import TranslationManagerInstance
 from resources.buttons import ChoicesButton
 from resources.texts import TextManagerInstance
 
-translator = Translator()
-
 
 class States:
     def __init__(self):
@@ -29,8 +45,15 @@ class States:
 
 
 class Story:
+    # Makes every story created headless, see load_story
+    headless_mode: bool = False
+
     def __init__(
-        self, states: States = States(), config: Config = config, no_translation=False
+        self,
+        states: States = States(),
+        config: Config = config,
+        no_translation=False,
+        headless: bool = False,
     ) -> None:
         """
         Initialize the Story class.
@@ -38,6 +61,8 @@ class Story:
         Args:
             states (States, optional): The states of the game. Defaults to States().
             config (dict, optional): The configuration of the game. Defaults to config inside configs.py file.
+            headless (bool, optional): If True, no window is opened and the game is drawn to an offscreen surface,
+                see `headless_screen`. Defaults to False.
         """
         self.config: Config = config
         self.caption: str = self.config.caption
@@ -55,61 +80,554 @@ class Story:
         self.current_game_state: int = self.possible_game_states.language_menu
         self.scenes: dict = {}
         self.current_scene: str = "start"
+        self.history: List[str] = [self.current_scene]
+        self.flags: Dict[str, object] = {}
         self.choices_items: List[ChoicesButton] = []
         self.choices: dict = {}
+        self.pending_translations: List[Tuple[str, str, int, str]] = []
+        self.bundle: StoryBundle = None
+        # The position of each scene on the story, in the order they were added (see `SessionSnapshot.encode`)
+        self.scene_positions: Dict[str, int] = {}
         self.current_choice: str = None
         self.active_item_index: int = 0
         self.running: bool = True
-        self.game_icon = pygame.image.load(f"{self.config.game_icon}.png")
-        pygame.display.set_icon(self.game_icon)
-        pygame.init()
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption(title=self.caption, icontitle=self.caption)
-        self.menu_font = pygame.font.Font(None, self.menu_font_size)
+        self.headless: bool = headless or Story.headless_mode
+        if self.headless:
+            self.game_icon = None
+            self.screen = self.headless_screen()
+            self.menu_font = FontManagerInstance.get_font(None, self.menu_font_size)
+        else:
+            self.game_icon = ImageManagerInstance.read(f"{self.config.game_icon}.png")
+            pygame.display.set_icon(self.game_icon)
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.width, self.height))
+            pygame.display.set_caption(title=self.caption, icontitle=self.caption)
+            self.menu_font = FontManagerInstance.get_font(None, self.menu_font_size)
         self.popup_info = None
         self.no_translation = no_translation
+        self.clock = pygame.time.Clock()
+        self.fps: int = self.config.fps
+        self.frame_time: int = 0
+        self.frame_count: int = 0
+        self.idle_frames: int = 0
+        self.idle_time: int = 0
+        # The time of the game on the current frame, see ticks
+        self.frame_ticks: int = None
+        # The event that woke the game up from idling, handled before the events queued after it
+        self.waited_event: pygame.event.Event = None
+        self.dirty: bool = True
+        self.dirty_rects: List[pygame.Rect] = []
+        self.prefetcher: ImagePrefetcher = ImagePrefetcher(self.config)
+        self.profiler: FrameProfiler = FrameProfiler(self.config)
+        self.recorder: InputRecorder = None
+        self.replayer: InputReplayer = None
+        self.save_directory: str = "saved_games"
+        self.save_writer: SaveWriter = SaveWriter(
+            self.save_directory, self.config.save_compression_level
+        )
+        self.scheduler: Scheduler = Scheduler()
+        self.transition: SceneTransition = SceneTransition(self.bg_color)
+
+    def headless_screen(self) -> pygame.Surface:
+        """
+        Creates the offscreen surface headless stories are drawn to.
 
-    def run(self) -> None:
-        # Main game loop
-        while self.running:
-            self.screen_manager()
-            self.pre_game_event_handler()
-            if self.popup_info:
-                # If popup duration has passed, stop showing the popup
-                if not PopupBuilder.draw_popup(self.screen, self.popup_info):
-                    self.popup_info = None
+        If the display isn't initialized yet, it's initialized with SDL's dummy video driver, which sets a display
+        mode without opening a window, so every game state can be rendered (and timed) exactly like on a window.
+        If a real display is already in use, a plain surface is returned instead, so no window is changed.
+
+        Returns:
+            pygame.Surface: The screen of the story.
+        """
+        if not pygame.display.get_init():
+            video_driver = os.environ.get("SDL_VIDEODRIVER")
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            try:
+                pygame.display.init()
+            finally:
+                # SDL only reads the driver when the display is initialized
+                if video_driver is None:
+                    del os.environ["SDL_VIDEODRIVER"]
+                else:
+                    os.environ["SDL_VIDEODRIVER"] = video_driver
+        pygame.font.init()
+        if pygame.display.get_driver() == "dummy":
+            return pygame.display.set_mode((self.width, self.height))
+        return pygame.Surface((self.width, self.height))
+
+    def present(self, rects: List[pygame.Rect] = None) -> None:
+        """
+        Sends the screen (or some areas of it) to the display.
+
+        Headless stories drawn to a plain surface have no display to send it to.
+
+        Args:
+            rects (list, optional): The areas of the screen to send. Defaults to None (the whole screen).
+
+        Returns:
+            None
+        """
+        if self.screen is not pygame.display.get_surface():
+            return
+        if rects is None:
             pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def run(self) -> None:
+        self.translate_pending()
+
+        record_path = os.environ.get(RECORD_ENV)
+        if record_path:
+            self.recorder = InputRecorder(record_path, self.fps)
+
+        self.profiler.profile(self.main_loop)
+
+        self.prefetcher.stop()
+        # Saves still queued are written before the game closes
+        self.save_writer.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"{self.recorder.events} events recorded to {record_path}")
 
         pygame.quit()
         sys.exit()
 
+    def main_loop(self) -> None:
+        """
+        Runs the game loop until the game is closed, recording the time of each frame on the frame profiler.
+
+        Returns:
+            None
+        """
+        while self.running:
+            self.profiler.begin()
+            self.start_frame()
+            self.prefetch_images()
+            self.collect_saves()
+            self.scheduler.run_due(self.ticks())
+            self.render_frame()
+            self.profiler.skip()
+            self.pre_game_event_handler()
+            self.profiler.lap(profile_manager.EVENTS)
+            self.profiler.end()
+            # Time spent waiting for the next frame isn't part of the frame
+            self.wait_next_frame()
+        self.frame_ticks = None
+
+    def start_frame(self) -> None:
+        """
+        Sets the time of the game for the frame, recording it if the input is being recorded.
+
+        While replaying a recording, it's the time the frame had on the recorded session.
+
+        Returns:
+            None
+        """
+        if self.replayer is not None:
+            self.frame_ticks = self.replayer.ticks_for(self.frame_count)
+            return
+        self.frame_ticks = pygame.time.get_ticks()
+        if self.recorder is not None:
+            self.recorder.record_frame(self.frame_count, self.frame_ticks)
+
+    def replay(self, path: str) -> dict:
+        """
+        Plays a recorded session (see `InputRecorder`) back, as fast as possible.
+
+        Every recorded event is handled on the same frame it was handled on the recorded session, and every
+        frame has the time of the game it had on the recorded session (see `InputReplayer.ticks_for`), so
+        timers and popups end on the same frames and the same recording always leads the game through the
+        same states. Replays can be used as regression tests and benchmarks of the whole game loop. The
+        replay ends after the last event.
+
+        Games saved or loaded while replaying use an empty temporary save directory, so replays never
+        change the saved games of the player, nor depend on them.
+
+        Args:
+            path (str): The path of the recording.
+
+        Raises:
+            ValueError: If the file isn't a recording.
+
+        Returns:
+            dict: The frame stats of the replay (see `frame_stats`), how long it took (in seconds) and the
+                state and scene the game ended on.
+        """
+        self.replayer = InputReplayer(path)
+        self.fps = self.replayer.fps
+        self.translate_pending()
+
+        save_directory, save_writer = self.save_directory, self.save_writer
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory() as replay_directory:
+            self.save_directory = replay_directory
+            self.save_writer = SaveWriter(
+                replay_directory, self.config.save_compression_level
+            )
+            try:
+                self.main_loop()
+            finally:
+                self.prefetcher.stop()
+                self.save_writer.stop()
+                SaveAndLoadManager.close_store(replay_directory)
+                self.save_directory, self.save_writer = save_directory, save_writer
+                self.replayer = None
+                self.fps = self.config.fps
+
+        return {
+            **self.frame_stats(),
+            "duration": time.perf_counter() - started,
+            "game_state": self.current_game_state,
+            "scene": self.current_scene,
+        }
+
+    def ticks(self) -> int:
+        """
+        Returns the time of the game, in milliseconds.
+
+        While the game loop runs, it's the time the current frame started (see `start_frame`), so everything
+        handled on a frame sees the same time, and replays see the time each frame had when it was recorded.
+        """
+        if self.frame_ticks is not None:
+            return self.frame_ticks
+        if self.replayer is not None:
+            return self.replayer.ticks_for(self.frame_count)
+        return pygame.time.get_ticks()
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        """
+        Gets the events to handle on this frame, recording them if the input is being recorded.
+
+        While replaying a recording, the recorded events are returned instead, and the game stops after
+        the last one.
+
+        Returns:
+            list: The events.
+        """
+        if self.replayer is not None:
+            events = self.replayer.events_for(self.frame_count)
+            if self.replayer.finished:
+                self.running = False
+            return events
+
+        events = pygame.event.get()
+        if self.waited_event is not None:
+            events.insert(0, self.waited_event)
+            self.waited_event = None
+        if self.recorder is not None:
+            self.recorder.record(self.frame_count, events)
+        return events
+
+    def snapshot(self) -> SessionSnapshot:
+        """
+        Returns the state of the session: the current scene, the selected language, the scenes played and the flags.
+        """
+        return SessionSnapshot(
+            self.current_scene, self.selected_language, self.history, self.flags
+        )
+
+    def restore(self, snapshot: SessionSnapshot) -> None:
+        """
+        Restores the state of a saved session.
+
+        The language is only restored if the story is still available in it.
+
+        Args:
+            snapshot (SessionSnapshot): The saved session.
+
+        Returns:
+            None
+        """
+        self.current_scene = snapshot.scene
+        self.history = list(snapshot.path)
+        self.flags = dict(snapshot.flags)
+        if snapshot.language in self.scenes:
+            self.selected_language = snapshot.language
+        self.mark_dirty()
+
+    def save_game(self) -> None:
+        """
+        Saves the session on the background save writer, see `SaveWriter`.
+
+        The snapshot is encoded and compressed on the writer thread, so saving takes no time from the frame.
+
+        Returns:
+            None
+        """
+        self.save_writer.submit(self.snapshot(), scene_positions=self.scene_positions)
+
+    def collect_saves(self) -> None:
+        """
+        Shows a popup for each save the background save writer finished writing.
+
+        Returns:
+            None
+        """
+        for _, error, _ in self.save_writer.poll():
+            if error is not None:
+                print(error)
+            self.show_popup("save_success" if error is None else "save_failed")
+
+    def after(self, delay: int, callback: Callable[[], None], name: str = None) -> int:
+        """
+        Runs a callback from the game loop after some time, without blocking it (see `Scheduler`).
+
+        Args:
+            delay (int): How long to wait, in milliseconds of the game.
+            callback (callable): The function to run.
+            name (str, optional): The name of the timer, replacing the timer with the same name. Defaults to None.
+
+        Returns:
+            int: The id of the timer.
+        """
+        return self.scheduler.schedule(self.ticks() + delay, callback, name)
+
+    def show_popup(self, mode: str) -> None:
+        """
+        Shows a popup (see `PopupBuilder`), replacing the one being shown, and hides it when its duration ends.
+
+        Args:
+            mode (str): The popup to show, one of the popup settings of the config.
+
+        Returns:
+            None
+        """
+        self.popup_info = PopupBuilder.init_popup(
+            self.screen, mode=mode, now=self.ticks()
+        )
+        self.after(self.popup_info["duration"], self.hide_popup, name="popup")
+        self.mark_dirty()
+
+    def hide_popup(self) -> None:
+        self.scheduler.cancel("popup")
+        self.popup_info = None
+        self.mark_dirty()
+
+    def start_transition(self) -> None:
+        """
+        Starts the configured transition from the frame on the screen to the scene drawn on the next frame.
+
+        Returns:
+            None
+        """
+        self.transition.start(
+            self.screen,
+            self.config.transition,
+            self.config.transition_duration,
+            self.ticks(),
+            self.config.transition_easing,
+        )
+        self.mark_dirty()
+
+    def prefetch_images(self) -> None:
+        """
+        Stores the images loaded in background on the image cache, and starts loading the images of the
+        scenes reachable from the current scene when it changes. See `ImagePrefetcher`.
+
+        Returns:
+            None
+        """
+        self.prefetcher.collect()
+        if self.selected_language is None:
+            return
+        self.prefetcher.watch(
+            self.scenes.get(self.selected_language, {}),
+            self.choices.get(self.selected_language, {}),
+            self.current_scene,
+        )
+
+    def mark_dirty(self, rects: List[pygame.Rect] = None) -> None:
+        """
+        Marks the screen as changed so it is rebuilt on the next frame.
+
+        Args:
+            rects (list, optional): The areas of the screen that changed. Defaults to None (the whole screen changed).
+
+        Returns:
+            None
+        """
+        if rects is None:
+            self.dirty = True
+        else:
+            self.dirty_rects.extend(rects)
+
+    def needs_redraw(self) -> bool:
+        """
+        Checks if the screen has to be rebuilt on this frame.
+
+        Returns:
+            bool: True if the screen was marked as dirty, a transition is being drawn or a popup (or the profiler
+                overlay) is being shown, False otherwise.
+        """
+        return (
+            self.dirty
+            or bool(self.dirty_rects)
+            or self.transition.active
+            or self.popup_info is not None
+            or self.profiler.overlay
+        )
+
+    def render_frame(self) -> None:
+        """
+        Rebuilds and presents the screen, but only if something changed since the last frame.
+
+        When only some areas of the screen were marked as dirty, just the choices on those areas are drawn
+        again (see `ScreenBuilder.redraw_choices`) and just those areas are sent to the display.
+
+        While a transition is being drawn, the next scene is only drawn again when it changes, and the
+        transition is drawn over it from the frames it keeps (see `SceneTransition`).
+
+        Returns:
+            None
+        """
+        if not self.needs_redraw():
+            return
+
+        self.profiler.skip()
+        if self.can_redraw_regions():
+            ScreenBuilder(self).redraw_choices(self.dirty_rects)
+        elif not self.transition.active or self.dirty or self.dirty_rects:
+            self.screen_manager()
+            if self.transition.active:
+                self.transition.capture_target(self.screen)
+        self.profiler.lap(profile_manager.SCREEN_MANAGER)
+        full_update = self.dirty
+        if self.transition.active:
+            full_update = True
+            self.transition.draw(self.screen, self.ticks())
+            if self.popup_info or self.profiler.overlay:
+                # They are drawn over the transition, so its next frame can't be blended over this one
+                self.transition.discard_frame()
+            self.profiler.lap(profile_manager.TRANSITION)
+        if self.popup_info:
+            full_update = True
+            # If popup duration has passed, stop showing the popup
+            if not PopupBuilder.draw_popup(
+                self.screen, self.popup_info, now=self.ticks()
+            ):
+                self.popup_info = None
+            self.profiler.lap(profile_manager.POPUP)
+
+        if self.profiler.overlay:
+            full_update = True
+            ProfilerOverlayBuilder.draw_overlay(self.screen, self.profiler)
+            self.profiler.skip()
+
+        self.present(None if full_update else self.dirty_rects)
+        self.profiler.lap(profile_manager.PRESENT)
+
+        self.dirty = False
+        self.dirty_rects = []
+
+    def can_redraw_regions(self) -> bool:
+        """
+        Checks if only the dirty areas of the screen have to be drawn again on this frame.
+
+        Popups, the profiler overlay and transitions are blended over the screen on every frame, so the whole
+        screen is built again while they are shown.
+
+        Returns:
+            bool: True if only some areas of the screen were marked as dirty and nothing is drawn over it,
+                False otherwise.
+        """
+        return (
+            not self.dirty
+            and bool(self.dirty_rects)
+            and self.popup_info is None
+            and not self.profiler.overlay
+            and not self.transition.active
+        )
+
+    def can_idle(self) -> bool:
+        """
+        Checks if nothing on the screen changes without user input, so the game can sleep until an event arrives.
+
+        Returns:
+            bool: True if no popup is being shown and the screen doesn't need to be redrawn, False otherwise.
+        """
+        return not self.needs_redraw()
+
+    def wait_next_frame(self) -> None:
+        """
+        Waits until the next frame should be drawn.
+
+        The frame rate is capped to the configured fps. When the game can idle, it also blocks waiting for
+        the next event (up to the configured idle timeout) instead of drawing frames nobody needs, so static
+        screens don't keep a CPU core busy. It only blocks when no event is queued, and the event that wakes
+        the game up is kept for `poll_events`, so the event handlers get every event in the order it arrived.
+        The game never sleeps past the next timer of the scheduler, so delayed transitions happen on time.
+
+        While replaying a recording, nothing is waited for: frames take the time they took on the recorded session.
+
+        Returns:
+            None
+        """
+        if self.replayer is not None:
+            self.frame_time = self.replayer.ticks_for(
+                self.frame_count + 1
+            ) - self.replayer.ticks_for(self.frame_count)
+            self.frame_count += 1
+            return
+
+        self.frame_time = self.clock.tick(self.fps)
+        self.frame_count += 1
+
+        timeout = self.config.idle_timeout
+        next_due = self.scheduler.next_due()
+        if next_due is not None:
+            timeout = min(timeout, next_due - pygame.time.get_ticks())
+        if timeout > 0 and self.can_idle() and not pygame.event.peek():
+            self.idle_frames += 1
+            idle_start = pygame.time.get_ticks()
+            event = pygame.event.wait(timeout)
+            self.idle_time += pygame.time.get_ticks() - idle_start
+            if event.type != pygame.NOEVENT:
+                self.waited_event = event
+
+    def frame_stats(self) -> dict:
+        """
+        Returns the measured frame statistics of the game loop.
+
+        Returns:
+            dict: The measured fps, the duration of the last frame (in milliseconds), the number of frames drawn,
+                how many of them idled and the total time spent idling (in milliseconds).
+        """
+        return {
+            "fps": self.clock.get_fps(),
+            "frame_time": self.frame_time,
+            "frame_count": self.frame_count,
+            "idle_frames": self.idle_frames,
+            "idle_time": self.idle_time,
+        }
+
+    def analyze_story(self) -> CohesionReport:
+        """
+        Analyzes the scene graph of the story.
+
+        Returns:
+            CohesionReport: The problems found on the story (dangling choices, unreachable scenes, scenes without
+                choices, cycles with no way out, translations that don't match the story...).
+        """
+        return CohesionAnalyzer(self.scenes, self.choices).analyze()
+
     def check_story(self) -> None:
         """
-        Checks if the story has been defined and if it has a ending.
+        Checks if the story is cohesive.
+
+        The story needs a "start" scene from which "end_scene" can be reached, every choice must lead to a scene
+        that was defined, every scene must be reachable, have at least 2 choices and not be stuck on a cycle with
+        no way out, and every language must have the same scenes and choices. See `analyze_story`.
 
-        If the story has not been defined, if the choices weren't defined, if every scene doesn't have at least 2 choices or if the story
-        doesn't have an ending, it raises a StoryCohesionError.
+        Raises:
+            StoryCohesionError: If the story is not cohesive. Its `report` attribute has every problem found.
 
         Returns:
             None
         """
-        has_start = False
-        has_end = False
-        has_multiple_choices = True
-        for lang in list(self.choices.values()):
-            for scene in list(lang.values()):
-                if len(scene) < 2:
-                    has_multiple_choices = False
-                for choice in scene:
-                    if choice[1] == "end_scene":
-                        has_end = True
-                    if choice[1] == "start":
-                        has_start = True
-
-        if not all(
-            [self.scenes, self.choices, has_end, has_start, has_multiple_choices]
-        ):
-            raise StoryCohesionError
+        report = self.analyze_story()
+        if not report.is_cohesive:
+            raise StoryCohesionError(report=report)
         print("Story is cohesive")
 
     def add_scene(
@@ -119,35 +637,37 @@ class Story:
         character_name: str = "",
         image: str = "boilerplate.png",
     ) -> None:
+        """
+        Adds a scene in multiple languages.
+
+        The description is only queued for translation here. It is translated, together with every other
+        queued text, the next time `translate_pending` is called (the game calls it before it starts).
+
+        Args:
+            scene_name (str): The name of the scene.
+            description (str): The description of the scene.
+            character_name (str, optional): The name of the character shown in the scene. Defaults to "".
+            image (str, optional): The name of the image shown in the scene. Defaults to "boilerplate.png".
+
+        Returns:
+            None
+        """
         image = f"{self.config.image_path}{image}"
-        if not self.no_translation:
-            for language in self.languages:
-                if language not in self.scenes:
-                    self.scenes[language] = {}
-                self.scenes[language][scene_name] = {
-                    "description": translator.translate(
-                        description,
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                    "image": image,
-                    "character_name": character_name,
-                }
-        else:
-            if "English" not in self.scenes:
-                self.scenes["English"] = {}
-            self.scenes["English"][scene_name] = {
+        self.scene_positions.setdefault(scene_name, len(self.scene_positions))
+        for language in self.story_languages():
+            self.scenes.setdefault(language, {})[scene_name] = {
                 "description": description,
                 "image": image,
                 "character_name": character_name,
             }
+            self.queue_translation(language, scene_name, None, description)
 
     def add_choice(self, scene: str, choice: str, next_scene: str) -> None:
         """
         Adds a choice to the specified scene in multiple languages.
 
+        The choice text is only queued for translation here, see `add_scene`.
+
         Args:
             scene (str): The scene to add the choice to.
             choice (str): The choice text.
@@ -156,49 +676,146 @@ class Story:
         Returns:
             None
         """
-        if not self.no_translation:
-            for language in self.languages:
-                if language not in self.choices:
-                    self.choices[language] = {}
-                if scene in self.choices[language]:
-                    self.choices[language][scene].append(
-                        (
-                            translator.translate(
-                                choice,
-                                src="en",
-                                dest=list(config.available_languages.keys())[
-                                    list(config.available_languages.values()).index(
-                                        language
-                                    )
-                                ],
-                            ).text,
-                            next_scene,
-                        )
-                    )
-                else:
-                    if "English" not in self.choices:
-                        self.choices[language] = {}
-                    self.choices[language][scene] = [
-                        (
-                            translator.translate(
-                                choice,
-                                src="en",
-                                dest=list(config.available_languages.keys())[
-                                    list(config.available_languages.values()).index(
-                                        language
-                                    )
-                                ],
-                            ).text,
-                            next_scene,
-                        )
-                    ]
-        else:
-            if "English" not in self.choices:
-                self.choices["English"] = {}
-            if scene in self.choices["English"]:
-                self.choices["English"][scene].append((choice, next_scene))
+        for language in self.story_languages():
+            scene_choices = self.choices.setdefault(language, {}).setdefault(scene, [])
+            scene_choices.append((choice, next_scene))
+            self.queue_translation(language, scene, len(scene_choices) - 1, choice)
+
+    def story_languages(self) -> List[str]:
+        """
+        Returns the languages the scenes and choices are added in.
+        """
+        return ["English"] if self.no_translation else self.languages
+
+    def queue_translation(
+        self, language: str, scene: str, choice_index: int, text: str
+    ) -> None:
+        """
+        Queues a scene description (when choice_index is None) or a choice text to be translated.
+
+        Args:
+            language (str): The language the text should be translated to.
+            scene (str): The scene the text belongs to.
+            choice_index (int): The index of the choice in the scene, or None for the scene description.
+            text (str): The English text.
+
+        Returns:
+            None
+        """
+        if self.config.language_code(language) != "en":
+            self.pending_translations.append((language, scene, choice_index, text))
+
+    def translate_pending(self) -> None:
+        """
+        Translates every queued scene description and choice.
+
+        The texts are deduplicated and sent to the translator in batches, concurrently across languages.
+
+        Returns:
+            None
+        """
+        if not self.pending_translations:
+            return
+
+        translations = TranslationManagerInstance.translate_many(
+            (text, "en", self.config.language_code(language))
+            for language, _, _, text in self.pending_translations
+        )
+        for language, scene, choice_index, text in self.pending_translations:
+            translation = translations[
+                (text, "en", self.config.language_code(language))
+            ]
+            if choice_index is None:
+                self.scenes[language][scene]["description"] = translation
             else:
-                self.choices["English"][scene] = [(choice, next_scene)]
+                next_scene = self.choices[language][scene][choice_index][1]
+                self.choices[language][scene][choice_index] = (translation, next_scene)
+        self.pending_translations = []
+
+    def compile(self, path: str = None) -> str:
+        """
+        Compiles the story into a bundle file that can be shipped with the game instead of translating the
+        story on every launch.
+
+        The bundle keeps the scene graph once and the texts of each language separately, see `StoryBundle`.
+
+        Args:
+            path (str, optional): The path of the bundle file. Defaults to the configured story bundle path.
+
+        Returns:
+            str: The path of the bundle file.
+        """
+        fingerprint = self.fingerprint()
+        self.translate_pending()
+        return StoryBundle.write(
+            path or self.config.story_bundle_path,
+            self.scenes,
+            self.choices,
+            fingerprint,
+            self.config,
+        )
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of the scenes and choices as they were written (before being translated), so a compiled
+        bundle can tell if the story changed after it was compiled.
+
+        Images are hashed relative to the images folder (see `StoryBundle.relative_image`), so a bundle compiled
+        on one machine or resolution still matches the story when the game runs from somewhere else.
+
+        Returns:
+            str: The hex SHA-256 digest of the story.
+        """
+        language = self.story_languages()[0]
+        scenes = {
+            scene_id: {
+                **scene,
+                "image": StoryBundle.relative_image(scene["image"], self.config),
+            }
+            for scene_id, scene in self.scenes.get(language, {}).items()
+        }
+        source = repr(
+            (
+                sorted(scenes.items()),
+                sorted(self.choices.get(language, {}).items()),
+            )
+        )
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def load_bundle(self, path: str = None) -> bool:
+        """
+        Loads the scenes and choices from a compiled bundle file, replacing the ones added to the story.
+
+        Scenes and choices are only read from the bundle when they are requested, in the requested language.
+        If scenes were already added to the story and they changed after the bundle was compiled, the bundle
+        is outdated and it isn't loaded.
+
+        Args:
+            path (str, optional): The path of the bundle file. Defaults to the configured story bundle path.
+
+        Returns:
+            bool: True if the bundle was loaded, False if it is outdated.
+        """
+        bundle = StoryBundle(path or self.config.story_bundle_path, self.config)
+        if self.scenes and bundle.fingerprint != self.fingerprint():
+            print(f"{bundle.path} is outdated, compile the story again to use it.")
+            bundle.close()
+            return False
+
+        self.bundle = bundle
+        self.scenes = {
+            language: self.bundle.scenes_view(language)
+            for language in self.bundle.languages()
+        }
+        self.choices = {
+            language: self.bundle.choices_view(language)
+            for language in self.bundle.languages()
+        }
+        self.scene_positions = {
+            scene: index for index, scene in enumerate(self.bundle.scene_ids())
+        }
+        self.pending_translations = []
+        return True
 
     def screen_manager(self) -> None:
         """
@@ -236,7 +853,13 @@ class Story:
         Returns:
             None
         """
-        for event in pygame.event.get():
+        for event in self.poll_events():
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.mark_dirty()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Shows or hides the frame timings
+                self.profiler.toggle_overlay()
+                self.mark_dirty()
             match self.current_game_state:
                 case self.possible_game_states.language_menu:
                     MenuHandler.handle_language_menu(self, event)
@@ -266,6 +889,40 @@ class Story:
                 ScreenHandler.handle_game_dialogue_screen(self, event)
 
 
+def load_story(entry_point: str) -> Story:
+    """
+    Loads the story defined on a script (like main.py) without running the game.
+
+    The script runs with every Story created headless, so no window is opened, and since scenes and choices
+    are only translated right before the game runs, nothing is translated either. The script's `main()`
+    isn't called, as it doesn't run as `__main__`.
+
+    Args:
+        entry_point (str): The path of the script that defines the story.
+
+    Raises:
+        ValueError: If the script doesn't create a Story.
+
+    Returns:
+        Story: The story defined on the script.
+    """
+    entry_point = os.path.abspath(entry_point)
+    script_dir = os.path.dirname(entry_point)
+    sys.path.insert(0, script_dir)
+    previous_headless_mode = Story.headless_mode
+    Story.headless_mode = True
+    try:
+        script_globals = runpy.run_path(entry_point, run_name="__pynovel_story__")
+    finally:
+        Story.headless_mode = previous_headless_mode
+        sys.path.remove(script_dir)
+
+    stories = [value for value in script_globals.values() if isinstance(value, Story)]
+    if not stories:
+        raise ValueError(f"{entry_point} doesn't define a Story.")
+    return stories[0]
+
+
 class StoryFlow:
     """
     Represents the flow of a story in a game.
@@ -278,12 +935,14 @@ class StoryFlow:
         choices (dict): A dictionary containing the choices available in each scene.
         current_choice (str): The current choice.
         choices_items (list): A list of choices buttons.
+        story (Story): The story the flow was created from.
         screen: The screen object used for displaying the game.
         selected_language (str): The selected language for the game.
         active_item_index (int, optional): The index of the active item in the choices screens. Defaults to 0.
     """
 
     def __init__(self, story: Story) -> None:
+        self.story = story
         self.possible_game_states = story.possible_game_states
         self.current_game_state = story.current_game_state
         self.scenes = story.scenes[story.selected_language]
@@ -307,3 +966,6 @@ class StoryFlow:
                 ScreenBuilder(self).build_choice_screen()
             case _:
                 ScreenBuilder(self).build_dialogue_screen()
+
+        # Keep the buttons on the story so the handlers know where each choice was drawn
+        self.story.choices_items = self.choices_items
@@ -1,4 +1,7 @@
 class StoryCohesionError(Exception):
-    def __init__(self, message="Story cohesion error: The story is not cohesive."):
-        self.message = message
+    def __init__(
+        self, message="Story cohesion error: The story is not cohesive.", report=None
+    ):
+        self.report = report
+        self.message = message if report is None else f"{message}\n{report}"
         super().__init__(self.message)
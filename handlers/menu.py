@@ -2,8 +2,8 @@ from typing import TYPE_CHECKING
 
 import pygame
 
-from builders.popup import PopupBuilder
 from managers.save_manager import NoGameSaved, SaveAndLoadManager
+from managers.snapshot_manager import SessionSnapshot
 from resources.texts import TextManagerInstance
 
 if TYPE_CHECKING:
@@ -37,11 +37,14 @@ class MenuHandler:
                         story.active_item_index = (story.active_item_index - 1) % len(
                             story.menu_items[story.selected_language]
                         )
+                        story.mark_dirty()
                     case pygame.K_DOWN:
                         story.active_item_index = (story.active_item_index + 1) % len(
                             story.menu_items[story.selected_language]
                         )
+                        story.mark_dirty()
                     case pygame.K_RETURN:
+                        story.mark_dirty()
                         if (
                             story.menu_items[story.selected_language][
                                 story.active_item_index
@@ -91,22 +94,36 @@ class MenuHandler:
                                 f"Selected: {story.menu_items[story.selected_language][story.active_item_index]}"
                             )
                             try:
-                                last_saved_state: str = SaveAndLoadManager.load_game()
-                                story.popup_info = PopupBuilder.init_popup(
-                                    story.screen, mode="load_success"
+                                snapshot = SaveAndLoadManager.load_session(
+                                    story.save_directory
                                 )
+                                story.show_popup("load_success")
                                 # Wait a little bit before redirecting user to the state from the game
-                                # the user previously saved
-                                pygame.time.wait(2000)
-                                story.current_game_state = (
-                                    story.possible_game_states.game
+                                # the user previously saved, while the game keeps running
+                                story.after(
+                                    2000,
+                                    lambda: MenuHandler.resume_game(story, snapshot),
+                                    name="load_game",
                                 )
-                                story.current_scene = last_saved_state
                             except NoGameSaved as exc:
                                 print(exc.message)
-                                story.popup_info = PopupBuilder.init_popup(
-                                    story.screen, mode="load_failed"
-                                )
+                                story.show_popup("load_failed")
+
+    def resume_game(story: "Story", snapshot: SessionSnapshot) -> None:
+        """
+        Takes the player to the game they loaded, unless they already left the main menu.
+
+        Args:
+            story (Story): The story object.
+            snapshot (SessionSnapshot): The loaded session.
+
+        Returns:
+            None
+        """
+        if story.current_game_state != story.possible_game_states.main_menu:
+            return
+        story.current_game_state = story.possible_game_states.game
+        story.restore(snapshot)
 
     def handle_language_menu(
         story: "Story",
@@ -133,13 +150,16 @@ class MenuHandler:
                         story.active_item_index = (story.active_item_index - 1) % len(
                             story.languages
                         )
+                        story.mark_dirty()
                     case pygame.K_DOWN:
                         story.active_item_index = (story.active_item_index + 1) % len(
                             story.languages
                         )
+                        story.mark_dirty()
                     case pygame.K_RETURN:
                         story.current_game_state = story.possible_game_states.main_menu
                         story.selected_language = story.languages[
                             story.active_item_index
                         ]
                         story.active_item_index = 0
+                        story.mark_dirty()
@@ -2,9 +2,6 @@ from typing import TYPE_CHECKING
 
 import pygame
 
-from builders.popup import PopupBuilder
-from managers.save_manager import CantSaveGame, SaveAndLoadManager
-
 if TYPE_CHECKING:
     from engine import Story
 
@@ -20,6 +17,9 @@ class ScreenHandler:
         clear_screen(screen, bg_color) -> None:
             Clear the screen with the background color.
 
+        mark_choices_dirty(story, previous_index) -> None:
+            Mark the areas of the choices whose highlight changed as dirty.
+
         handle_about_screen(story, event):
             Handle the about screen based on the given event.
 
@@ -39,6 +39,26 @@ class ScreenHandler:
         """
         screen.fill(bg_color)
 
+    def mark_choices_dirty(story: "Story", previous_index: int) -> None:
+        """
+        Marks only the previously and currently highlighted choices as dirty, so moving the highlight
+        doesn't send the whole screen to the display.
+
+        If the choices weren't drawn yet, the whole screen is marked as dirty.
+
+        Args:
+            story (Story): The story object.
+            previous_index (int): The index of the choice highlighted before.
+
+        Returns:
+            None
+        """
+        indexes = (previous_index, story.active_item_index)
+        if max(indexes) < len(story.choices_items):
+            story.mark_dirty([story.choices_items[index].rect for index in indexes])
+        else:
+            story.mark_dirty()
+
     def handle_about_screen(story: "Story", event: pygame.event.Event) -> None:
         """
         Handles events for the about screen.
@@ -58,6 +78,7 @@ class ScreenHandler:
                     case pygame.K_ESCAPE:
                         story.current_game_state = story.possible_game_states.main_menu
                         story.active_item_index = 0
+                        story.mark_dirty()
 
     def handle_help_screen(story: "Story", event: pygame.event.Event) -> None:
         """
@@ -78,6 +99,7 @@ class ScreenHandler:
                     case pygame.K_ESCAPE:
                         story.current_game_state = story.possible_game_states.main_menu
                         story.active_item_index = 0
+                        story.mark_dirty()
 
     def handle_game_dialogue_screen(story: "Story", event: pygame.event.Event) -> None:
         """
@@ -98,18 +120,11 @@ class ScreenHandler:
                     case pygame.K_ESCAPE:
                         story.running = False
                     case pygame.K_s:
-                        try:
-                            SaveAndLoadManager.save_game(story.current_scene)
-                            story.popup_info = PopupBuilder.init_popup(
-                                story.screen, mode="save_success"
-                            )
-                        except CantSaveGame as exc:
-                            print(exc)
-                            story.popup_info = PopupBuilder.init_popup(
-                                story.screen, mode="save_error"
-                            )
+                        # The save is written in background, see Story.collect_saves
+                        story.save_game()
                     case pygame.K_RETURN:
                         story.current_game_state = "in_choice"
+                        story.mark_dirty()
 
     def handle_game_choice_screen(story: "Story", event: pygame.event.Event) -> None:
         """
@@ -130,25 +145,22 @@ class ScreenHandler:
                     case pygame.K_ESCAPE:
                         story.running = False
                     case pygame.K_s:
-                        try:
-                            SaveAndLoadManager.save_game(story.current_scene)
-                            story.popup_info = PopupBuilder.init_popup(
-                                story.screen, mode="save_success"
-                            )
-                        except CantSaveGame as exc:
-                            print(exc)
-                            story.popup_info = PopupBuilder.init_popup(
-                                story.screen, mode="save_error"
-                            )
+                        # The save is written in background, see Story.collect_saves
+                        story.save_game()
                     case pygame.K_UP:
+                        previous_index = story.active_item_index
                         story.active_item_index = (story.active_item_index - 1) % len(
                             story.choices[story.selected_language][story.current_scene]
                         )
+                        ScreenHandler.mark_choices_dirty(story, previous_index)
                     case pygame.K_DOWN:
+                        previous_index = story.active_item_index
                         story.active_item_index = (story.active_item_index + 1) % len(
                             story.choices[story.selected_language][story.current_scene]
                         )
+                        ScreenHandler.mark_choices_dirty(story, previous_index)
                     case pygame.K_RETURN:
+                        story.mark_dirty()
                         if (
                             story.choices[story.selected_language][story.current_scene][
                                 story.active_item_index
@@ -156,6 +168,9 @@ class ScreenHandler:
                             == "end_scene"
                         ):
                             story.running = False
+                        else:
+                            # Goes from the choices to the next scene with the configured transition
+                            story.start_transition()
                         story.current_game_state = story.choices[
                             story.selected_language
                         ][story.current_scene][story.active_item_index][1]
@@ -165,3 +180,5 @@ class ScreenHandler:
                         story.current_scene = story.choices[story.selected_language][
                             story.current_scene
                         ][story.active_item_index][1]
+                        if story.current_scene != "end_scene":
+                            story.history.append(story.current_scene)
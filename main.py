@@ -1,5 +1,7 @@
 import argparse
+import os
 
+from configs import config
 from engine import Story
 
 """
@@ -76,10 +78,20 @@ def main():
     argparser.add_argument(
         "--check-cohesion", action="store_true", help="Check if the story is cohesive"
     )
+    argparser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the story into a bundle that is loaded instead of translating it on every launch",
+    )
     args = argparser.parse_args()
     if args.check_cohesion:
         story.check_story()
+    elif args.compile:
+        print(f"Story compiled to {story.compile()}")
     else:
+        # If the story was compiled, load it from the bundle instead of translating it
+        if os.path.exists(config.story_bundle_path):
+            story.load_bundle(config.story_bundle_path)
         story.run()
 
 
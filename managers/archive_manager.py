@@ -0,0 +1,210 @@
+import io
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Tuple
+
+import pygame
+
+# The archive starts with a header: magic, version, number of entries and the offset of the index
+HEADER = struct.Struct("<4sHHIQ")
+MAGIC = b"PNAA"
+VERSION = 1
+# Index entries: where the name of the asset starts on the names blob and its length,
+# where the data of the asset starts on the archive and its length, and the kind of data
+INDEX_ENTRY = struct.Struct("<IIQQI")
+# Assets are stored as they are on disk (e.g. PNG files) or as raw, already decoded pixels
+ENCODED = 0
+RAW = 1
+# Raw pixels start with their own header: magic, width, height, pitch and pixel format
+RAW_HEADER = struct.Struct("<4sIIII")
+RAW_MAGIC = b"PRAW"
+RAW_FORMATS = ["RGB", "RGBA"]
+# The data of every asset starts on a multiple of this, so raw pixels are well aligned
+ALIGNMENT = 16
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def encode_surface(surface: pygame.Surface) -> bytes:
+    """
+    Encodes the pixels of a surface, uncompressed, with a small header describing them.
+
+    Args:
+        surface (pygame.Surface): The surface to encode.
+
+    Returns:
+        bytes: The header and the pixels of the surface.
+    """
+    pixel_format = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+    width, height = surface.get_size()
+    pitch = width * len(pixel_format)
+    return RAW_HEADER.pack(
+        RAW_MAGIC, width, height, pitch, RAW_FORMATS.index(pixel_format)
+    ) + pygame.image.tobytes(surface, pixel_format)
+
+
+def decode_surface(buffer) -> pygame.Surface:
+    """
+    Builds a surface from pixels encoded with `encode_surface`, without copying or decompressing them.
+
+    The surface shares the memory of the buffer, so the buffer has to outlive it.
+
+    Args:
+        buffer: The encoded pixels (any object supporting the buffer protocol, e.g. a memoryview of an mmap).
+
+    Returns:
+        pygame.Surface: The decoded surface.
+
+    Raises:
+        ValueError: If the buffer doesn't hold raw pixels.
+    """
+    magic, width, height, pitch, pixel_format = RAW_HEADER.unpack_from(buffer, 0)
+    if magic != RAW_MAGIC or pixel_format >= len(RAW_FORMATS):
+        raise ValueError("The buffer doesn't hold raw pixels.")
+    pixels = memoryview(buffer)[RAW_HEADER.size : RAW_HEADER.size + pitch * height]
+    return pygame.image.frombuffer(pixels, (width, height), RAW_FORMATS[pixel_format])
+
+
+class AssetArchive:
+    """
+    A single file packing the assets of a game, read through a memory map.
+
+    The archive has an index with the offset of each asset, so assets are located with a dictionary lookup
+    and loaded straight from the mapped file: nothing is extracted to disk and no file is opened or stat-ed
+    per asset. Images can be stored as raw pixels, which are turned into surfaces without decoding them.
+
+    Attributes:
+        path (str): The path of the archive file.
+        entries (dict): The offset, length and kind of each asset, by name.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index_offset = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an asset archive (version {VERSION}).")
+
+        names_offset = index_offset + count * INDEX_ENTRY.size
+        self.entries: Dict[str, Tuple[int, int, int]] = {}
+        for index in range(count):
+            name_start, name_length, offset, length, kind = INDEX_ENTRY.unpack_from(
+                self._data, index_offset + index * INDEX_ENTRY.size
+            )
+            name = self._data[
+                names_offset + name_start : names_offset + name_start + name_length
+            ].decode("utf-8")
+            self.entries[name] = (offset, length, kind)
+
+    @staticmethod
+    def write(path: str, files: Dict[str, str], raw: bool = False) -> str:
+        """
+        Packs files into an archive.
+
+        Args:
+            path (str): The path of the archive file.
+            files (dict): The path of each file to pack, by the name it will have on the archive.
+            raw (bool, optional): Whether images are stored as raw pixels. Defaults to False.
+
+        Returns:
+            str: The path of the archive file.
+        """
+        names = sorted(files)
+        index = []
+        names_blob = b""
+        offset = HEADER.size
+        with open(path, "wb") as archive_file:
+            archive_file.write(b"\0" * HEADER.size)
+            for name in names:
+                if raw and name.lower().endswith(IMAGE_EXTENSIONS):
+                    data, kind = encode_surface(pygame.image.load(files[name])), RAW
+                else:
+                    with open(files[name], "rb") as packed_file:
+                        data, kind = packed_file.read(), ENCODED
+                padding = -offset % ALIGNMENT
+                archive_file.write(b"\0" * padding)
+                offset += padding
+                encoded_name = name.encode("utf-8")
+                index.append(
+                    INDEX_ENTRY.pack(
+                        len(names_blob), len(encoded_name), offset, len(data), kind
+                    )
+                )
+                names_blob += encoded_name
+                archive_file.write(data)
+                offset += len(data)
+            archive_file.writelines(index)
+            archive_file.write(names_blob)
+            archive_file.seek(0)
+            archive_file.write(HEADER.pack(MAGIC, VERSION, 0, len(names), offset))
+        return path
+
+    @staticmethod
+    def pack_folder(path: str, folder: str, prefix: str = "", raw: bool = False) -> str:
+        """
+        Packs every file under a folder into an archive.
+
+        Args:
+            path (str): The path of the archive file.
+            folder (str): The folder to pack.
+            prefix (str, optional): The folder the files will be in on the archive (e.g. "resources/images/hd").
+            raw (bool, optional): Whether images are stored as raw pixels. Defaults to False.
+
+        Returns:
+            str: The path of the archive file.
+        """
+        files = {}
+        for directory, _, names in os.walk(folder):
+            for file_name in names:
+                file_path = os.path.join(directory, file_name)
+                name = os.path.relpath(file_path, folder).replace(os.sep, "/")
+                files[f"{prefix.rstrip('/')}/{name}" if prefix else name] = file_path
+        return AssetArchive.write(path, files, raw)
+
+    def close(self) -> None:
+        try:
+            self._data.close()
+        except BufferError:
+            # Surfaces made from raw pixels still use the mapped memory,
+            # the map is closed once they are garbage collected
+            pass
+        self._file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read(self, name: str) -> memoryview:
+        """
+        Returns the data of an asset, without copying it.
+
+        Raises:
+            KeyError: If the asset isn't on the archive.
+        """
+        offset, length, _ = self.entries[name]
+        return memoryview(self._data)[offset : offset + length]
+
+    def load_image(self, name: str) -> pygame.Surface:
+        """
+        Loads an image from the archive. Raw images share the mapped memory and aren't decoded at all.
+
+        Args:
+            name (str): The name of the image on the archive.
+
+        Returns:
+            pygame.Surface: The image.
+
+        Raises:
+            KeyError: If the image isn't on the archive.
+        """
+        _, _, kind = self.entries[name]
+        if kind == RAW:
+            return decode_surface(self.read(name))
+        return pygame.image.load(io.BytesIO(self.read(name)), name)
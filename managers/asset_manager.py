@@ -0,0 +1,191 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import pygame
+
+from configs import Config, config
+from managers.build_manager import BuildManifest
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def derive_asset(master_path: str, output_path: str, scale: float) -> Tuple[str, str]:
+    """
+    Writes a variant of a master asset. Images are resized with `scale`, other files (e.g. .icns icons) are copied.
+
+    The variant is written to a temporary file first and then moved over the output, so
+    a failed run never leaves a half-written image behind.
+
+    Args:
+        master_path (str): The path of the master asset.
+        output_path (str): The path of the variant.
+        scale (float): How much the image is resized (e.g. 0.5 for half of the master size).
+
+    Returns:
+        tuple: The output path and the error message, or None if the variant was written.
+    """
+    temporary_path = f"{output_path}.tmp{os.path.splitext(output_path)[1]}"
+    try:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if not master_path.lower().endswith(IMAGE_EXTENSIONS):
+            shutil.copyfile(master_path, temporary_path)
+        else:
+            master = pygame.image.load(master_path)
+            if master.get_bitsize() not in (24, 32):
+                # smoothscale only works on 24 and 32 bits surfaces
+                converted = pygame.Surface(master.get_size(), pygame.SRCALPHA, 32)
+                converted.blit(master, (0, 0))
+                master = converted
+            width, height = master.get_size()
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            variant = (
+                master
+                if size == (width, height)
+                else pygame.transform.smoothscale(master, size)
+            )
+            pygame.image.save(variant, temporary_path)
+        os.replace(temporary_path, output_path)
+    except (OSError, pygame.error) as exc:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return output_path, str(exc)
+    return output_path, None
+
+
+class AssetPipeline:
+    """
+    Derives the images of every resolution from a single set of master images.
+
+    The masters live on the folder of `config.master_resolution` (4k by default), and the variant of each
+    resolution is resized with its factor on `config.resolution_scales`. Variants are cached by the content
+    hash of their master, so editing one master only reprocesses that image, on every resolution.
+
+    Attributes:
+        images_root (str): The folder with a subfolder of images for each resolution.
+        master_resolution (str): The resolution of the master images.
+        manifest (BuildManifest): The content hashes the variants were derived from.
+    """
+
+    def __init__(
+        self,
+        config: Config = config,
+        images_root: str = None,
+        manifest_path: str = None,
+    ) -> None:
+        self.config: Config = config
+        self.images_root: str = images_root or self.config.resource_path(
+            "resources/images"
+        )
+        self.master_resolution: str = self.config.master_resolution
+        self.manifest: BuildManifest = BuildManifest(
+            manifest_path or self.config.asset_manifest_path
+        )
+
+    def master_dir(self) -> str:
+        return os.path.join(self.images_root, self.master_resolution)
+
+    def masters(self) -> List[str]:
+        """
+        Lists the master assets, relative to the masters folder.
+        """
+        masters = []
+        for directory, folders, files in os.walk(self.master_dir()):
+            folders[:] = sorted(
+                folder for folder in folders if not folder.startswith(".")
+            )
+            for name in sorted(files):
+                if name.startswith(".") or ".tmp." in name:
+                    continue
+                masters.append(
+                    os.path.relpath(os.path.join(directory, name), self.master_dir())
+                )
+        return masters
+
+    def plan(self, resolutions: List[str] = None, force: bool = False) -> List[dict]:
+        """
+        Lists the variant of each master on each resolution, and whether it has to be derived again.
+
+        Args:
+            resolutions (list, optional): The resolutions to derive. Defaults to every available resolution but the masters one.
+            force (bool, optional): Whether every variant is derived again. Defaults to False.
+
+        Returns:
+            list: The master, output, resolution, scale, inputs and reasons to derive each variant.
+        """
+        resolutions = resolutions or [
+            resolution
+            for resolution in self.config.available_resolutions
+            if resolution != self.master_resolution
+        ]
+        tasks = []
+        for master in self.masters():
+            master_path = os.path.join(self.master_dir(), master)
+            digest = self.manifest.file_digest(master_path)
+            for resolution in resolutions:
+                if resolution == self.master_resolution:
+                    continue
+                scale = self.config.resolution_scales[resolution]
+                output_path = os.path.join(self.images_root, resolution, master)
+                target = os.path.join(resolution, master).replace(os.sep, "/")
+                inputs = {"master": digest, "scale": repr(scale)}
+                if force:
+                    reasons = ["forced"]
+                else:
+                    reasons = self.manifest.changes(target, inputs)
+                    if not reasons and not os.path.exists(output_path):
+                        reasons = ["output missing"]
+                tasks.append(
+                    {
+                        "target": target,
+                        "master": master_path,
+                        "output": output_path,
+                        "scale": scale,
+                        "inputs": inputs,
+                        "reasons": reasons,
+                    }
+                )
+        return tasks
+
+    def run(
+        self, resolutions: List[str] = None, jobs: int = None, force: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Derives the variants whose master changed, resizing up to `jobs` images at the same time.
+
+        Args:
+            resolutions (list, optional): The resolutions to derive. Defaults to every available resolution but the masters one.
+            jobs (int, optional): The maximum number of images processed at the same time. Defaults to the number of CPUs.
+            force (bool, optional): Whether every variant is derived again. Defaults to False.
+
+        Returns:
+            dict: The variants that were "derived", "cached" (up to date) and "failed" (with their errors).
+        """
+        tasks = self.plan(resolutions, force)
+        pending = [task for task in tasks if task["reasons"]]
+        report = {
+            "derived": [],
+            "cached": [task["target"] for task in tasks if not task["reasons"]],
+            "failed": [],
+        }
+
+        arguments = [
+            (task["master"], task["output"], task["scale"]) for task in pending
+        ]
+        jobs = min(jobs or os.cpu_count() or 1, len(pending))
+        if jobs <= 1:
+            results = [derive_asset(*argument) for argument in arguments]
+        else:
+            # Decoding and resizing images is CPU bound, so the images are spread over processes
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(derive_asset, *zip(*arguments)))
+
+        for task, (_, error) in zip(pending, results):
+            self.manifest.record(task["target"], task["inputs"], error is None)
+            if error is None:
+                report["derived"].append(task["target"])
+            else:
+                report["failed"].append(f"{task['target']}: {error}")
+        self.manifest.save()
+        return report
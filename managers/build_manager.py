@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List
+
+MANIFEST_VERSION = 1
+
+
+class BuildManifest:
+    """
+    Remembers the inputs of the last build, so the CLI only rebuilds what changed.
+
+    Inputs are identified by the SHA-256 of their contents. The size and modification time of every hashed
+    file are kept along with its digest, so files that weren't touched since the last build aren't read again.
+
+    Attributes:
+        path (str): The path of the manifest file.
+        files (dict): The size, modification time (in nanoseconds) and digest of every hashed file, by path.
+        source (str): The digest of the source tree the pre-build steps (tests, formatting...) last succeeded on.
+        targets (dict): The inputs of the last build of each target, and whether it succeeded.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.files: Dict[str, list] = {}
+        self.source: str = None
+        self.targets: Dict[str, dict] = {}
+        if os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        """
+        Reads the manifest file. Manifests that can't be read (or from another version) are ignored.
+
+        Returns:
+            None
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if manifest.get("version") != MANIFEST_VERSION:
+            return
+        self.files = manifest.get("files", {})
+        self.source = manifest.get("source")
+        self.targets = manifest.get("targets", {})
+
+    def save(self) -> bool:
+        """
+        Writes the manifest file.
+
+        Returns:
+            bool: Whether the manifest could be written.
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "files": self.files,
+            "source": self.source,
+            "targets": self.targets,
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as manifest_file:
+                json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        except OSError as exc:
+            print(f"Couldn't save the build manifest: {exc}")
+            return False
+        return True
+
+    def file_digest(self, path: str) -> str:
+        """
+        Returns the SHA-256 of a file, reading it only if it changed since it was last hashed.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            str: The hex digest of the file contents.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.files.get(path)
+        if known is not None and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        self.files[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.files[path][2]
+
+    def tree_digest(
+        self, root: str, extensions: Iterable[str] = None, exclude: Iterable[str] = ()
+    ) -> str:
+        """
+        Returns a digest of every file under a folder, covering their relative paths and contents.
+
+        Hidden folders (e.g. .git) and __pycache__ folders are skipped.
+
+        Args:
+            root (str): The folder to hash.
+            extensions (iterable, optional): Only hash the files with these extensions. Defaults to every file.
+            exclude (iterable, optional): Folders that are not hashed (e.g. the build output).
+
+        Returns:
+            str: The hex digest of the folder, which is the same for empty and missing folders.
+        """
+        extensions = tuple(extensions) if extensions else None
+        excluded = {os.path.abspath(folder) for folder in exclude}
+        digest = hashlib.sha256()
+        for directory, folders, files in os.walk(root):
+            folders[:] = sorted(
+                folder
+                for folder in folders
+                if not folder.startswith(".")
+                and folder != "__pycache__"
+                and os.path.abspath(os.path.join(directory, folder)) not in excluded
+            )
+            for name in sorted(files):
+                if extensions and not name.endswith(extensions):
+                    continue
+                path = os.path.join(directory, name)
+                relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+                digest.update(relative_path.encode("utf-8") + b"\0")
+                digest.update(self.file_digest(path).encode("ascii"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def digest(value) -> str:
+        """
+        Returns the SHA-256 of a JSON serializable value (e.g. a build command).
+        """
+        return hashlib.sha256(
+            json.dumps(value, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def changes(self, target: str, inputs: Dict[str, str]) -> List[str]:
+        """
+        Compares the inputs of a target with the ones of its last build.
+
+        Args:
+            target (str): The name of the target.
+            inputs (dict): The digest of each input of the target (e.g. "source", "assets", "config").
+
+        Returns:
+            list: Why the target has to be rebuilt, or an empty list if it is up to date.
+        """
+        previous = self.targets.get(target)
+        if previous is None:
+            return ["never built"]
+        if not previous.get("success"):
+            return ["last build failed"]
+        return [
+            f"{name} changed"
+            for name, digest in inputs.items()
+            if previous["inputs"].get(name) != digest
+        ]
+
+    def record(self, target: str, inputs: Dict[str, str], success: bool) -> None:
+        """
+        Records the inputs a target was built with.
+
+        Args:
+            target (str): The name of the target.
+            inputs (dict): The digest of each input of the target.
+            success (bool): Whether the build succeeded.
+
+        Returns:
+            None
+        """
+        self.targets[target] = {"inputs": inputs, "success": success}
@@ -0,0 +1,356 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from configs import Config, config
+
+# The bundle starts with a header telling where each section of the file is:
+# magic, version, number of languages, scenes and choices, the offsets of the shared
+# strings table, the scene records, the choice records and the languages directory,
+# and the fingerprint of the story the bundle was compiled from
+HEADER = struct.Struct("<4sHHIIQQQQ32s")
+MAGIC = b"PNSB"
+VERSION = 1
+# Scene records: scene id, image and character name (indexes on the shared strings table),
+# index of the first choice of the scene and number of choices
+SCENE_RECORD = struct.Struct("<IIIII")
+# Choice records: the next scene (index on the shared strings table)
+CHOICE_RECORD = struct.Struct("<I")
+# Languages directory: the language name (index on the shared strings table) and the offset of its strings table
+LANGUAGE_RECORD = struct.Struct("<IQ")
+COUNT = struct.Struct("<I")
+# Marks the scenes that only have choices (no description, image or character name)
+NO_SCENE = 0xFFFFFFFF
+
+
+def encode_strings(strings: List[str]) -> bytes:
+    """
+    Encodes a strings table: the number of strings, the offset where each string starts
+    (plus the offset where the last one ends) and the UTF-8 encoded strings.
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = [0]
+    for string in encoded:
+        offsets.append(offsets[-1] + len(string))
+    return b"".join(
+        [
+            COUNT.pack(len(encoded)),
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            *encoded,
+        ]
+    )
+
+
+class StoryBundle:
+    """
+    A compiled story, read from a memory-mapped bundle file.
+
+    The bundle keeps the scene graph (scenes, images, character names and where each choice leads to)
+    once, and the texts of each language (scene descriptions and choice texts) in a separate strings
+    table. Nothing is decoded when the bundle is opened: scenes and choices are read from the mapped
+    file the first time they are requested, only in the requested language, so the memory used grows
+    with the scenes actually visited rather than with the size of the story.
+
+    Scene ids are stored sorted, so looking a scene up is a binary search over the file.
+
+    Attributes:
+        path (str): The path of the bundle file.
+        scene_count (int): The number of scenes on the bundle.
+    """
+
+    def __init__(self, path: str, config: Config = config) -> None:
+        self.path: str = path
+        self.config: Config = config
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.language_count,
+            self.scene_count,
+            self.choice_count,
+            self._strings_offset,
+            self._scenes_offset,
+            self._choices_offset,
+            self._languages_offset,
+            fingerprint,
+        ) = HEADER.unpack_from(self._data, 0)
+        self.fingerprint: str = fingerprint.hex()
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a story bundle (version {VERSION}).")
+
+        self._language_tables: Dict[str, int] = {}
+        for index in range(self.language_count):
+            name, offset = LANGUAGE_RECORD.unpack_from(
+                self._data, self._languages_offset + index * LANGUAGE_RECORD.size
+            )
+            self._language_tables[self.string(self._strings_offset, name)] = offset
+
+    @staticmethod
+    def write(
+        path: str,
+        scenes: dict,
+        choices: dict,
+        fingerprint: str = "",
+        config: Config = config,
+    ) -> str:
+        """
+        Compiles the scenes and choices of a story into a bundle file.
+
+        Args:
+            path (str): The path of the bundle file.
+            scenes (dict): The scenes of the story, by language and scene id.
+            choices (dict): The choices of the story, by language and scene id.
+            fingerprint (str, optional): The hex SHA-256 fingerprint of the story source. Defaults to "".
+            config (Config, optional): The configuration object. Defaults to config.
+
+        Returns:
+            str: The path of the bundle file.
+        """
+        languages = list(dict.fromkeys(list(scenes) + list(choices)))
+        # The structure of the story is the same in every language, so it's read from the first one
+        graph_scenes = scenes.get(languages[0], {}) if languages else {}
+        graph_choices = choices.get(languages[0], {}) if languages else {}
+        scene_ids = sorted(
+            set(graph_scenes) | set(graph_choices), key=lambda s: s.encode("utf-8")
+        )
+
+        strings: Dict[str, int] = {scene_id: i for i, scene_id in enumerate(scene_ids)}
+
+        def intern(string: str) -> int:
+            return strings.setdefault(string, len(strings))
+
+        scene_records = []
+        choice_records = []
+        for scene_id in scene_ids:
+            scene = graph_scenes.get(scene_id)
+            scene_choices = graph_choices.get(scene_id, [])
+            scene_records.append(
+                SCENE_RECORD.pack(
+                    strings[scene_id],
+                    (
+                        intern(StoryBundle.relative_image(scene["image"], config))
+                        if scene
+                        else NO_SCENE
+                    ),
+                    intern(scene["character_name"]) if scene else NO_SCENE,
+                    len(choice_records),
+                    len(scene_choices),
+                )
+            )
+            choice_records.extend(
+                CHOICE_RECORD.pack(intern(next_scene))
+                for _, next_scene in scene_choices
+            )
+
+        language_names = [intern(language) for language in languages]
+        language_tables = []
+        for language in languages:
+            language_scenes = scenes.get(language, {})
+            language_choices = choices.get(language, {})
+            texts = [
+                (
+                    language_scenes[scene_id]["description"]
+                    if scene_id in language_scenes
+                    else ""
+                )
+                for scene_id in scene_ids
+            ]
+            for scene_id in scene_ids:
+                texts.extend(text for text, _ in language_choices.get(scene_id, []))
+            language_tables.append(encode_strings(texts))
+
+        strings_table = encode_strings(list(strings))
+        strings_offset = HEADER.size
+        scenes_offset = strings_offset + len(strings_table)
+        choices_offset = scenes_offset + SCENE_RECORD.size * len(scene_records)
+        languages_offset = choices_offset + CHOICE_RECORD.size * len(choice_records)
+        table_offset = languages_offset + LANGUAGE_RECORD.size * len(languages)
+        language_records = []
+        for name, table in zip(language_names, language_tables):
+            language_records.append(LANGUAGE_RECORD.pack(name, table_offset))
+            table_offset += len(table)
+
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(languages),
+            len(scene_ids),
+            len(choice_records),
+            strings_offset,
+            scenes_offset,
+            choices_offset,
+            languages_offset,
+            bytes.fromhex(fingerprint),
+        )
+        with open(path, "wb") as bundle_file:
+            bundle_file.write(header)
+            bundle_file.write(strings_table)
+            bundle_file.writelines(scene_records)
+            bundle_file.writelines(choice_records)
+            bundle_file.writelines(language_records)
+            bundle_file.writelines(language_tables)
+        return path
+
+    @staticmethod
+    def relative_image(image: str, config: Config = config) -> str:
+        """
+        Returns the image path relative to the images folder, so the bundle works on any machine and resolution.
+        """
+        if image.startswith(config.image_path):
+            return image[len(config.image_path) :]
+        return image
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def languages(self) -> List[str]:
+        return list(self._language_tables)
+
+    def string(self, table_offset: int, index: int) -> str:
+        """
+        Reads a string from a strings table.
+
+        Args:
+            table_offset (int): The offset of the strings table on the bundle.
+            index (int): The index of the string on the table.
+
+        Returns:
+            str: The decoded string.
+        """
+        start, end = struct.unpack_from(
+            "<2I", self._data, table_offset + COUNT.size * (index + 1)
+        )
+        (count,) = COUNT.unpack_from(self._data, table_offset)
+        blob = table_offset + COUNT.size * (count + 2)
+        return self._data[blob + start : blob + end].decode("utf-8")
+
+    def scene_index(self, scene_id: str) -> Optional[int]:
+        """
+        Finds the index of a scene record, using a binary search over the sorted scene ids.
+
+        Args:
+            scene_id (str): The id of the scene.
+
+        Returns:
+            int: The index of the scene record, or None if the scene isn't on the bundle.
+        """
+        target = scene_id.encode("utf-8")
+        low, high = 0, self.scene_count
+        while low < high:
+            middle = (low + high) // 2
+            current = self.string(self._strings_offset, middle).encode("utf-8")
+            if current < target:
+                low = middle + 1
+            elif current > target:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def scene_record(self, index: int) -> Tuple[int, int, int, int, int]:
+        return SCENE_RECORD.unpack_from(
+            self._data, self._scenes_offset + index * SCENE_RECORD.size
+        )
+
+    def scene(self, language: str, scene_id: str) -> Optional[dict]:
+        """
+        Reads a scene in a language.
+
+        Args:
+            language (str): The name of the language.
+            scene_id (str): The id of the scene.
+
+        Returns:
+            dict: The description, image and character name of the scene, or None if the scene isn't defined.
+        """
+        index = self.scene_index(scene_id)
+        if index is None:
+            return None
+        _, image, character_name, _, _ = self.scene_record(index)
+        if image == NO_SCENE:
+            return None
+        return {
+            "description": self.string(self._language_tables[language], index),
+            "image": os.path.join(
+                self.config.image_path, self.string(self._strings_offset, image)
+            ),
+            "character_name": self.string(self._strings_offset, character_name),
+        }
+
+    def choices(self, language: str, scene_id: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Reads the choices of a scene in a language.
+
+        Args:
+            language (str): The name of the language.
+            scene_id (str): The id of the scene.
+
+        Returns:
+            list: The (choice text, next scene) pairs of the scene, or None if the scene has no choices.
+        """
+        index = self.scene_index(scene_id)
+        if index is None:
+            return None
+        _, _, _, first_choice, choice_count = self.scene_record(index)
+        if not choice_count:
+            return None
+        table = self._language_tables[language]
+        scene_choices = []
+        for choice in range(first_choice, first_choice + choice_count):
+            (next_scene,) = CHOICE_RECORD.unpack_from(
+                self._data, self._choices_offset + choice * CHOICE_RECORD.size
+            )
+            scene_choices.append(
+                (
+                    self.string(table, self.scene_count + choice),
+                    self.string(self._strings_offset, next_scene),
+                )
+            )
+        return scene_choices
+
+    def scene_ids(self) -> Iterator[str]:
+        for index in range(self.scene_count):
+            yield self.string(self._strings_offset, index)
+
+    def scenes_view(self, language: str) -> "BundleView":
+        return BundleView(self, language, self.scene)
+
+    def choices_view(self, language: str) -> "BundleView":
+        return BundleView(self, language, self.choices)
+
+
+class BundleView(Mapping):
+    """
+    The scenes (or the choices) of a bundle in a language.
+
+    It works as a read-only dictionary keyed by scene id, like `Story.scenes[language]` and
+    `Story.choices[language]`, but each entry is only read from the bundle the first time it
+    is requested.
+    """
+
+    def __init__(self, bundle: StoryBundle, language: str, reader) -> None:
+        self.bundle: StoryBundle = bundle
+        self.language: str = language
+        self._reader = reader
+        self._loaded: dict = {}
+
+    def __getitem__(self, scene_id: str):
+        if scene_id not in self._loaded:
+            value = self._reader(self.language, scene_id)
+            if value is None:
+                raise KeyError(scene_id)
+            self._loaded[scene_id] = value
+        return self._loaded[scene_id]
+
+    def __iter__(self) -> Iterator[str]:
+        for scene_id in self.bundle.scene_ids():
+            if self._reader(self.language, scene_id) is not None:
+                yield scene_id
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
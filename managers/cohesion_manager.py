@@ -0,0 +1,295 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+START_SCENE = "start"
+END_SCENE = "end_scene"
+
+
+class CohesionReport:
+    """
+    The result of analyzing a story.
+
+    Attributes:
+        missing_start (bool): Whether the story has no "start" scene.
+        no_ending (bool): Whether "end_scene" can't be reached from "start".
+        dangling_choices (list): (scene, next scene) pairs of choices leading to scenes that were never defined.
+        unreachable_scenes (list): Scenes that can't be reached from "start".
+        scenes_without_choices (list): Scenes reachable from "start" without any choice to leave them.
+        single_choice_scenes (list): Scenes with just one choice.
+        inescapable_cycles (list): Groups of scenes reachable from "start" whose choices only lead to each other.
+        language_mismatches (list): (language, scene, problem) triples of translations that don't match the story.
+    """
+
+    def __init__(self) -> None:
+        self.missing_start: bool = False
+        self.no_ending: bool = False
+        self.dangling_choices: List[Tuple[str, str]] = []
+        self.unreachable_scenes: List[str] = []
+        self.scenes_without_choices: List[str] = []
+        self.single_choice_scenes: List[str] = []
+        self.inescapable_cycles: List[List[str]] = []
+        self.language_mismatches: List[Tuple[str, str, str]] = []
+
+    @property
+    def is_cohesive(self) -> bool:
+        return not self.problems()
+
+    def problems(self) -> List[str]:
+        """
+        Describes every problem found on the story.
+
+        Returns:
+            list: A message for each problem.
+        """
+        problems = []
+        if self.missing_start:
+            problems.append(f'The story has no "{START_SCENE}" scene.')
+        if self.no_ending:
+            problems.append(
+                f'"{END_SCENE}" can\'t be reached from the "{START_SCENE}" scene.'
+            )
+        problems.extend(
+            f'The choice of "{scene}" leads to "{next_scene}", which is not defined.'
+            for scene, next_scene in self.dangling_choices
+        )
+        problems.extend(
+            f'"{scene}" can\'t be reached from the "{START_SCENE}" scene.'
+            for scene in self.unreachable_scenes
+        )
+        problems.extend(
+            f'"{scene}" has no choices.' for scene in self.scenes_without_choices
+        )
+        problems.extend(
+            f'"{scene}" has just one choice, every scene needs at least two.'
+            for scene in self.single_choice_scenes
+        )
+        problems.extend(
+            f"These scenes only lead to each other: {', '.join(cycle)}."
+            for cycle in self.inescapable_cycles
+        )
+        problems.extend(
+            f'"{scene}" in {language}: {problem}'
+            for language, scene, problem in self.language_mismatches
+        )
+        return problems
+
+    def __str__(self) -> str:
+        if self.is_cohesive:
+            return "Story is cohesive"
+        return "\n".join(self.problems())
+
+
+class CohesionAnalyzer:
+    """
+    Analyzes the scene graph of a story.
+
+    Scene ids are mapped to integers and every check runs in linear time on the number of scenes and choices:
+    reachability is a breadth-first search from "start", and cycles with no way out are found with Tarjan's
+    strongly connected components algorithm, written iteratively so long stories don't hit the recursion limit.
+
+    Args:
+        scenes (dict): The scenes of the story, by language and scene id.
+        choices (dict): The choices of the story, by language and scene id.
+    """
+
+    def __init__(self, scenes: dict, choices: dict) -> None:
+        self.scenes: dict = scenes
+        self.choices: dict = choices
+        languages = list(dict.fromkeys(list(scenes) + list(choices)))
+        # Every language has the same structure, so the graph is built from the English one when it exists
+        self.language: str = (
+            "English" if "English" in languages else next(iter(languages), None)
+        )
+        self.graph_scenes = self.scenes.get(self.language, {})
+        self.graph_choices = self.choices.get(self.language, {})
+
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.adjacency: List[List[int]] = []
+        for scene in self.graph_scenes:
+            self.index(scene)
+        for scene, scene_choices in self.graph_choices.items():
+            source = self.index(scene)
+            for _, next_scene in scene_choices:
+                self.adjacency[source].append(self.index(next_scene))
+
+    def index(self, scene: str) -> int:
+        """
+        Returns the integer id of a scene, adding it to the graph the first time it is seen.
+        """
+        if scene not in self.ids:
+            self.ids[scene] = len(self.names)
+            self.names.append(scene)
+            self.adjacency.append([])
+        return self.ids[scene]
+
+    def analyze(self) -> CohesionReport:
+        """
+        Runs every check on the story.
+
+        Returns:
+            CohesionReport: The problems found on the story.
+        """
+        report = CohesionReport()
+        end = self.ids.get(END_SCENE)
+
+        report.missing_start = START_SCENE not in self.graph_scenes
+        for scene, scene_choices in self.graph_choices.items():
+            for _, next_scene in scene_choices:
+                if next_scene != END_SCENE and next_scene not in self.graph_scenes:
+                    report.dangling_choices.append((scene, next_scene))
+            if len(scene_choices) == 1:
+                report.single_choice_scenes.append(scene)
+
+        reachable = (
+            self.reachable_from(self.ids[START_SCENE])
+            if START_SCENE in self.ids
+            else []
+        )
+        reachable_set = set(reachable)
+        report.no_ending = end is None or end not in reachable_set
+        report.unreachable_scenes = [
+            scene for scene in self.graph_scenes if self.ids[scene] not in reachable_set
+        ]
+        report.scenes_without_choices = [
+            self.names[node]
+            for node in reachable
+            if node != end
+            and self.names[node] in self.graph_scenes
+            and not self.adjacency[node]
+        ]
+        report.inescapable_cycles = [
+            [self.names[node] for node in component]
+            for component in self.closed_cycles(reachable_set, end)
+        ]
+        report.language_mismatches = self.language_mismatches()
+        return report
+
+    def reachable_from(self, start: int) -> List[int]:
+        """
+        Lists the scenes that can be reached from a scene, in breadth-first order.
+        """
+        seen = [False] * len(self.names)
+        seen[start] = True
+        order = [start]
+        queue = deque(order)
+        while queue:
+            for next_node in self.adjacency[queue.popleft()]:
+                if not seen[next_node]:
+                    seen[next_node] = True
+                    order.append(next_node)
+                    queue.append(next_node)
+        return order
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Finds the strongly connected components of the graph with an iterative version of Tarjan's algorithm.
+
+        Returns:
+            list: The scenes of each component.
+        """
+        count = len(self.names)
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                edges = self.adjacency[node]
+                while edge < len(edges):
+                    next_node = edges[edge]
+                    edge += 1
+                    if order[next_node] == -1:
+                        # Visit the next scene and come back to this one afterwards
+                        work.append((node, edge))
+                        work.append((next_node, 0))
+                        break
+                    if on_stack[next_node]:
+                        low[node] = min(low[node], order[next_node])
+                else:
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        return components
+
+    def closed_cycles(self, reachable: set, end: int) -> List[List[int]]:
+        """
+        Finds the cycles reachable from "start" that have no choice leading out of them.
+
+        Args:
+            reachable (set): The scenes reachable from "start".
+            end (int): The id of "end_scene", or None if no choice leads to it.
+
+        Returns:
+            list: The scenes of each closed cycle.
+        """
+        closed = []
+        for component in self.strongly_connected_components():
+            members = set(component)
+            if component[0] not in reachable or end in members:
+                continue
+            is_cycle = (
+                len(component) > 1 or component[0] in self.adjacency[component[0]]
+            )
+            leaves = any(
+                next_node not in members
+                for node in component
+                for next_node in self.adjacency[node]
+            )
+            if is_cycle and not leaves:
+                closed.append(component)
+        return closed
+
+    def language_mismatches(self) -> List[Tuple[str, str, str]]:
+        """
+        Checks that every language has the same scenes and choices as the story, leading to the same scenes.
+
+        Returns:
+            list: (language, scene, problem) triples.
+        """
+        mismatches = []
+        languages = list(dict.fromkeys(list(self.scenes) + list(self.choices)))
+        for language in languages:
+            if language == self.language:
+                continue
+            language_scenes = self.scenes.get(language, {})
+            language_choices = self.choices.get(language, {})
+            for scene in self.graph_scenes:
+                if scene not in language_scenes:
+                    mismatches.append((language, scene, "the scene is missing."))
+            for scene, scene_choices in self.graph_choices.items():
+                targets = [next_scene for _, next_scene in scene_choices]
+                translated_targets = [
+                    next_scene for _, next_scene in language_choices.get(scene, [])
+                ]
+                if targets != translated_targets:
+                    mismatches.append(
+                        (language, scene, "the choices don't match the story.")
+                    )
+            for scene in language_scenes:
+                if scene not in self.graph_scenes:
+                    mismatches.append(
+                        (language, scene, "the scene is not in the story.")
+                    )
+        return mismatches
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+
+from configs import Config, config
+
+
+class FontManager:
+    """
+    A registry of fonts and a cache of rendered texts shared by every builder and button.
+
+    The screens are rebuilt on every frame, so creating fonts and rendering the same strings over
+    and over again takes a good part of the frame time. The FontManager creates each font only once
+    and keeps the most recently rendered text surfaces so they can be blitted again without rendering.
+
+    Attributes:
+        max_texts (int): The maximum number of rendered text surfaces to keep.
+        hits (int): How many times a text was served from the cache.
+        misses (int): How many times a text had to be rendered.
+    """
+
+    def __init__(self, config: Config = config, max_texts: int = None) -> None:
+        self.config: Config = config
+        self.max_texts: int = (
+            max_texts if max_texts is not None else self.config.text_cache_size
+        )
+        self.hits: int = 0
+        self.misses: int = 0
+        self._fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+        self._texts: OrderedDict[
+            Tuple[str, pygame.font.Font, tuple, bool], pygame.Surface
+        ] = OrderedDict()
+
+    def get_font(self, font_file: str = None, size: int = None) -> pygame.font.Font:
+        """
+        Returns the font for a font file and size, creating it only the first time it is requested.
+
+        Args:
+            font_file (str, optional): The path of the font file. Defaults to None (pygame's default font).
+            size (int, optional): The size of the font. Defaults to the medium size on the configuration.
+
+        Returns:
+            pygame.font.Font: The font.
+        """
+        key = (font_file, size or self.config.sizes["medium"])
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(*key)
+            self._fonts[key] = font
+        return font
+
+    def render(
+        self, text: str, font: pygame.font.Font, antialias: bool, color: tuple
+    ) -> pygame.Surface:
+        """
+        Renders a text, reusing the surface rendered before for the same text, font, color and antialias.
+
+        The arguments follow the order of pygame.font.Font.render so it can be swapped in place.
+
+        Args:
+            text (str): The text to render.
+            font (pygame.font.Font): The font to render the text with.
+            antialias (bool): Whether the text should be antialiased.
+            color (tuple): The color of the text.
+
+        Returns:
+            pygame.Surface: The rendered text. It is shared, so it must not be drawn on.
+        """
+        key = (text, font, tuple(color), antialias)
+        surface = self._texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._texts[key] = surface
+        if len(self._texts) > self.max_texts:
+            self._texts.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """
+        Removes every font and rendered text from the cache and resets the counters.
+        """
+        self._fonts.clear()
+        self._texts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, number of fonts and number of rendered texts of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fonts": len(self._fonts),
+            "texts": len(self._texts),
+        }
+
+
+FontManagerInstance = FontManager()
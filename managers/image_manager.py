@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+
+from configs import Config, config
+from managers.archive_manager import AssetArchive
+from managers.surface_cache import RawSurfaceCache
+
+
+class ImageManager:
+    """
+    A process-wide cache of decoded images.
+
+    Loading a PNG means reading it from disk and decompressing it, which is far too slow to do
+    on every frame. The ImageManager keeps the decoded surfaces, already converted to the display
+    pixel format, and hands the same surface back on every call until it is evicted.
+
+    Entries are keyed by image path and target resolution and evicted in least recently used order
+    once the total size of the cached surfaces goes over the configured byte budget.
+
+    Built games pack their images in an asset archive (see `AssetArchive`). When the archive exists,
+    images are read from it instead of from their own files. Otherwise, images with an up to date raw
+    dump (see `RawSurfaceCache`) are built from it instead of decoding their PNG files.
+
+    Attributes:
+        budget (int): The maximum amount of bytes the cached surfaces can take.
+        used_bytes (int): The amount of bytes currently taken by the cached surfaces.
+        hits (int): How many times an image was served from the cache.
+        misses (int): How many times an image had to be loaded from disk.
+    """
+
+    def __init__(
+        self,
+        config: Config = config,
+        budget: int = None,
+        archive: AssetArchive = None,
+        raw_cache: RawSurfaceCache = None,
+    ) -> None:
+        self.config: Config = config
+        self.raw_cache: RawSurfaceCache = raw_cache or RawSurfaceCache(self.config)
+        self._archive: AssetArchive = archive
+        self._archive_checked: bool = archive is not None
+        # The archive is opened by the first image read, which may come from the prefetcher thread
+        self._archive_lock = threading.Lock()
+        self.budget: int = (
+            budget if budget is not None else self.config.image_cache_budget
+        )
+        self.used_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._surfaces: OrderedDict[Tuple[str, str], pygame.Surface] = OrderedDict()
+
+    def load(self, path: str, resolution: str = None) -> pygame.Surface:
+        """
+        Returns the display-format surface of an image, loading it from disk only on a cache miss.
+
+        Args:
+            path (str): The path of the image.
+            resolution (str, optional): The resolution the image is loaded for. Defaults to the configured resolution.
+
+        Returns:
+            pygame.Surface: The decoded image.
+        """
+        key = (path, resolution or self.config.resolution)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.convert(self.read(path))
+        self.store(key, surface)
+        return surface
+
+    def cached(self, path: str, resolution: str = None) -> bool:
+        """
+        Checks if an image is on the cache, without counting it as a hit or changing its eviction order.
+        """
+        return (path, resolution or self.config.resolution) in self._surfaces
+
+    @property
+    def archive(self) -> AssetArchive:
+        """
+        The asset archive of the game, opened the first time it's needed, or None if the game has no archive.
+        """
+        if not self._archive_checked:
+            with self._archive_lock:
+                if not self._archive_checked:
+                    if os.path.exists(self.config.asset_archive_path):
+                        self._archive = AssetArchive(self.config.asset_archive_path)
+                    self._archive_checked = True
+        return self._archive
+
+    def archive_name(self, path: str) -> str:
+        """
+        Returns the name an image has on the asset archive: its path relative to the game resources.
+        """
+        return os.path.relpath(path, self.config.resource_path("")).replace(os.sep, "/")
+
+    def read(self, path: str) -> pygame.Surface:
+        """
+        Loads an image, from the asset archive if it's there, from its raw dump if it has one or from its file otherwise.
+        Nothing is cached.
+
+        Args:
+            path (str): The path of the image.
+
+        Returns:
+            pygame.Surface: The image, as it was stored (not converted to the display format).
+        """
+        archive = self.archive
+        if archive is not None:
+            name = self.archive_name(path)
+            if name in archive:
+                return archive.load_image(name)
+        surface = self.raw_cache.load(path)
+        if surface is not None:
+            return surface
+        return pygame.image.load(path)
+
+    def store(self, key: Tuple[str, str], surface: pygame.Surface) -> None:
+        """
+        Adds a surface to the cache, evicting the least recently used ones to stay within the budget.
+
+        Surfaces bigger than the whole budget are not cached at all.
+
+        Args:
+            key (tuple): The (path, resolution) key of the surface.
+            surface (pygame.Surface): The surface to cache.
+
+        Returns:
+            None
+        """
+        size = self.surface_size(surface)
+        if size > self.budget:
+            return
+
+        if key in self._surfaces:
+            self.used_bytes -= self.surface_size(self._surfaces.pop(key))
+
+        while self._surfaces and self.used_bytes + size > self.budget:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.used_bytes -= self.surface_size(evicted)
+
+        self._surfaces[key] = surface
+        self.used_bytes += size
+
+    def convert(self, surface: pygame.Surface) -> pygame.Surface:
+        """
+        Converts a surface to the display pixel format so blitting it doesn't need a conversion on every frame.
+
+        Surfaces can only be converted once a display mode is set, so they are returned untouched before that.
+
+        Args:
+            surface (pygame.Surface): The surface to convert.
+
+        Returns:
+            pygame.Surface: The converted surface.
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def surface_size(self, surface: pygame.Surface) -> int:
+        """
+        Returns the amount of bytes taken by the pixels of a surface.
+        """
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self) -> None:
+        """
+        Removes every surface from the cache and resets the counters.
+        """
+        self._surfaces.clear()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, number of cached images, used bytes and budget of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": len(self._surfaces),
+            "used_bytes": self.used_bytes,
+            "budget": self.budget,
+        }
+
+
+ImageManagerInstance = ImageManager()
@@ -0,0 +1,170 @@
+import itertools
+import queue
+import threading
+from collections import deque
+from typing import Dict, List, Tuple
+
+import pygame
+
+from configs import Config, config
+from managers.image_manager import ImageManager, ImageManagerInstance
+
+
+class ImagePrefetcher:
+    """
+    Loads the images of the scenes the player can reach next on a background thread.
+
+    Every time the current scene changes, the scenes reachable within `depth` choices are found with a
+    breadth-first search over the choices of the story, and their images are queued, closest scenes first.
+    A loader thread reads and decodes them, up to `budget` bytes per scene change, and hands the decoded
+    surfaces back through a thread-safe queue. The game thread collects them (converting them to the display
+    format, which can only be done on that thread) and stores them on the image cache, so showing the next
+    scene doesn't have to wait for its image to be decoded.
+
+    Attributes:
+        image_manager (ImageManager): The image cache the prefetched images are stored on.
+        depth (int): How many choices ahead images are prefetched.
+        budget (int): The maximum amount of bytes prefetched after each scene change.
+        scene (str): The scene the images were last prefetched for.
+        prefetched (int): How many images were prefetched and stored on the image cache.
+    """
+
+    def __init__(
+        self,
+        config: Config = config,
+        image_manager: ImageManager = ImageManagerInstance,
+        depth: int = None,
+        budget: int = None,
+    ) -> None:
+        self.config: Config = config
+        self.image_manager: ImageManager = image_manager
+        self.depth: int = depth if depth is not None else self.config.prefetch_depth
+        self.budget: int = budget if budget is not None else self.config.prefetch_budget
+        self.scene: str = None
+        self.prefetched: int = 0
+        # Requests are (distance, order, generation, path) tuples, so closer scenes are loaded first
+        self._requests: queue.PriorityQueue = queue.PriorityQueue()
+        self._results: queue.Queue = queue.Queue()
+        self._order = itertools.count()
+        self._generation: int = 0
+        self._queued: set = set()
+        self._thread: threading.Thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.worker, name="image-prefetcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the loader thread, after the image it is loading (if any).
+        """
+        if self._thread is not None:
+            self._generation += 1
+            self._requests.put((-1, next(self._order), None, None))
+            self._thread.join()
+            self._thread = None
+
+    def reachable_scenes(
+        self, choices: Dict[str, List[Tuple[str, str]]], scene: str
+    ) -> List[Tuple[str, int]]:
+        """
+        Lists a scene and the scenes reachable from it within `depth` choices.
+
+        Args:
+            choices (dict): The choices of the story in a language, by scene.
+            scene (str): The scene the search starts from.
+
+        Returns:
+            list: (scene, distance) pairs, in breadth-first order (closest scenes first).
+        """
+        distances = {scene: 0}
+        found = [(scene, 0)]
+        pending = deque([scene])
+        while pending:
+            current = pending.popleft()
+            if distances[current] >= self.depth:
+                continue
+            for _, next_scene in choices.get(current) or []:
+                if next_scene not in distances:
+                    distances[next_scene] = distances[current] + 1
+                    found.append((next_scene, distances[next_scene]))
+                    pending.append(next_scene)
+        return found
+
+    def watch(self, scenes: dict, choices: dict, scene: str) -> None:
+        """
+        Prefetches the images around a scene, if it isn't the scene they were last prefetched for.
+
+        Requests queued for a previous scene that weren't loaded yet are dropped.
+
+        Args:
+            scenes (dict): The scenes of the story in a language, by scene.
+            choices (dict): The choices of the story in a language, by scene.
+            scene (str): The current scene.
+
+        Returns:
+            None
+        """
+        if scene == self.scene:
+            return
+        self.scene = scene
+        self._generation += 1
+        self._queued = set()
+        for next_scene, distance in self.reachable_scenes(choices, scene):
+            scene_data = scenes.get(next_scene)
+            image = scene_data["image"] if scene_data else None
+            if not image or image in self._queued or self.image_manager.cached(image):
+                continue
+            self._queued.add(image)
+            self._requests.put((distance, next(self._order), self._generation, image))
+        if self._queued:
+            self.start()
+
+    def worker(self) -> None:
+        """
+        The loop of the loader thread.
+        """
+        generation, loaded_bytes = None, 0
+        while True:
+            _, _, request_generation, path = self._requests.get()
+            if path is None:
+                return
+            if request_generation != self._generation:
+                # The player moved to another scene since this image was requested
+                continue
+            if request_generation != generation:
+                generation, loaded_bytes = request_generation, 0
+            if loaded_bytes >= self.budget:
+                continue
+            try:
+                surface = self.image_manager.read(path)
+            except (OSError, pygame.error) as exc:
+                print(f"Couldn't prefetch {path}: {exc}")
+                continue
+            loaded_bytes += self.image_manager.surface_size(surface)
+            if loaded_bytes <= self.budget:
+                self._results.put((path, surface))
+
+    def collect(self) -> int:
+        """
+        Stores the images loaded by the loader thread on the image cache. Must be called from the game thread.
+
+        Returns:
+            int: How many images were stored.
+        """
+        collected = 0
+        while True:
+            try:
+                path, surface = self._results.get_nowait()
+            except queue.Empty:
+                return collected
+            if not self.image_manager.cached(path):
+                self.image_manager.store(
+                    (path, self.image_manager.config.resolution),
+                    self.image_manager.convert(surface),
+                )
+                collected += 1
+                self.prefetched += 1
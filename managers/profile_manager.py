@@ -0,0 +1,185 @@
+import cProfile
+import math
+import os
+import time
+from array import array
+from typing import Callable, Dict, List
+
+from configs import Config, config
+
+# The phases of a frame of the game loop, and their indexes
+PHASES = ("screen_manager", "events", "popup", "present", "transition")
+SCREEN_MANAGER, EVENTS, POPUP, PRESENT, TRANSITION = range(len(PHASES))
+# Setting this environment variable to a file path dumps a cProfile profile of the game loop to it on exit
+PROFILE_ENV = "PYNOVEL_PROFILE"
+# Setting this environment variable (to anything) records frame timings from the start
+FRAME_PROFILER_ENV = "PYNOVEL_FRAME_PROFILER"
+
+
+class FrameProfiler:
+    """
+    Records how long each phase of the last frames of the game loop took.
+
+    Timings are kept in a fixed-size ring buffer (a flat array of floats, one row per frame), so recording
+    never allocates and the oldest frames are overwritten. When the profiler is disabled, `begin`, `lap`
+    and `end` return right away, so the game loop pays next to nothing for it.
+
+    Attributes:
+        size (int): How many frames are kept.
+        enabled (bool): Whether frames are being recorded.
+        overlay (bool): Whether the timings are drawn over the game (see `ProfilerOverlayBuilder`).
+        frame_count (int): How many frames were recorded since the profiler was cleared.
+    """
+
+    def __init__(self, config: Config = config, size: int = None) -> None:
+        self.config: Config = config
+        self.size: int = size or self.config.profiler_frames
+        self.enabled: bool = bool(os.environ.get(FRAME_PROFILER_ENV))
+        self.overlay: bool = False
+        self.frame_count: int = 0
+        # Whether frames were recorded before the overlay was shown, to go back to it when it's hidden
+        self._enabled_without_overlay: bool = self.enabled
+        # One row per frame: the time of each phase, then the total time of the frame
+        self._columns: int = len(PHASES) + 1
+        self._timings: array = array("d", bytes(8 * self.size * self._columns))
+        self._row: int = 0
+        self._frame_start: float = 0.0
+        self._lap_start: float = 0.0
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.overlay = False
+
+    def toggle_overlay(self) -> None:
+        """
+        Shows or hides the overlay, recording frames while it's shown.
+
+        Hiding it stops recording, unless frames were being recorded before it was shown.
+        """
+        self.overlay = not self.overlay
+        if self.overlay:
+            self._enabled_without_overlay = self.enabled
+            self.enabled = True
+        else:
+            self.enabled = self._enabled_without_overlay
+
+    def clear(self) -> None:
+        self.frame_count = 0
+        for index in range(len(self._timings)):
+            self._timings[index] = 0.0
+
+    def begin(self) -> None:
+        """
+        Starts recording a frame.
+        """
+        if not self.enabled:
+            return
+        self._frame_start = self._lap_start = time.perf_counter()
+        self._row = (self.frame_count % self.size) * self._columns
+        for column in range(self._columns):
+            self._timings[self._row + column] = 0.0
+
+    def lap(self, phase: int) -> None:
+        """
+        Adds the time since the last lap (or the start of the frame) to a phase of the current frame.
+
+        Args:
+            phase (int): The index of the phase on PHASES.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._timings[self._row + phase] += now - self._lap_start
+        self._lap_start = now
+
+    def skip(self) -> None:
+        """
+        Leaves the time since the last lap out of every phase (e.g. time spent on work that isn't profiled).
+        """
+        if self.enabled:
+            self._lap_start = time.perf_counter()
+
+    def end(self) -> None:
+        """
+        Finishes recording the current frame.
+        """
+        if not self.enabled or not self._frame_start:
+            return
+        self._timings[self._row + len(PHASES)] = time.perf_counter() - self._frame_start
+        self._frame_start = 0.0
+        self.frame_count += 1
+
+    def frames(self) -> List[Dict[str, float]]:
+        """
+        Returns the recorded frames, oldest first.
+
+        Returns:
+            list: The time (in milliseconds) of each phase and the total time of each frame.
+        """
+        count = min(self.frame_count, self.size)
+        first = self.frame_count - count
+        frames = []
+        for frame in range(first, self.frame_count):
+            row = (frame % self.size) * self._columns
+            timings = self._timings[row : row + self._columns]
+            frame_timings = {
+                phase: timings[index] * 1000 for index, phase in enumerate(PHASES)
+            }
+            frame_timings["total"] = timings[len(PHASES)] * 1000
+            frames.append(frame_timings)
+        return frames
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarizes the recorded frames.
+
+        Returns:
+            dict: The mean, p50, p95 and maximum time (in milliseconds) of each phase and of the whole frame.
+        """
+        frames = self.frames()
+        summary = {}
+        for phase in PHASES + ("total",):
+            times = sorted(frame[phase] for frame in frames)
+            if not times:
+                summary[phase] = {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+                continue
+            summary[phase] = {
+                "mean": sum(times) / len(times),
+                "p50": times[max(0, math.ceil(0.5 * len(times)) - 1)],
+                "p95": times[max(0, math.ceil(0.95 * len(times)) - 1)],
+                "max": times[-1],
+            }
+        return summary
+
+    def profile(self, function: Callable[[], None]) -> None:
+        """
+        Runs a function (the game loop), under cProfile if the PYNOVEL_PROFILE environment variable is set.
+
+        The profile is written to the file named by the variable when the function returns, and can be
+        read with `python -m pstats <file>` or tools like snakeviz.
+
+        Args:
+            function (callable): The function to run.
+
+        Returns:
+            None
+        """
+        profile_path = os.environ.get(PROFILE_ENV)
+        if not profile_path:
+            function()
+            return
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            function()
+        finally:
+            profile.disable()
+            profile.dump_stats(profile_path)
+            print(f"Profile of the game loop written to {profile_path}")
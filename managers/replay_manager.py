@@ -0,0 +1,164 @@
+import struct
+from typing import List
+
+import pygame
+
+# Setting this environment variable to a file path records the input of the game to it
+RECORD_ENV = "PYNOVEL_RECORD"
+
+# Recordings start with a header (magic, version, frames per second) followed by one
+# fixed-size record per event: the frame it was handled on, its type, key and modifiers
+HEADER = struct.Struct("<4sHH")
+EVENT = struct.Struct("<IIiH")
+MAGIC = b"PNIR"
+VERSION = 2
+# Version 1 recordings have no frame records, they are replayed on a fixed timestep
+SUPPORTED_VERSIONS = (1, 2)
+# The type of the frame records, whose key is how many milliseconds of the game passed since the previous frame
+FRAME = pygame.NOEVENT
+
+# The events the game handles, the only ones worth recording
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP)
+
+
+class InputRecorder:
+    """
+    Records the events handled by the game, with the frame they were handled on, to a file.
+
+    The time of the game on each frame is recorded too, so replays see the same time on every frame.
+
+    Args:
+        path (str): The path of the recording.
+        fps (int): The frame rate of the game, replays past the last recorded frame advance one frame at this rate.
+
+    Attributes:
+        events (int): How many events were recorded.
+    """
+
+    def __init__(self, path: str, fps: int) -> None:
+        self.path: str = path
+        self.events: int = 0
+        self._last_ticks: int = None
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, fps))
+
+    def record_frame(self, frame: int, ticks: int) -> None:
+        """
+        Records the time of the game on a frame, as the time passed since the previous frame.
+
+        Args:
+            frame (int): The index of the frame.
+            ticks (int): The time of the game on the frame, in milliseconds.
+
+        Returns:
+            None
+        """
+        delta = 0 if self._last_ticks is None else ticks - self._last_ticks
+        self._last_ticks = ticks
+        self._file.write(EVENT.pack(frame, FRAME, delta, 0))
+
+    def record(self, frame: int, events: List[pygame.event.Event]) -> None:
+        """
+        Records the events handled on a frame.
+
+        Args:
+            frame (int): The index of the frame.
+            events (list): The events handled on the frame.
+
+        Returns:
+            None
+        """
+        for event in events:
+            if event.type in RECORDED_EVENTS:
+                self._file.write(
+                    EVENT.pack(
+                        frame,
+                        event.type,
+                        getattr(event, "key", 0),
+                        getattr(event, "mod", 0),
+                    )
+                )
+                self.events += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class InputReplayer:
+    """
+    Feeds the events of a recording back, on the frames they were handled on, with the time of the game
+    each frame had.
+
+    Args:
+        path (str): The path of the recording.
+
+    Raises:
+        ValueError: If the file isn't a recording.
+
+    Attributes:
+        fps (int): The frame rate the recording was made at.
+        events (list): The (frame, event) pairs of the recording, in the order they were handled.
+        last_frame (int): The frame the last event was handled on.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as recording:
+            data = recording.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not an input recording")
+        magic, version, fps = HEADER.unpack_from(data)
+        if magic != MAGIC or version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"{path} is not an input recording")
+        if (len(data) - HEADER.size) % EVENT.size:
+            raise ValueError(f"{path} is truncated")
+
+        self.fps: int = fps
+        self.events: list = []
+        # The time of the game on each recorded frame, counted from the first one
+        self.frame_ticks: List[int] = []
+        for frame, event_type, key, mod in EVENT.iter_unpack(data[HEADER.size :]):
+            if event_type == FRAME:
+                previous = self.frame_ticks[-1] if self.frame_ticks else 0
+                self.frame_ticks.append(previous + key)
+                continue
+            if event_type == pygame.QUIT:
+                event = pygame.event.Event(event_type)
+            else:
+                event = pygame.event.Event(event_type, key=key, mod=mod)
+            self.events.append((frame, event))
+        self.last_frame: int = self.events[-1][0] if self.events else 0
+        self._position: int = 0
+
+    def ticks_for(self, frame: int) -> int:
+        """
+        Returns the time of the game on a frame, in milliseconds.
+
+        Frames after the last recorded one (and every frame of recordings without frame records) advance a
+        fixed timestep of one frame at the recorded frame rate.
+        """
+        if frame < len(self.frame_ticks):
+            return self.frame_ticks[frame]
+        if not self.frame_ticks:
+            return frame * 1000 // self.fps
+        last_frame = len(self.frame_ticks) - 1
+        return self.frame_ticks[-1] + (frame - last_frame) * 1000 // self.fps
+
+    @property
+    def finished(self) -> bool:
+        return self._position >= len(self.events)
+
+    def events_for(self, frame: int) -> List[pygame.event.Event]:
+        """
+        Returns the events handled on a frame (and any earlier one that wasn't fed yet).
+
+        Args:
+            frame (int): The index of the frame.
+
+        Returns:
+            list: The events, in the order they were handled.
+        """
+        events = []
+        while not self.finished and self.events[self._position][0] <= frame:
+            events.append(self.events[self._position][1])
+            self._position += 1
+        return events
@@ -1,63 +1,470 @@
 import json
 import os
+import queue
+import sqlite3
 import sys
-from datetime import datetime
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
 
+from configs import config
 from errors.saveandload import CantSaveGame, NoGameSaved
+from managers.snapshot_manager import SessionSnapshot
+
+# The name of the save store inside the save directory
+SAVE_STORE_NAME = "saves.sqlite3"
+# The slot saves go to when no slot is given
+DEFAULT_SLOT = "default"
+# The version of the store, see SaveStore.migrate
+STORE_VERSION = 1
+
+
+class SaveStore:
+    """
+    The saved games of a save directory, stored in a sqlite database.
+
+    Saves are indexed by time and by slot, so finding the latest save, listing the saves of a slot and
+    pruning old saves take O(log n) instead of scanning every save file. The save files of older versions
+    of the game (save_*.json) are imported the first time the store is opened. A save is either an encoded
+    `SessionSnapshot` (bytes) or a dict, like the saves of older versions, stored as JSON.
+
+    Every method can be called from any thread.
+
+    Attributes:
+        directory (str): The save directory.
+        path (str): The path of the sqlite database.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory: str = directory
+        self.path: str = os.path.join(directory, SAVE_STORE_NAME)
+        self._connection: sqlite3.Connection = None
+        # Reentrant, as opening the store migrates it
+        self._lock = threading.RLock()
+
+    def open(self) -> None:
+        """
+        Opens the database, creating it (and the save directory) if needed.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._connection is not None:
+                return
+
+            os.makedirs(self.directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS saves ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, slot TEXT NOT NULL, "
+                    "created REAL NOT NULL, data TEXT NOT NULL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS saves_by_time ON saves (created, id)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS saves_by_slot ON saves (slot, created, id)"
+                )
+            self.migrate()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def migrate(self) -> int:
+        """
+        Imports the save files of older versions of the game, once.
+
+        The files are left in the save directory, they are just never read again.
+
+        Returns:
+            int: How many saves were imported.
+        """
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= STORE_VERSION:
+            return 0
+
+        rows = []
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("save_") and filename.endswith(".json")):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                with open(path, "r") as save_file:
+                    save_dict = json.load(save_file)
+                rows.append(
+                    (DEFAULT_SLOT, os.path.getmtime(path), json.dumps(save_dict))
+                )
+            except (OSError, ValueError) as exc:
+                print(f"Couldn't import the saved game {filename}: {exc}")
+        rows.sort(key=lambda row: row[1])
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO saves (slot, created, data) VALUES (?, ?, ?)", rows
+            )
+            self._connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        if rows:
+            print(f"Imported {len(rows)} saved games to {self.path}")
+        return len(rows)
+
+    def add(
+        self, data: Union[bytes, dict], slot: str = DEFAULT_SLOT, created: float = None
+    ) -> int:
+        """
+        Stores a save.
+
+        Args:
+            data (bytes or dict): The saved game.
+            slot (str, optional): The slot of the save. Defaults to DEFAULT_SLOT.
+            created (float, optional): When the game was saved (a timestamp). Defaults to now.
+
+        Returns:
+            int: The id of the save.
+        """
+        self.open()
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO saves (slot, created, data) VALUES (?, ?, ?)",
+                (
+                    slot,
+                    time.time() if created is None else created,
+                    data if isinstance(data, bytes) else json.dumps(data),
+                ),
+            )
+            return cursor.lastrowid
+
+    def latest(self, slot: str = None) -> Optional[Dict]:
+        """
+        Finds the latest save, of a slot or of every slot.
+
+        Args:
+            slot (str, optional): The slot. Defaults to None (every slot).
+
+        Returns:
+            dict: The save (see `saves`), or None if there are no saves.
+        """
+        saves = self.saves(slot, limit=1)
+        return saves[0] if saves else None
+
+    def saves(
+        self, slot: str = None, limit: int = None, before: float = None
+    ) -> List[Dict]:
+        """
+        Lists saves, latest first.
+
+        Args:
+            slot (str, optional): Only lists the saves of this slot. Defaults to None (every slot).
+            limit (int, optional): The maximum number of saves listed. Defaults to None (every save).
+            before (float, optional): Only lists the saves made before this timestamp. Defaults to None.
+
+        Returns:
+            list: The id, slot, created (timestamp) and data of each save.
+        """
+        self.open()
+        query = "SELECT id, slot, created, data FROM saves"
+        conditions, parameters = [], []
+        if slot is not None:
+            conditions.append("slot = ?")
+            parameters.append(slot)
+        if before is not None:
+            conditions.append("created < ?")
+            parameters.append(before)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created DESC, id DESC LIMIT ?"
+        parameters.append(-1 if limit is None else limit)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [
+            {
+                "id": id,
+                "slot": slot,
+                "created": created,
+                "data": data if isinstance(data, bytes) else json.loads(data),
+            }
+            for id, slot, created, data in rows
+        ]
+
+    def slots(self) -> List[str]:
+        self.open()
+        with self._lock:
+            return [
+                slot
+                for slot, in self._connection.execute(
+                    "SELECT DISTINCT slot FROM saves ORDER BY slot"
+                )
+            ]
+
+    def count(self, slot: str = None) -> int:
+        self.open()
+        with self._lock:
+            if slot is None:
+                return self._connection.execute(
+                    "SELECT COUNT(*) FROM saves"
+                ).fetchone()[0]
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM saves WHERE slot = ?", (slot,)
+            ).fetchone()[0]
+
+    def prune(self, keep: int, slot: str = None) -> int:
+        """
+        Deletes the oldest saves, keeping the latest ones.
+
+        Args:
+            keep (int): How many saves are kept.
+            slot (str, optional): Only prunes the saves of this slot. Defaults to None (every slot).
+
+        Returns:
+            int: How many saves were deleted.
+        """
+        self.open()
+        condition = "" if slot is None else "WHERE slot = ?"
+        parameters = () if slot is None else (slot,)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM saves WHERE id IN ("
+                f"SELECT id FROM saves {condition} "
+                "ORDER BY created DESC, id DESC LIMIT -1 OFFSET ?)",
+                parameters + (keep,),
+            )
+            return cursor.rowcount
+
+
+# The open save stores, by save directory
+_stores: Dict[str, SaveStore] = {}
+_stores_lock = threading.Lock()
 
 
 class SaveAndLoadManager:
 
-    def save_game(state: str, save_directory="saved_games") -> None:
+    def store(save_directory="saved_games") -> SaveStore:
+        """
+        Returns the save store of a save directory, opening it the first time it is used.
+
+        Args:
+            save_directory (str, optional): The save directory, relative to the game executable.
+
+        Returns:
+            SaveStore: The store.
+        """
         # Lets create the folder inside the dist folder
         # so the user can save the game in the same folder as the executable
         # and the game will be able to find the saved games
         save_directory = os.path.join(os.path.dirname(sys.executable), save_directory)
+        with _stores_lock:
+            store = _stores.get(save_directory)
+            if store is not None and not os.path.exists(store.path):
+                # The save directory was deleted while the game was running
+                store.close()
+                store = None
+            if store is None:
+                store = _stores[save_directory] = SaveStore(save_directory)
+            return store
 
-        # Create the save directory if it doesn't exist
-        os.makedirs(save_directory, exist_ok=True)
+    def close_store(save_directory="saved_games") -> None:
+        """
+        Closes the save store of a save directory, if it was opened (e.g. before the directory is deleted).
+        """
+        save_directory = os.path.join(os.path.dirname(sys.executable), save_directory)
+        with _stores_lock:
+            store = _stores.pop(save_directory, None)
+        if store is not None:
+            store.close()
 
-        # Create a save file with state and datetime
-        filename = f'save_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.json'
-        filepath = os.path.join(save_directory, filename)
+    def save_game(
+        state: Union[str, SessionSnapshot], save_directory="saved_games"
+    ) -> None:
+        # Saves used to store just the scene, now they store the whole session (see SessionSnapshot)
+        snapshot = (
+            state if isinstance(state, SessionSnapshot) else SessionSnapshot(state)
+        )
         try:
-            with open(filepath, "w") as save_file:
-                save_dict = {
-                    "state": state,
-                    # I could store the language just for troubleshooting reasons
-                    # because saving and loading the language unable the user to load their saved game
-                    # with the game started in another language and it limits the user experience
-                    # 'language': config.selected_language,
-                }
-                json.dump(save_dict, save_file)
-        except CantSaveGame as exc:
+            SaveAndLoadManager.store(save_directory).add(
+                snapshot.encode(level=config.save_compression_level)
+            )
+        except (OSError, sqlite3.Error) as exc:
             print(exc)
             raise CantSaveGame
 
     def load_game(save_directory="saved_games") -> str:
-        save_directory = os.path.join(os.path.dirname(sys.executable), save_directory)
-        if not os.path.exists(save_directory):
+        return SaveAndLoadManager.load_session(save_directory).scene
+
+    def load_session(save_directory="saved_games") -> SessionSnapshot:
+        """
+        Loads the latest saved session.
+
+        Args:
+            save_directory (str, optional): The save directory, relative to the game executable.
+
+        Raises:
+            NoGameSaved: If there are no saves, or the latest one can't be read.
+
+        Returns:
+            SessionSnapshot: The session. Saves of older versions only have the scene.
+        """
+        store = SaveAndLoadManager.store(save_directory)
+        if not os.path.exists(store.directory):
             print("Save directory does not exist.")
             raise NoGameSaved
 
-        # Get the list of save files
-        save_files = [
-            f
-            for f in os.listdir(save_directory)
-            if f.startswith("save_") and f.endswith(".json")
-        ]
-        if not save_files:
+        # The store is indexed by time, so finding the latest
+        # save doesn't depend on how many games were saved
+        try:
+            latest_save = store.latest()
+        except sqlite3.Error as exc:
+            print(exc)
+            raise NoGameSaved
+        if latest_save is None:
             print("No saved games to load.")
             raise NoGameSaved
+        data = latest_save["data"]
+        if isinstance(data, dict):
+            return SessionSnapshot(data["state"])
+        try:
+            return SessionSnapshot.decode(data)
+        except ValueError as exc:
+            print(exc)
+            raise NoGameSaved
 
-        # Reading the content of the save files makes this load function
-        # grow in processing time (O(n)) so we will get the latest save based
-        # on the last modification time of the file
-        latest_save_file = max(
-            save_files, key=lambda f: os.path.getmtime(os.path.join(save_directory, f))
-        )
-        latest_save_path = os.path.join(save_directory, latest_save_file)
 
-        with open(latest_save_path, "r") as save_file:
-            save_dict = json.load(save_file)
-            return save_dict["state"]
+class SaveWriter:
+    """
+    Writes saved games on a background thread, so saving never blocks a frame.
+
+    Saves are queued by slot: when the game is saved again before the previous save of a slot was written,
+    only the latest one is written (a burst of saves is coalesced into a single write). Each save is written
+    in a sqlite transaction (see `SaveStore`), so a save is either fully written or not written at all, even
+    if the game is closed while writing. The result of each write is handed back through `poll`.
+
+    Sessions are encoded (and compressed) on the writer thread too, and only the latest session of a slot is.
+
+    Args:
+        save_directory (str, optional): The save directory, relative to the game executable.
+        level (int, optional): The zlib compression level of the sessions. Defaults to the configured one.
+
+    Attributes:
+        written (int): How many saves were written.
+        coalesced (int): How many saves were replaced by a later save before being written.
+    """
+
+    def __init__(self, save_directory: str = "saved_games", level: int = None) -> None:
+        self.save_directory: str = save_directory
+        self.level: int = config.save_compression_level if level is None else level
+        self.written: int = 0
+        self.coalesced: int = 0
+        # The saves waiting to be written, by slot: (saved game, scene positions, how many saves it stands for)
+        self._pending: Dict[
+            str, Tuple[Union[bytes, dict, SessionSnapshot], Dict[str, int], int]
+        ] = {}
+        self._writing: bool = False
+        self._stopping: bool = False
+        self._condition = threading.Condition()
+        self._results: queue.Queue = queue.Queue()
+        self._thread: threading.Thread = None
+
+    def submit(
+        self,
+        data: Union[bytes, dict, SessionSnapshot],
+        slot: str = DEFAULT_SLOT,
+        scene_positions: Dict[str, int] = None,
+    ) -> None:
+        """
+        Queues a save to be written.
+
+        Args:
+            data (bytes, dict or SessionSnapshot): The saved game (see `SaveStore.add`), or the session to encode.
+            slot (str, optional): The slot of the save. Defaults to DEFAULT_SLOT.
+            scene_positions (dict, optional): The position of each scene on the story, used to encode the session
+                (see `SessionSnapshot.encode`). It's read on the writer thread, so it must not change afterwards.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            previous = self._pending.get(slot)
+            if previous is not None:
+                self.coalesced += 1
+            self._pending[slot] = (
+                data,
+                scene_positions,
+                previous[2] + 1 if previous else 1,
+            )
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.worker, name="save-writer", daemon=True
+                )
+                self._thread.start()
+
+    def worker(self) -> None:
+        """
+        The loop of the writer thread.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, {}
+                self._writing = True
+
+            for slot, (data, scene_positions, requests) in pending.items():
+                try:
+                    if isinstance(data, SessionSnapshot):
+                        data = data.encode(scene_positions, self.level)
+                    SaveAndLoadManager.store(self.save_directory).add(data, slot)
+                    self.written += 1
+                    self._results.put((slot, None, requests))
+                except (OSError, sqlite3.Error, ValueError) as exc:
+                    self._results.put((slot, exc, requests))
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def poll(self) -> List[Tuple[str, Optional[Exception], int]]:
+        """
+        Returns the results of the writes finished since the last call, without waiting.
+
+        Returns:
+            list: (slot, error or None if the save was written, how many saves it stands for) triples.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued save is written.
+
+        Args:
+            timeout (float, optional): The maximum time to wait, in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: Whether every save was written before the timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def stop(self) -> None:
+        """
+        Writes the queued saves and stops the writer thread.
+        """
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+        with self._condition:
+            self._thread = None
+            self._stopping = False
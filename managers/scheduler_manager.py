@@ -0,0 +1,128 @@
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class Scheduler:
+    """
+    Runs callbacks at given times of the game, from the game loop.
+
+    Timers are kept on a heap ordered by the time they are due, so scheduling a timer and finding the next
+    one take O(log n). Times are in milliseconds of the game (see `Story.ticks`), and nothing is waited for:
+    the game loop calls `run_due` on every frame, and `next_due` tells it how long it can sleep.
+
+    A timer can be named, so scheduling another timer with the same name replaces it, and it can repeat
+    every `interval` milliseconds (for animations).
+    """
+
+    def __init__(self) -> None:
+        # (due time, order, timer id) entries, the order keeps timers due at the same time in order
+        self._heap: List[Tuple[int, int, int]] = []
+        # The callback, interval and name of each active timer, by timer id
+        self._timers: Dict[int, Tuple[Callable[[], None], Optional[int], str]] = {}
+        self._names: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def schedule(
+        self,
+        due: int,
+        callback: Callable[[], None],
+        name: str = None,
+        interval: int = None,
+    ) -> int:
+        """
+        Schedules a callback.
+
+        Args:
+            due (int): When the callback runs, in milliseconds of the game.
+            callback (callable): The function to run.
+            name (str, optional): The name of the timer, replacing the timer with the same name. Defaults to None.
+            interval (int, optional): Runs the callback again every `interval` milliseconds. Defaults to None.
+
+        Returns:
+            int: The id of the timer.
+        """
+        if name is not None:
+            self.cancel(name)
+        timer_id = next(self._ids)
+        self._timers[timer_id] = (callback, interval, name)
+        if name is not None:
+            self._names[name] = timer_id
+        heapq.heappush(self._heap, (due, timer_id, timer_id))
+        return timer_id
+
+    def cancel(self, timer: Union[int, str]) -> bool:
+        """
+        Cancels a timer.
+
+        Args:
+            timer (int or str): The id or the name of the timer.
+
+        Returns:
+            bool: Whether the timer was active.
+        """
+        timer_id = self._names.get(timer) if isinstance(timer, str) else timer
+        if timer_id not in self._timers:
+            return False
+        _, _, name = self._timers.pop(timer_id)
+        if name is not None:
+            del self._names[name]
+        # Cancelled timers are left on the heap and skipped when they are due
+        return True
+
+    def clear(self) -> None:
+        self._heap = []
+        self._timers = {}
+        self._names = {}
+
+    def next_due(self) -> Optional[int]:
+        """
+        Returns when the next timer is due, or None if there are no timers.
+        """
+        while self._heap and self._heap[0][2] not in self._timers:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: int) -> int:
+        """
+        Runs the callbacks of the timers that are due, in the order they are due.
+
+        Timers scheduled by the callbacks for `now` or earlier run on the next call.
+
+        Args:
+            now (int): The current time of the game, in milliseconds.
+
+        Returns:
+            int: How many callbacks ran.
+        """
+        due_timers = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, timer_id = heapq.heappop(self._heap)
+            if timer_id in self._timers:
+                due_timers.append((due, timer_id))
+
+        ran = 0
+        for due, timer_id in due_timers:
+            # A callback may have cancelled a later timer
+            if timer_id not in self._timers:
+                continue
+            callback, interval, name = self._timers[timer_id]
+            if interval:
+                # Repeating timers keep their id, and don't drift when a frame is late
+                next_due = due + interval
+                if next_due <= now:
+                    next_due = now + interval - (now - due) % interval
+                heapq.heappush(self._heap, (next_due, next(self._ids), timer_id))
+            else:
+                del self._timers[timer_id]
+                if name is not None:
+                    del self._names[name]
+            callback()
+            ran += 1
+        return ran
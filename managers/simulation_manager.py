@@ -0,0 +1,336 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set, Tuple
+
+from managers.cohesion_manager import END_SCENE, START_SCENE, CohesionAnalyzer
+
+# Why a playthrough got stuck
+NO_CHOICES = "no choices"
+UNDEFINED_SCENE = "undefined scene"
+TOO_LONG = "too many choices"
+
+# Playthroughs run on the same process when there are fewer than this per job
+MIN_RUNS_PER_JOB = 1000
+
+# The scene graph as plain lists, so it's cheap to send to other processes:
+# (choices of each scene, whether each scene is defined, start id, end id)
+Graph = Tuple[List[List[int]], List[bool], int, int]
+
+
+class SimulationReport:
+    """
+    The result of simulating playthroughs of a story.
+
+    Attributes:
+        mode (str): "random" or "exhaustive".
+        playthroughs (int): How many playthroughs were simulated.
+        finished (int): How many of them reached "end_scene".
+        total_length (int): How many choices were made on the finished playthroughs.
+        scenes (list): Every scene of the story.
+        visited (set): The scenes played at least once.
+        endings (dict): How many playthroughs ended on each scene with a choice leading to "end_scene".
+        possible_endings (list): Every scene with a choice leading to "end_scene".
+        stuck (dict): How many playthroughs got stuck on each (scene, reason) pair.
+        complete (bool): Whether every possible playthrough was simulated (exhaustive mode only).
+        duration (float): How long the simulation took, in seconds.
+    """
+
+    def __init__(
+        self, mode: str, scenes: List[str], possible_endings: List[str]
+    ) -> None:
+        self.mode: str = mode
+        self.playthroughs: int = 0
+        self.finished: int = 0
+        self.total_length: int = 0
+        self.scenes: List[str] = scenes
+        self.visited: Set[str] = set()
+        self.endings: Dict[str, int] = {}
+        self.possible_endings: List[str] = possible_endings
+        self.stuck: Dict[Tuple[str, str], int] = {}
+        self.complete: bool = mode == "exhaustive"
+        self.duration: float = 0.0
+
+    @property
+    def coverage(self) -> float:
+        return len(self.visited) / len(self.scenes) if self.scenes else 0.0
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / self.finished if self.finished else 0.0
+
+    @property
+    def unvisited_scenes(self) -> List[str]:
+        return [scene for scene in self.scenes if scene not in self.visited]
+
+    @property
+    def unreached_endings(self) -> List[str]:
+        return [scene for scene in self.possible_endings if scene not in self.endings]
+
+    @property
+    def is_playable(self) -> bool:
+        """
+        Whether some playthrough reached "end_scene" and none got stuck.
+        """
+        return self.finished > 0 and not self.stuck
+
+    def add(self, names: List[str], counts: dict) -> None:
+        """
+        Adds the counts returned by `random_playthroughs` or `exhaustive_playthroughs`.
+
+        Args:
+            names (list): The scene of each id of the graph.
+            counts (dict): The counts, by scene id.
+
+        Returns:
+            None
+        """
+        self.playthroughs += counts["playthroughs"]
+        self.finished += counts["finished"]
+        self.total_length += counts["total_length"]
+        self.visited.update(
+            names[node] for node, visited in enumerate(counts["visited"]) if visited
+        )
+        for node, count in enumerate(counts["endings"]):
+            if count:
+                self.endings[names[node]] = self.endings.get(names[node], 0) + count
+        for (node, reason), count in counts["stuck"].items():
+            key = (names[node], reason)
+            self.stuck[key] = self.stuck.get(key, 0) + count
+        self.complete = self.complete and counts["complete"]
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.playthroughs} {self.mode} playthroughs in {self.duration:.2f}s "
+            f"({self.playthroughs / max(self.duration, 1e-9):.0f}/s)"
+            + ("" if self.complete or self.mode != "exhaustive" else ", stopped early"),
+            f"Scene coverage: {self.coverage:.1%} ({len(self.visited)}/{len(self.scenes)} scenes)",
+            f"Endings reached: {len(self.endings)}/{len(self.possible_endings)}",
+            f"Finished playthroughs: {self.finished}, {self.average_length:.1f} choices on average",
+        ]
+        lines.extend(
+            f'  Ending on "{scene}": {count}' for scene, count in self.endings.items()
+        )
+        lines.extend(
+            f'  Ending on "{scene}" was never reached'
+            for scene in self.unreached_endings
+        )
+        lines.extend(f'  "{scene}" was never played' for scene in self.unvisited_scenes)
+        lines.extend(
+            f'  Stuck on "{scene}" ({reason}): {count}'
+            for (scene, reason), count in self.stuck.items()
+        )
+        return "\n".join(lines)
+
+
+def new_counts(size: int) -> dict:
+    return {
+        "playthroughs": 0,
+        "finished": 0,
+        "total_length": 0,
+        "visited": bytearray(size),
+        "endings": [0] * size,
+        "stuck": {},
+        "complete": True,
+    }
+
+
+def random_playthroughs(graph: Graph, runs: int, seed: int, max_steps: int) -> dict:
+    """
+    Plays a story many times, picking a random choice on every scene.
+
+    Args:
+        graph (tuple): The scene graph (see `PlaythroughSimulator.graph`).
+        runs (int): How many playthroughs are simulated.
+        seed (int): The seed of the random choices.
+        max_steps (int): How many choices a playthrough can make before it's considered stuck.
+
+    Returns:
+        dict: The counts of the playthroughs, by scene id (see `SimulationReport.add`).
+    """
+    adjacency, defined, start, end = graph
+    counts = new_counts(len(adjacency))
+    visited, endings, stuck = counts["visited"], counts["endings"], counts["stuck"]
+    choose = random.Random(seed).random
+    finished = total_length = 0
+
+    for _ in range(runs):
+        node, steps = start, 0
+        while True:
+            visited[node] = 1
+            options = adjacency[node]
+            if not defined[node] or not options or steps == max_steps:
+                reason = (
+                    UNDEFINED_SCENE
+                    if not defined[node]
+                    else NO_CHOICES if not options else TOO_LONG
+                )
+                stuck[(node, reason)] = stuck.get((node, reason), 0) + 1
+                break
+            next_node = options[int(choose() * len(options))]
+            steps += 1
+            if next_node == end:
+                endings[node] += 1
+                finished += 1
+                total_length += steps
+                break
+            node = next_node
+
+    counts.update(playthroughs=runs, finished=finished, total_length=total_length)
+    return counts
+
+
+def exhaustive_playthroughs(graph: Graph, limit: int, max_steps: int) -> dict:
+    """
+    Plays every way through a story that doesn't play a scene twice, up to `limit` playthroughs.
+
+    Scenes have no state, so coming back to a scene already played leads to the same playthroughs
+    again, and those loops are skipped. The search is iterative, so long stories don't hit the
+    recursion limit.
+
+    Args:
+        graph (tuple): The scene graph (see `PlaythroughSimulator.graph`).
+        limit (int): The maximum number of playthroughs simulated.
+        max_steps (int): How many choices a playthrough can make before it's considered stuck.
+
+    Returns:
+        dict: The counts of the playthroughs, by scene id (see `SimulationReport.add`).
+    """
+    adjacency, defined, start, end = graph
+    counts = new_counts(len(adjacency))
+    visited, endings, stuck = counts["visited"], counts["endings"], counts["stuck"]
+    on_path = bytearray(len(adjacency))
+    playthroughs = finished = total_length = 0
+
+    path, positions = [start], [0]
+    on_path[start] = visited[start] = 1
+    while path:
+        if playthroughs >= limit:
+            counts["complete"] = False
+            break
+        node, position = path[-1], positions[-1]
+        options = adjacency[node]
+        if not defined[node] or not options or len(path) > max_steps:
+            reason = (
+                UNDEFINED_SCENE
+                if not defined[node]
+                else NO_CHOICES if not options else TOO_LONG
+            )
+            stuck[(node, reason)] = stuck.get((node, reason), 0) + 1
+            playthroughs += 1
+            position = len(options)
+        if position == len(options):
+            # Every choice of the scene was played, go back to the previous one
+            on_path[path.pop()] = 0
+            positions.pop()
+            continue
+        positions[-1] += 1
+        next_node = options[position]
+        if next_node == end:
+            endings[node] += 1
+            finished += 1
+            playthroughs += 1
+            total_length += len(path)
+        elif not on_path[next_node]:
+            on_path[next_node] = visited[next_node] = 1
+            path.append(next_node)
+            positions.append(0)
+
+    counts.update(
+        playthroughs=playthroughs, finished=finished, total_length=total_length
+    )
+    return counts
+
+
+class PlaythroughSimulator:
+    """
+    Plays a story without rendering it, to check how players can go through it.
+
+    A playthrough starts on the "start" scene and follows one choice of every scene, like picking a choice
+    on the choice screen does, until a choice leads to "end_scene" or the playthrough gets stuck: on a scene
+    that was never defined, on a scene with no choices, or after `max_steps` choices (going around a cycle
+    with no way out). The scene graph is the one `CohesionAnalyzer` builds, with scene ids mapped to integers,
+    so thousands of playthroughs run every second even on stories with thousands of scenes.
+
+    Args:
+        scenes (dict): The scenes of the story, by language and scene id.
+        choices (dict): The choices of the story, by language and scene id.
+    """
+
+    def __init__(self, scenes: dict, choices: dict) -> None:
+        analyzer = CohesionAnalyzer(scenes, choices)
+        start = analyzer.index(START_SCENE)
+        end = analyzer.index(END_SCENE)
+        self.names: List[str] = analyzer.names
+        self.scenes: List[str] = list(analyzer.graph_scenes)
+        self.possible_endings: List[str] = [
+            scene
+            for scene, scene_choices in analyzer.graph_choices.items()
+            if any(next_scene == END_SCENE for _, next_scene in scene_choices)
+        ]
+        defined = [name in analyzer.graph_scenes for name in self.names]
+        self.graph: Graph = (analyzer.adjacency, defined, start, end)
+
+    def run(
+        self,
+        runs: int = 10000,
+        jobs: int = None,
+        seed: int = None,
+        max_steps: int = 1000,
+    ) -> SimulationReport:
+        """
+        Simulates random playthroughs, spread across up to `jobs` processes.
+
+        Args:
+            runs (int, optional): How many playthroughs are simulated. Defaults to 10000.
+            jobs (int, optional): The maximum number of processes used. Defaults to the number of CPUs.
+            seed (int, optional): The seed of the random choices, to repeat a simulation. Defaults to a random one.
+            max_steps (int, optional): How many choices a playthrough can make before it's considered stuck.
+                Defaults to 1000.
+
+        Returns:
+            SimulationReport: The result of the playthroughs.
+        """
+        started = time.perf_counter()
+        seeds = random.Random(seed)
+        jobs = max(1, min(jobs or os.cpu_count() or 1, runs // MIN_RUNS_PER_JOB))
+        chunks = [runs // jobs + (index < runs % jobs) for index in range(jobs)]
+        work = [
+            (self.graph, chunk, seeds.getrandbits(64), max_steps) for chunk in chunks
+        ]
+        if jobs <= 1:
+            results = [random_playthroughs(*arguments) for arguments in work]
+        else:
+            # Playthroughs are independent from each other, so each process
+            # plays some of them with its own seed and the counts are added up
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = [
+                    executor.submit(random_playthroughs, *arguments)
+                    for arguments in work
+                ]
+                results = [future.result() for future in futures]
+
+        report = SimulationReport("random", self.scenes, self.possible_endings)
+        for counts in results:
+            report.add(self.names, counts)
+        report.duration = time.perf_counter() - started
+        return report
+
+    def explore(self, limit: int = 100000, max_steps: int = 1000) -> SimulationReport:
+        """
+        Simulates every playthrough that doesn't play a scene twice (see `exhaustive_playthroughs`).
+
+        Args:
+            limit (int, optional): The maximum number of playthroughs simulated. Defaults to 100000.
+            max_steps (int, optional): How many choices a playthrough can make before it's considered stuck.
+                Defaults to 1000.
+
+        Returns:
+            SimulationReport: The result of the playthroughs.
+        """
+        started = time.perf_counter()
+        report = SimulationReport("exhaustive", self.scenes, self.possible_endings)
+        report.add(self.names, exhaustive_playthroughs(self.graph, limit, max_steps))
+        report.duration = time.perf_counter() - started
+        return report
@@ -0,0 +1,251 @@
+import struct
+import zlib
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+# Snapshots start with a header (magic, version, compression) followed by the session state
+HEADER = struct.Struct("<4sBB")
+MAGIC = b"PNSS"
+VERSION = 1
+NO_COMPRESSION = 0
+ZLIB_COMPRESSION = 1
+
+# How the path is written: one byte per choice, when every difference fits in a byte, or varints
+BYTE_PATH, VARINT_PATH = range(2)
+# The type of each flag value
+NONE, FALSE, TRUE, INT, FLOAT, STRING = range(6)
+FLOAT_VALUE = struct.Struct("<d")
+# Scene ids are separated by this character on the scenes table
+SCENE_SEPARATOR = "\0"
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """
+    Appends an unsigned integer to a buffer, 7 bits per byte (small integers take a single byte).
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """
+    Reads an unsigned integer written by `write_varint`.
+
+    Returns:
+        tuple: The integer and the offset right after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    """
+    Maps signed integers to unsigned ones, so small negative integers are small too (0, -1, 1, -2 -> 0, 1, 2, 3).
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+# The differences of one byte paths, by byte
+BYTE_DIFFERENCES = [unzigzag(value) for value in range(0x80)]
+
+
+def write_string(buffer: bytearray, value: str) -> None:
+    encoded = value.encode("utf-8")
+    write_varint(buffer, len(encoded))
+    buffer.extend(encoded)
+
+
+def read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    length, offset = read_varint(data, offset)
+    return bytes(data[offset : offset + length]).decode("utf-8"), offset + length
+
+
+class SessionSnapshot:
+    """
+    The whole state of a session of the game, as saved and loaded.
+
+    Snapshots are encoded to a compact binary format: every scene played is written once, on a table ordered like
+    the scenes of the story, and the current scene and the path are written as indexes on that table. Players move
+    between scenes that are close on the story most of the time, so the path is written as the difference
+    between each index and the previous one, which takes a single byte for most choices. The encoded
+    snapshot can also be compressed with zlib.
+
+    Args:
+        scene (str): The current scene.
+        language (str, optional): The selected language. Defaults to None.
+        path (list, optional): Every scene played, in order, the current one included. Defaults to just the scene.
+        flags (dict, optional): The variables of the story (None, bool, int, float or str values). Defaults to {}.
+    """
+
+    def __init__(
+        self,
+        scene: str,
+        language: str = None,
+        path: List[str] = None,
+        flags: Dict[str, object] = None,
+    ) -> None:
+        self.scene: str = scene
+        self.language: str = language
+        self.path: List[str] = list(path) if path else [scene]
+        self.flags: Dict[str, object] = dict(flags or {})
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SessionSnapshot) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionSnapshot(scene={self.scene!r}, language={self.language!r}, "
+            f"path={len(self.path)} scenes, flags={self.flags!r})"
+        )
+
+    def encode(self, scene_positions: Dict[str, int] = None, level: int = 0) -> bytes:
+        """
+        Encodes the snapshot.
+
+        Args:
+            scene_positions (dict, optional): The position of each scene on the story. Scenes are indexed in this
+                order, so scenes that are close on the story get close indexes. Defaults to the order they were played.
+            level (int, optional): The zlib compression level, 0 for no compression. Defaults to 0.
+
+        Raises:
+            ValueError: If a scene id has a null character, or a flag value isn't None, bool, int, float or str.
+
+        Returns:
+            bytes: The encoded snapshot.
+        """
+        positions = scene_positions or {}
+        played = dict.fromkeys(self.path + [self.scene])
+        scenes = sorted(played, key=lambda scene: positions.get(scene, len(positions)))
+        ids = {scene: index for index, scene in enumerate(scenes)}
+
+        if any(SCENE_SEPARATOR in scene for scene in scenes):
+            raise ValueError("Scene ids with null characters can't be saved")
+
+        payload = bytearray()
+        write_string(payload, SCENE_SEPARATOR.join(scenes))
+        write_string(payload, self.language or "")
+        write_varint(payload, ids[self.scene])
+
+        path_ids = [ids[scene] for scene in self.path]
+        differences = [
+            zigzag(current - previous)
+            for previous, current in zip([0] + path_ids, path_ids)
+        ]
+        write_varint(payload, len(differences))
+        if not differences or max(differences) < 0x80:
+            payload.append(BYTE_PATH)
+            payload.extend(differences)
+        else:
+            payload.append(VARINT_PATH)
+            for difference in differences:
+                write_varint(payload, difference)
+
+        write_varint(payload, len(self.flags))
+        for name, value in self.flags.items():
+            write_string(payload, name)
+            if value is None:
+                payload.append(NONE)
+            elif isinstance(value, bool):
+                payload.append(TRUE if value else FALSE)
+            elif isinstance(value, int):
+                payload.append(INT)
+                write_varint(payload, zigzag(value))
+            elif isinstance(value, float):
+                payload.append(FLOAT)
+                payload.extend(FLOAT_VALUE.pack(value))
+            elif isinstance(value, str):
+                payload.append(STRING)
+                write_string(payload, value)
+            else:
+                raise ValueError(
+                    f'The flag "{name}" is a {type(value).__name__}, it can\'t be saved'
+                )
+
+        if level:
+            return HEADER.pack(MAGIC, VERSION, ZLIB_COMPRESSION) + zlib.compress(
+                bytes(payload), level
+            )
+        return HEADER.pack(MAGIC, VERSION, NO_COMPRESSION) + bytes(payload)
+
+    def decode(data: bytes) -> "SessionSnapshot":
+        """
+        Decodes a snapshot encoded by `encode`.
+
+        Args:
+            data (bytes): The encoded snapshot.
+
+        Raises:
+            ValueError: If the data isn't a snapshot, or it's damaged.
+
+        Returns:
+            SessionSnapshot: The snapshot.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Not a saved game snapshot")
+        magic, version, compression = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a saved game snapshot")
+        payload = memoryview(data)[HEADER.size :]
+        try:
+            if compression == ZLIB_COMPRESSION:
+                payload = zlib.decompress(payload)
+            return SessionSnapshot.read_payload(payload)
+        except (IndexError, UnicodeDecodeError, struct.error, zlib.error) as exc:
+            raise ValueError(f"Damaged saved game snapshot: {exc}") from exc
+
+    def read_payload(payload: bytes) -> "SessionSnapshot":
+        table, offset = read_string(payload, 0)
+        scenes = table.split(SCENE_SEPARATOR)
+        language, offset = read_string(payload, offset)
+        scene_id, offset = read_varint(payload, offset)
+
+        length, offset = read_varint(payload, offset)
+        mode = payload[offset]
+        offset += 1
+        if mode == BYTE_PATH:
+            differences = map(
+                BYTE_DIFFERENCES.__getitem__, payload[offset : offset + length]
+            )
+            offset += length
+        else:
+            differences = []
+            for _ in range(length):
+                difference, offset = read_varint(payload, offset)
+                differences.append(unzigzag(difference))
+        path = [scenes[index] for index in accumulate(differences)]
+
+        count, offset = read_varint(payload, offset)
+        flags = {}
+        for _ in range(count):
+            name, offset = read_string(payload, offset)
+            kind = payload[offset]
+            offset += 1
+            if kind == NONE:
+                value = None
+            elif kind in (FALSE, TRUE):
+                value = kind == TRUE
+            elif kind == INT:
+                value, offset = read_varint(payload, offset)
+                value = unzigzag(value)
+            elif kind == FLOAT:
+                (value,) = FLOAT_VALUE.unpack_from(payload, offset)
+                offset += FLOAT_VALUE.size
+            elif kind == STRING:
+                value, offset = read_string(payload, offset)
+            else:
+                raise IndexError(f"unknown flag type {kind}")
+            flags[name] = value
+
+        return SessionSnapshot(scenes[scene_id], language or None, path, flags)
@@ -0,0 +1,117 @@
+import mmap
+import os
+from typing import Iterable, List, Optional
+
+import pygame
+
+from configs import Config, config
+from managers import archive_manager
+
+RAW_EXTENSION = ".praw"
+
+
+class RawSurfaceCache:
+    """
+    Pre-decoded copies of the images of the game, so showing a scene doesn't have to decompress a PNG.
+
+    Each image gets a raw dump (see `encode_surface`): a small header with its size, pitch and pixel format
+    followed by its uncompressed pixels. Dumps are memory-mapped and turned into surfaces without copying or
+    decoding them. A dump older than its image is ignored, so editing an image never shows stale pixels.
+
+    Whether the folder of the dumps exists is only checked once, so games with no dumps don't look for them.
+
+    Attributes:
+        directory (str): The folder where the dumps are kept, mirroring the paths of the images.
+    """
+
+    def __init__(self, config: Config = config, directory: str = None) -> None:
+        self.config: Config = config
+        self.directory: str = directory or self.config.raw_image_dir
+        # Whether the folder of the dumps exists, None until it's checked
+        self._has_dumps: bool = None
+
+    def has_dumps(self) -> bool:
+        if self._has_dumps is None:
+            self._has_dumps = os.path.isdir(self.directory)
+        return self._has_dumps
+
+    def dump_path(self, path: str) -> Optional[str]:
+        """
+        Returns where the dump of an image is kept, or None for images outside the game resources.
+        """
+        name = os.path.relpath(os.path.abspath(path), self.config.resource_path(""))
+        if name.startswith(os.pardir):
+            return None
+        return os.path.join(self.directory, name + RAW_EXTENSION)
+
+    def write(self, path: str) -> Optional[str]:
+        """
+        Decodes an image and writes its raw dump.
+
+        Args:
+            path (str): The path of the image.
+
+        Returns:
+            str: The path of the dump, or None if the image can't be cached.
+        """
+        dump_path = self.dump_path(path)
+        if dump_path is None:
+            return None
+        os.makedirs(os.path.dirname(dump_path), exist_ok=True)
+        self._has_dumps = True
+        temporary_path = f"{dump_path}.tmp"
+        with open(temporary_path, "wb") as dump_file:
+            dump_file.write(archive_manager.encode_surface(pygame.image.load(path)))
+        os.replace(temporary_path, dump_path)
+        return dump_path
+
+    def write_folders(self, folders: Iterable[str]) -> List[str]:
+        """
+        Writes the dumps of every image under some folders (e.g. the images of each resolution).
+
+        Returns:
+            list: The paths of the written dumps.
+        """
+        dumps = []
+        for folder in folders:
+            for directory, _, names in os.walk(folder):
+                for name in sorted(names):
+                    if name.lower().endswith(archive_manager.IMAGE_EXTENSIONS):
+                        dump_path = self.write(os.path.join(directory, name))
+                        if dump_path is not None:
+                            dumps.append(dump_path)
+        return dumps
+
+    def load(self, path: str) -> Optional[pygame.Surface]:
+        """
+        Builds the surface of an image from its memory-mapped dump.
+
+        Args:
+            path (str): The path of the image.
+
+        Returns:
+            pygame.Surface: The image, sharing the mapped memory of the dump, or None if the image has no up to date dump.
+        """
+        if not self.has_dumps():
+            return None
+        dump_path = self.dump_path(path)
+        if dump_path is None:
+            return None
+        try:
+            if os.stat(dump_path).st_mtime_ns < os.stat(path).st_mtime_ns:
+                return None
+            with open(dump_path, "rb") as dump_file:
+                # The map stays open while the surface uses it
+                data = mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ)
+            return archive_manager.decode_surface(data)
+        except (OSError, ValueError):
+            return None
+
+    def clear(self) -> None:
+        """
+        Removes every dump.
+        """
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(RAW_EXTENSION):
+                    os.remove(os.path.join(directory, name))
@@ -0,0 +1,298 @@
+from typing import Callable, Dict, Tuple
+
+import pygame
+
+# The transitions between scenes, "cut" changes the scene right away
+TRANSITIONS = ("cut", "fade", "crossfade", "slide", "wipe")
+# The height of the surface filled with the fade color, blitted as many times as it takes to cover the screen
+SHADE_HEIGHT = 64
+
+
+def linear(progress: float) -> float:
+    return progress
+
+
+def ease_in(progress: float) -> float:
+    return progress * progress
+
+
+def ease_out(progress: float) -> float:
+    return 1 - (1 - progress) * (1 - progress)
+
+
+def ease_in_out(progress: float) -> float:
+    return progress * progress * (3 - 2 * progress)
+
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": linear,
+    "ease_in": ease_in,
+    "ease_out": ease_out,
+    "ease_in_out": ease_in_out,
+}
+
+
+class Tween:
+    """
+    A value going from 0 to 1 over some time of the game.
+
+    The value only depends on the time it's read at, not on how many frames were drawn since it started, so
+    animations take the same time at any frame rate (and on replays, which replay the recorded frame times).
+
+    Args:
+        start (int): When the tween starts, in milliseconds of the game (see `Story.ticks`).
+        duration (int): How long it takes, in milliseconds.
+        easing (str, optional): How the value changes over time, one of `EASINGS`. Defaults to "linear".
+
+    Raises:
+        ValueError: If the easing is unknown.
+    """
+
+    def __init__(self, start: int, duration: int, easing: str = "linear") -> None:
+        if easing not in EASINGS:
+            raise ValueError(f'Unknown easing "{easing}", use one of {list(EASINGS)}')
+        self.start: int = start
+        self.duration: int = max(duration, 1)
+        self.easing: Callable[[float], float] = EASINGS[easing]
+
+    def progress(self, now: int) -> float:
+        """
+        Returns the eased value of the tween at a time of the game, from 0 (not started) to 1 (finished).
+        """
+        elapsed = (now - self.start) / self.duration
+        return self.easing(min(max(elapsed, 0.0), 1.0))
+
+    def finished(self, now: int) -> bool:
+        return now - self.start >= self.duration
+
+
+class SceneTransition:
+    """
+    Draws the transition from the last frame of a scene to the first frame of the next one.
+
+    Both frames are copied to surfaces allocated once, with the pixel format of the screen, and reused by every
+    transition (they are only allocated again if the screen size changes), so a transition allocates nothing
+    while it runs and every blit is a straight copy or a blend between surfaces of the same format. The per-pixel
+    work is done by SDL's blitters, and as little of it as possible: while nothing else is drawn over the screen,
+    each frame of a crossfade is blended over the previous one, with the alpha that takes it to the current
+    progress, so it takes a single blend instead of a copy and a blend, and a wipe only copies the strip of the
+    next scene uncovered since the previous frame. A fade multiplies the scene by how much of it shows.
+
+    Args:
+        color (tuple, optional): The color fades go through. Defaults to black.
+
+    Attributes:
+        kind (str): The transition being drawn, one of `TRANSITIONS`.
+        tween (Tween): The progress of the transition, None when no transition is being drawn.
+        source (pygame.Surface): The last frame of the previous scene.
+        target (pygame.Surface): The first frame of the next scene.
+    """
+
+    def __init__(self, color: Tuple[int, int, int] = (0, 0, 0)) -> None:
+        self.color: Tuple[int, int, int] = color
+        self.kind: str = "cut"
+        self.tween: Tween = None
+        self.source: pygame.Surface = None
+        self.target: pygame.Surface = None
+        self.shade: pygame.Surface = None
+        # The progress of the transition the screen shows, None if it was drawn over since the last frame
+        self._drawn: float = None
+        self._draw: Dict[str, Callable[[pygame.Surface, float], float]] = {
+            "fade": self.draw_fade,
+            "crossfade": self.draw_crossfade,
+            "slide": self.draw_slide,
+            "wipe": self.draw_wipe,
+        }
+
+    @property
+    def active(self) -> bool:
+        return self.tween is not None
+
+    def allocate(self, screen: pygame.Surface) -> None:
+        """
+        Allocates the frame surfaces, unless the ones allocated before fit the screen.
+        """
+        if self.source is not None and self.source.get_size() == screen.get_size():
+            return
+        # Surfaces with the format of the screen are blitted without converting pixels
+        self.source = pygame.Surface(screen.get_size(), 0, screen)
+        self.target = pygame.Surface(screen.get_size(), 0, screen)
+        self.shade = pygame.Surface((screen.get_width(), SHADE_HEIGHT), 0, screen)
+
+    def start(
+        self,
+        screen: pygame.Surface,
+        kind: str,
+        duration: int,
+        now: int,
+        easing: str = "ease_in_out",
+    ) -> bool:
+        """
+        Starts a transition from what is on the screen. The next scene is drawn afterwards, see `capture_target`.
+
+        Starting a transition while another one is being drawn starts from the frame drawn last.
+
+        Args:
+            screen (pygame.Surface): The screen, with the last frame of the previous scene.
+            kind (str): The transition, one of `TRANSITIONS`.
+            duration (int): How long it takes, in milliseconds of the game.
+            now (int): The current time of the game, in milliseconds.
+            easing (str, optional): How the transition speeds up and slows down, one of `EASINGS`.
+                Defaults to "ease_in_out".
+
+        Raises:
+            ValueError: If the transition or the easing are unknown.
+
+        Returns:
+            bool: Whether a transition was started (cuts and transitions with no duration aren't drawn).
+        """
+        if kind not in TRANSITIONS:
+            raise ValueError(f'Unknown transition "{kind}", use one of {TRANSITIONS}')
+        tween = Tween(now, duration, easing)
+        if kind == "cut" or duration <= 0:
+            self.stop()
+            return False
+
+        self.allocate(screen)
+        self.source.blit(screen, (0, 0))
+        # Until the next scene is drawn, the transition goes to the previous one
+        self.target.blit(screen, (0, 0))
+        self.kind = kind
+        self.tween = tween
+        self._drawn = 0.0
+        return True
+
+    def capture_target(self, screen: pygame.Surface) -> None:
+        """
+        Copies the next scene, just drawn on the screen, as the frame the transition goes to.
+        """
+        self.target.blit(screen, (0, 0))
+        # The screen shows the end of the transition now
+        self._drawn = 1.0
+
+    def discard_frame(self) -> None:
+        """
+        Draws the next frame from scratch, as something was drawn over the last one (like a popup).
+        """
+        self._drawn = None
+
+    def stop(self) -> None:
+        self.tween = None
+        self._drawn = None
+
+    def draw(self, screen: pygame.Surface, now: int) -> bool:
+        """
+        Draws the transition on the screen, as it is at a time of the game.
+
+        When the transition ends, the next scene is drawn as it is and the transition stops.
+
+        Args:
+            screen (pygame.Surface): The screen to draw on.
+            now (int): The current time of the game, in milliseconds.
+
+        Returns:
+            bool: Whether the transition is still running.
+        """
+        if self.tween.finished(now):
+            screen.blit(self.target, (0, 0))
+            self.stop()
+            return False
+        self._drawn = self._draw[self.kind](screen, self.tween.progress(now))
+        return True
+
+    def blend(
+        self,
+        screen: pygame.Surface,
+        under: pygame.Surface,
+        over: pygame.Surface,
+        shown: float,
+        level: float,
+    ) -> float:
+        """
+        Changes how much of a frame shows over another one on the screen, blending just one of them over it.
+
+        Args:
+            screen (pygame.Surface): The screen, showing the `over` frame over the `under` one.
+            under (pygame.Surface): The frame below.
+            over (pygame.Surface): The frame above.
+            shown (float): How much of the frame above the screen shows, from 0 to 1.
+            level (float): How much of the frame above the screen should show.
+
+        Returns:
+            float: How much of the frame above the screen shows after the blend (the alpha of a blit is a byte,
+                so it's as close to the level as it gets).
+        """
+        if level > shown:
+            frame, alpha = over, round((level - shown) / (1 - shown) * 255)
+        elif level < shown:
+            frame, alpha = under, round((shown - level) / shown * 255)
+        else:
+            return shown
+        if alpha == 0:
+            return shown
+
+        frame.set_alpha(alpha)
+        screen.blit(frame, (0, 0))
+        frame.set_alpha(None)
+        if frame is over:
+            return shown + (1 - shown) * alpha / 255
+        return shown * (1 - alpha / 255)
+
+    def draw_fade(self, screen: pygame.Surface, progress: float) -> float:
+        """
+        Fades the previous scene out to the fade color on the first half, and the next scene in on the second one.
+
+        Each frame is drawn from scratch, as the scene multiplied by how much of it shows: a fill and a single
+        multiplying blit, which take less than blending two frames. Fade colors other than black are added over it.
+        """
+        if progress < 0.5:
+            frame, level = self.source, 1 - progress * 2
+        else:
+            frame, level = self.target, progress * 2 - 1
+        shown = round(level * 255)
+        screen.fill((shown, shown, shown))
+        screen.blit(frame, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        if any(self.color):
+            self.shade.fill(
+                [round(value * (255 - shown) / 255) for value in self.color]
+            )
+            for top in range(0, screen.get_height(), SHADE_HEIGHT):
+                screen.blit(self.shade, (0, top), special_flags=pygame.BLEND_RGB_ADD)
+        return progress
+
+    def draw_crossfade(self, screen: pygame.Surface, progress: float) -> float:
+        drawn = self._drawn
+        if drawn is None:
+            screen.blit(self.source, (0, 0))
+            drawn = 0.0
+        return self.blend(screen, self.source, self.target, drawn, progress)
+
+    def draw_slide(self, screen: pygame.Surface, progress: float) -> float:
+        """
+        Slides the next scene in from the right, pushing the previous one out to the left.
+        """
+        offset = round(progress * screen.get_width())
+        screen.blit(self.source, (-offset, 0))
+        screen.blit(self.target, (screen.get_width() - offset, 0))
+        return progress
+
+    def draw_wipe(self, screen: pygame.Surface, progress: float) -> float:
+        """
+        Uncovers the next scene from left to right.
+        """
+        width, height = screen.get_size()
+        edge = round(progress * width)
+        if self._drawn is None or self._drawn > progress:
+            screen.blit(self.target, (0, 0), pygame.Rect(0, 0, edge, height))
+            screen.blit(
+                self.source, (edge, 0), pygame.Rect(edge, 0, width - edge, height)
+            )
+        else:
+            # Only the strip uncovered since the last frame changes
+            uncovered = round(self._drawn * width)
+            screen.blit(
+                self.target,
+                (uncovered, 0),
+                pygame.Rect(uncovered, 0, edge - uncovered, height),
+            )
+        return progress
@@ -0,0 +1,322 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from configs import Config, config
+
+if TYPE_CHECKING:
+    from googletrans import Translator
+
+
+class GoogleTranslateBackend:
+    """
+    Translates texts using the Google Translate API (through the googletrans library).
+
+    Each thread gets its own translator, since they keep a HTTP client that can't be shared.
+    googletrans is only imported when the first translator is created, so games that never
+    translate anything (e.g. the ones shipped with precompiled texts) don't need it.
+    """
+
+    name = "google"
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def translator(self) -> "Translator":
+        if not hasattr(self._local, "translator"):
+            from googletrans import Translator
+
+            self._local.translator = Translator()
+        return self._local.translator
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        return self.translator().translate(text, src=src, dest=dest).text
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        return [
+            result.text
+            for result in self.translator().translate(list(texts), src=src, dest=dest)
+        ]
+
+
+class TranslationCache:
+    """
+    A persistent translation memory stored in a sqlite database.
+
+    Every entry is keyed by the source text, the source and destination languages and the name of the
+    backend that translated it. The whole database is read into memory the first time it is used, so
+    looking a translation up never touches the disk.
+
+    Attributes:
+        path (str): The path of the sqlite database.
+        hits (int): How many translations were found in the cache.
+        misses (int): How many translations were not found in the cache.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.hits: int = 0
+        self.misses: int = 0
+        self._connection: sqlite3.Connection = None
+        self._entries: Dict[Tuple[str, str, str, str], str] = {}
+
+    def open(self) -> None:
+        """
+        Opens the database, creating it if needed, and reads every cached translation.
+
+        Returns:
+            None
+        """
+        if self._connection is not None:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "text TEXT NOT NULL, src TEXT NOT NULL, dest TEXT NOT NULL, backend TEXT NOT NULL, "
+            "translation TEXT NOT NULL, PRIMARY KEY (text, src, dest, backend))"
+        )
+        self._entries = {
+            (text, src, dest, backend): translation
+            for text, src, dest, backend, translation in self._connection.execute(
+                "SELECT text, src, dest, backend, translation FROM translations"
+            )
+        }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, text: str, src: str, dest: str, backend: str) -> Optional[str]:
+        """
+        Looks a translation up.
+
+        Args:
+            text (str): The source text.
+            src (str): The source language code.
+            dest (str): The destination language code.
+            backend (str): The name of the translation backend.
+
+        Returns:
+            str: The cached translation, or None if the text was never translated.
+        """
+        self.open()
+        translation = self._entries.get((text, src, dest, backend))
+        if translation is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translation
+
+    def set(
+        self, text: str, src: str, dest: str, backend: str, translation: str
+    ) -> None:
+        """
+        Stores a translation.
+
+        Args:
+            text (str): The source text.
+            src (str): The source language code.
+            dest (str): The destination language code.
+            backend (str): The name of the translation backend.
+            translation (str): The translated text.
+
+        Returns:
+            None
+        """
+        self.set_many([((text, src, dest, backend), translation)])
+
+    def set_many(
+        self, entries: Iterable[Tuple[Tuple[str, str, str, str], str]]
+    ) -> None:
+        """
+        Stores many translations in a single transaction.
+
+        Args:
+            entries (iterable): Pairs of (text, src, dest, backend) keys and their translations.
+
+        Returns:
+            None
+        """
+        self.open()
+        entries = list(entries)
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                [(*key, translation) for key, translation in entries],
+            )
+        self._entries.update(entries)
+
+    def size(self) -> int:
+        """
+        Returns the number of cached translations.
+        """
+        self.open()
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, hit rate, number of entries and size on disk (in bytes) of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self.size(),
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+class TranslationManager:
+    """
+    Translates the texts of the game, consulting the persistent translation cache before the backend.
+
+    Attributes:
+        backend: The object that actually translates texts. It needs a `name` and a `translate(text, src, dest)`
+            method, and can have a `translate_batch(texts, src, dest)` method to translate many texts at once.
+        cache (TranslationCache): The persistent translation memory.
+        batch_size (int): The maximum number of texts sent to the backend at once.
+        concurrency (int): The maximum number of batches sent to the backend at the same time.
+    """
+
+    def __init__(
+        self,
+        config: Config = config,
+        backend=None,
+        cache: TranslationCache = None,
+        batch_size: int = None,
+        concurrency: int = None,
+    ) -> None:
+        self.config: Config = config
+        self._backend = backend
+        self.cache: TranslationCache = cache or TranslationCache(
+            self.config.translation_cache_path
+        )
+        self.batch_size: int = batch_size or self.config.translation_batch_size
+        self.concurrency: int = concurrency or self.config.translation_concurrency
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = GoogleTranslateBackend()
+        return self._backend
+
+    def translate(self, text: str, src: str, dest: str) -> str:
+        """
+        Translates a text, calling the backend only if it was never translated before.
+
+        Args:
+            text (str): The text to translate.
+            src (str): The source language code.
+            dest (str): The destination language code.
+
+        Returns:
+            str: The translated text.
+        """
+        if src == dest:
+            return text
+
+        translation = self.cache.get(text, src, dest, self.backend.name)
+        if translation is None:
+            translation = self.backend.translate(text, src, dest)
+            self.cache.set(text, src, dest, self.backend.name, translation)
+        return translation
+
+    def translate_many(
+        self, requests: Iterable[Tuple[str, str, str]]
+    ) -> Dict[Tuple[str, str, str], str]:
+        """
+        Translates many texts at once.
+
+        Repeated requests are translated only once and cached texts are not sent to the backend. The remaining
+        texts are grouped by language pair and sent to the backend in batches, with up to `concurrency` batches
+        in flight at the same time. Each batch is cached as soon as it's translated, so if a batch fails, the
+        batches translated before it aren't sent again next time.
+
+        Args:
+            requests (iterable): The (text, src, dest) triples to translate.
+
+        Raises:
+            ValueError: If the backend returned a different number of translations than the texts of a batch.
+            Exception: The error of the first batch that failed, raised once every other batch finished.
+
+        Returns:
+            dict: The translation of each (text, src, dest) triple.
+        """
+        backend = self.backend
+        translations: Dict[Tuple[str, str, str], str] = {}
+        missing: Dict[Tuple[str, str], List[str]] = {}
+        for text, src, dest in dict.fromkeys(requests):
+            if src == dest:
+                translations[(text, src, dest)] = text
+                continue
+            translation = self.cache.get(text, src, dest, backend.name)
+            if translation is None:
+                missing.setdefault((src, dest), []).append(text)
+            else:
+                translations[(text, src, dest)] = translation
+
+        batches = [
+            (texts[start : start + self.batch_size], src, dest)
+            for (src, dest), texts in missing.items()
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        if not batches:
+            return translations
+
+        error = None
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self.translate_batch, *batch): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                texts, src, dest = futures[future]
+                try:
+                    batch_translations = future.result()
+                except Exception as exc:
+                    error = error or exc
+                    continue
+                new_entries = [
+                    ((text, src, dest, backend.name), translation)
+                    for text, translation in zip(texts, batch_translations)
+                ]
+                # The cache is only written from this thread, since sqlite connections can't be shared between threads
+                self.cache.set_many(new_entries)
+                for (text, src, dest, _), translation in new_entries:
+                    translations[(text, src, dest)] = translation
+
+        if error is not None:
+            raise error
+        return translations
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """
+        Sends a batch of texts to the backend, one by one if it can't translate batches.
+
+        Raises:
+            ValueError: If the backend didn't return a translation for each text of the batch.
+        """
+        translate_batch = getattr(self.backend, "translate_batch", None)
+        if translate_batch is None:
+            return [self.backend.translate(text, src, dest) for text in texts]
+        translations = list(translate_batch(texts, src, dest))
+        if len(translations) != len(texts):
+            raise ValueError(
+                f'The "{self.backend.name}" backend returned {len(translations)} translations for a batch of '
+                f"{len(texts)} texts from {src} to {dest} (starting with {texts[0]!r})"
+            )
+        return translations
+
+
+TranslationManagerInstance = TranslationManager()
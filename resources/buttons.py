@@ -1,5 +1,7 @@
 import pygame
 
+from managers.font_manager import FontManagerInstance
+
 
 class DialogueButton:
     def __init__(
@@ -23,7 +25,9 @@ class DialogueButton:
 
     def draw(self) -> None:
         pygame.draw.rect(self.screen, self.color, self.rect)
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = FontManagerInstance.render(
+            self.text, self.font, True, self.text_color
+        )
         text_rect = text_surface.get_rect(center=self.rect.center)
         self.screen.blit(text_surface, text_rect)
 
@@ -70,6 +74,8 @@ class ChoicesButton:
         # Draw the button rectangle
         pygame.draw.rect(self.screen, self.bg_color, self.rect)
         # Draw the button text
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = FontManagerInstance.render(
+            self.text, self.font, True, self.text_color
+        )
         text_rect = text_surface.get_rect(center=self.rect.center)
         self.screen.blit(text_surface, text_rect)
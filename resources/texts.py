@@ -1,8 +1,13 @@
-from googletrans import Translator
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence
 
 from configs import config
 
-translator = Translator()
+if TYPE_CHECKING:
+    from managers.translation_manager import TranslationManager
 
 
 class TextManager:
@@ -11,6 +16,12 @@ class TextManager:
     The default language is English, but the class can be extended to support multiple languages.
     To do so, simply add languages on config.py and all translations will be generated automatically using the Google Translate API.
 
+    Nothing is translated when the TextManager is created: the texts of a language are translated (in batches, through
+    the translation cache) the first time one of them is requested, which only happens once that language is selected.
+    Languages found on the precompiled catalog (see `compile_catalog`) are never translated, so a game shipped with a
+    catalog doesn't even import the translator. The catalog is only loaded if it was compiled from the English texts
+    the game has (see `fingerprint`), and the English texts always come from here.
+
     Attributes:
         static_texts (dict): A dictionary containing static texts for different parts of the game.
             The structure of the dictionary is as follows:
@@ -31,11 +42,18 @@ class TextManager:
             }
     """
 
-    def __init__(self, no_translation=False):
-        self.static_texts = {
-            "menu_items": {"English": ["Start", "Load", "About", "Help", "Quit"]},
-            "about": {
-                "English": (
+    def __init__(
+        self,
+        no_translation: bool = False,
+        catalog_path: str = None,
+        translation_manager: "TranslationManager" = None,
+    ):
+        self.no_translation: bool = no_translation
+        self.translation_manager: "TranslationManager" = translation_manager
+        self.texts: Dict[str, Dict[str, Sequence[str]]] = {
+            "English": {
+                "menu_items": ["Start", "Load", "About", "Help", "Quit"],
+                "about": (
                     "About This Game",
                     """
                             Welcome to the heart of storytelling where imagination meets interactivity. 
@@ -59,81 +77,172 @@ class TextManager:
                             
                             Thank you for exploring this narrative adventure!
                         """,
-                )
-            },
-            "help": {
-                "English": (
+                ),
+                "help": (
                     "How to Play",
                     "Use the arrow keys to navigate the menus and press Enter to select an option.",
-                )
-            },
-            "dialogue": {
-                "English": ("Exit now", "Save"),
+                ),
+                "dialogue": ("Exit now", "Save"),
+            }
+        }
+        self.static_texts: Dict[str, LanguageTexts] = {
+            section: LanguageTexts(self, section) for section in self.texts["English"]
+        }
+        catalog_path = catalog_path or config.text_catalog_path
+        if os.path.exists(catalog_path):
+            self.load_catalog(catalog_path)
+
+    def available_languages(self) -> List[str]:
+        """
+        Returns the languages the static texts can be shown in.
+        """
+        if self.no_translation:
+            return list(self.texts)
+        return list(dict.fromkeys(config.languages + list(self.texts)))
+
+    def language_texts(self, language: str) -> Dict[str, Sequence[str]]:
+        """
+        Returns every static text of a language, translating the ones missing the first time the language is requested.
+
+        Args:
+            language (str): The name of the language.
+
+        Returns:
+            dict: The texts of each section in the language.
+
+        Raises:
+            KeyError: If the language isn't available.
+        """
+        texts = self.texts.get(language, {})
+        missing = [section for section in self.texts["English"] if section not in texts]
+        if missing:
+            if language not in self.available_languages():
+                raise KeyError(language)
+            self.texts[language] = {**texts, **self.translate_texts(language, missing)}
+        return self.texts[language]
+
+    def translate_texts(
+        self, language: str, sections: List[str] = None
+    ) -> Dict[str, Sequence[str]]:
+        """
+        Translates the static texts to a language, sending them to the translator in batches.
+
+        Args:
+            language (str): The name of the language.
+            sections (list, optional): The sections to translate. Defaults to every section.
+
+        Returns:
+            dict: The translated texts of each section.
+        """
+        # The translator is only imported when something actually has to be translated,
+        # so games shipped with a catalog never import it
+        from managers.translation_manager import TranslationManagerInstance
+
+        translation_manager = self.translation_manager or TranslationManagerInstance
+        dest = config.language_code(language)
+        english = {
+            section: texts
+            for section, texts in self.texts["English"].items()
+            if sections is None or section in sections
+        }
+        translations = translation_manager.translate_many(
+            (text, "en", dest) for texts in english.values() for text in texts
+        )
+        translated_texts = {}
+        for section, texts in english.items():
+            translated = [translations[(text, "en", dest)] for text in texts]
+            translated_texts[section] = (
+                translated if section == "menu_items" else tuple(translated)
+            )
+        return translated_texts
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of the English texts, so a compiled catalog can tell if they changed after it was compiled.
+
+        Returns:
+            str: The hex SHA-256 digest of the English texts.
+        """
+        source = json.dumps(self.texts["English"], sort_keys=True)
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def load_catalog(self, catalog_path: str) -> bool:
+        """
+        Loads the precompiled texts of a catalog file, so those languages don't have to be translated.
+
+        The texts of the catalog are added section by section, over the ones of each language, and the English
+        texts are never replaced. If the English texts changed after the catalog was compiled, the catalog is
+        outdated and it isn't loaded.
+
+        Args:
+            catalog_path (str): The path of the catalog file.
+
+        Returns:
+            bool: True if the catalog was loaded, False if it is outdated.
+        """
+        with open(catalog_path, "r", encoding="utf-8") as catalog_file:
+            catalog = json.load(catalog_file)
+        if catalog.get("fingerprint") != self.fingerprint():
+            print(f"{catalog_path} is outdated, compile the texts again to use it.")
+            return False
+
+        for language, sections in catalog["languages"].items():
+            if language == "English":
+                continue
+            texts = self.texts.setdefault(language, {})
+            for section, section_texts in sections.items():
+                if section in self.texts["English"]:
+                    texts[section] = (
+                        section_texts
+                        if section == "menu_items"
+                        else tuple(section_texts)
+                    )
+        return True
+
+    def compile_catalog(self, catalog_path: str = None) -> str:
+        """
+        Translates the static texts to every available language and writes them to a catalog file
+        that can be shipped with the game, together with the fingerprint of the English texts.
+
+        Args:
+            catalog_path (str, optional): The path of the catalog file. Defaults to the configured text catalog path.
+
+        Returns:
+            str: The path of the catalog file.
+        """
+        catalog_path = catalog_path or config.text_catalog_path
+        catalog = {
+            "fingerprint": self.fingerprint(),
+            "languages": {
+                language: self.language_texts(language)
+                for language in self.available_languages()
             },
         }
-        if not no_translation:
-            for language in config.languages:
-                self.static_texts["menu_items"][language] = [
-                    translator.translate(
-                        item,
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text
-                    for item in self.static_texts["menu_items"]["English"]
-                ]
-
-                self.static_texts["about"][language] = (
-                    translator.translate(
-                        self.static_texts["about"]["English"][0],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                    translator.translate(
-                        self.static_texts["about"]["English"][1],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                )
-
-                self.static_texts["help"][language] = (
-                    translator.translate(
-                        self.static_texts["help"]["English"][0],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                    translator.translate(
-                        self.static_texts["help"]["English"][1],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                )
-
-                self.static_texts["dialogue"][language] = (
-                    translator.translate(
-                        self.static_texts["dialogue"]["English"][0],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                    translator.translate(
-                        self.static_texts["dialogue"]["English"][1],
-                        src="en",
-                        dest=list(config.available_languages.keys())[
-                            list(config.available_languages.values()).index(language)
-                        ],
-                    ).text,
-                )
+        with open(catalog_path, "w", encoding="utf-8") as catalog_file:
+            json.dump(catalog, catalog_file, ensure_ascii=False)
+        return catalog_path
+
+
+class LanguageTexts(Mapping):
+    """
+    The texts of a section (e.g. "menu_items") in every language.
+
+    It works as a read-only dictionary keyed by language name, but a language is only translated
+    when one of its texts is requested for the first time.
+    """
+
+    def __init__(self, text_manager: TextManager, section: str) -> None:
+        self.text_manager: TextManager = text_manager
+        self.section: str = section
+
+    def __getitem__(self, language: str) -> Sequence[str]:
+        return self.text_manager.language_texts(language)[self.section]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.text_manager.available_languages())
+
+    def __len__(self) -> int:
+        return len(self.text_manager.available_languages())
 
 
 TextManagerInstance = TextManager()
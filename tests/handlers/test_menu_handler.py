@@ -1,9 +1,10 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import pygame
 
 from engine import Story
 from handlers.menu import MenuHandler
+from managers.snapshot_manager import SessionSnapshot
 
 
 class TestMenuHandler(TestCase):
@@ -95,6 +96,44 @@ class TestMenuHandler(TestCase):
             self.story.current_game_state, self.story.possible_game_states.game
         )
 
+    def load_saved_game(self):
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+        self.story.current_game_state = self.story.possible_game_states.main_menu
+        self.story.active_item_index = 1
+        snapshot = SessionSnapshot("scene1", "English", ["start", "scene1"])
+
+        with mock.patch(
+            "handlers.menu.SaveAndLoadManager.load_session", return_value=snapshot
+        ):
+            self.screen_handler.handle_main_menu(self.story, event)
+
+    def test_handle_main_menu_return_key_load_doesnt_block(self):
+        self.load_saved_game()
+
+        # The player is taken to the game later, from the game loop
+        self.assertEqual(
+            self.story.current_game_state, self.story.possible_game_states.main_menu
+        )
+        self.assertIsNotNone(self.story.popup_info)
+        self.story.scheduler.run_due(self.story.ticks() + 2000)
+
+        self.assertEqual(
+            self.story.current_game_state, self.story.possible_game_states.game
+        )
+        self.assertEqual(self.story.current_scene, "scene1")
+        self.assertEqual(self.story.history, ["start", "scene1"])
+
+    def test_handle_main_menu_load_after_leaving_menu(self):
+        self.load_saved_game()
+        self.story.current_game_state = self.story.possible_game_states.about
+
+        self.story.scheduler.run_due(self.story.ticks() + 2000)
+
+        self.assertEqual(
+            self.story.current_game_state, self.story.possible_game_states.about
+        )
+        self.assertEqual(self.story.current_scene, "start")
+
     def test_handle_language_menu_quit_event(self):
         event = pygame.event.Event(pygame.QUIT)
 
@@ -5,6 +5,7 @@ from unittest import TestCase, mock
 
 import pygame
 
+from configs import Config
 from engine import Story
 from handlers.screen import ScreenHandler
 
@@ -91,6 +92,8 @@ class TestScreenHandler(TestCase):
         event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_s)
 
         self.screen_handler.handle_game_dialogue_screen(self.story, event)
+        # The save is written in background
+        self.story.save_writer.flush()
 
         self.assertTrue(self.story.running)
         self.assertTrue(
@@ -119,3 +122,36 @@ class TestScreenHandler(TestCase):
 
         self.assertTrue(self.story.running)
         self.assertNotEqual(self.story.current_game_state, "in_choice")
+        self.assertEqual(self.story.history, ["start", "start"])
+        # Games change scenes with a cut unless they opt in to a transition
+        self.assertFalse(self.story.transition.active)
+
+    def test_handle_game_choice_screen_return_key_starts_transition(self):
+        game_config = Config()
+        game_config.transition = "crossfade"
+        story = Story(config=game_config, no_translation=True)
+        story.add_scene("start", "Test text", "Test character")
+        story.add_choice("start", "choice1", "start")
+        story.selected_language = "English"
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+
+        self.screen_handler.handle_game_choice_screen(story, event)
+
+        self.assertEqual(story.history, ["start", "start"])
+        self.assertTrue(story.transition.active)
+        self.assertEqual(story.transition.kind, "crossfade")
+
+    def test_handle_game_choice_screen_down_key_marks_choices_dirty(self):
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN)
+        self.story.selected_language = "English"
+        self.story.current_game_state = "in_choice"
+        self.story.screen_manager()
+        self.story.dirty = False
+
+        self.screen_handler.handle_game_choice_screen(self.story, event)
+
+        self.assertFalse(self.story.dirty)
+        self.assertEqual(
+            self.story.dirty_rects,
+            [self.story.choices_items[0].rect, self.story.choices_items[1].rect],
+        )
@@ -0,0 +1,84 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pygame
+
+from configs import config
+from managers import archive_manager
+from managers.archive_manager import AssetArchive
+
+
+class TestAssetArchive(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "assets.pna")
+        self.doggo = f"{config.image_path}doggo.png"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def pack(self, raw=False):
+        AssetArchive.pack_folder(
+            self.path, config.image_path, prefix="resources/images/hd", raw=raw
+        )
+        archive = AssetArchive(self.path)
+        self.addCleanup(archive.close)
+        return archive
+
+    def assertSameImage(self, surface, expected):
+        self.assertEqual(surface.get_size(), expected.get_size())
+        self.assertEqual(
+            pygame.image.tobytes(surface, "RGBA"),
+            pygame.image.tobytes(expected, "RGBA"),
+        )
+
+    def test_index(self):
+        archive = self.pack()
+
+        self.assertEqual(len(archive), len(os.listdir(config.image_path)))
+        self.assertIn("resources/images/hd/doggo.png", archive)
+        self.assertNotIn("doggo.png", archive)
+        with open(f"{config.image_path}icon.icns", "rb") as icon:
+            self.assertEqual(
+                bytes(archive.read("resources/images/hd/icon.icns")), icon.read()
+            )
+
+    def test_load_encoded_image(self):
+        archive = self.pack()
+
+        self.assertSameImage(
+            archive.load_image("resources/images/hd/doggo.png"),
+            pygame.image.load(self.doggo),
+        )
+
+    def test_load_raw_image(self):
+        archive = self.pack(raw=True)
+
+        self.assertSameImage(
+            archive.load_image("resources/images/hd/doggo.png"),
+            pygame.image.load(self.doggo),
+        )
+        with self.assertRaises(KeyError):
+            archive.load_image("resources/images/hd/missing.png")
+
+    def test_raw_surface_roundtrip(self):
+        surface = pygame.Surface((3, 2))
+        surface.fill((10, 20, 30))
+
+        decoded = archive_manager.decode_surface(
+            archive_manager.encode_surface(surface)
+        )
+
+        self.assertSameImage(decoded, surface)
+        self.assertFalse(decoded.get_flags() & pygame.SRCALPHA)
+        with self.assertRaises(ValueError):
+            archive_manager.decode_surface(b"\0" * 64)
+
+    def test_not_an_archive(self):
+        with open(self.path, "wb") as archive_file:
+            archive_file.write(b"\0" * 64)
+
+        with self.assertRaises(ValueError):
+            AssetArchive(self.path)
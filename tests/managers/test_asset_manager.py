@@ -0,0 +1,100 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pygame
+
+from configs import Config
+from managers.asset_manager import AssetPipeline, derive_asset
+
+
+class TestAssetPipeline(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.images_root = os.path.join(self.directory.name, "images")
+        self.manifest_path = os.path.join(self.directory.name, "assets.json")
+        self.save_image("doggo.png", (300, 150), (255, 0, 0))
+        self.save_image("boilerplate.png", (90, 60), (0, 255, 0))
+        with open(os.path.join(self.images_root, "4k", "icon.icns"), "wb") as icon:
+            icon.write(b"icns")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save_image(self, name, size, color):
+        path = os.path.join(self.images_root, "4k", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        pygame.image.save(surface, path)
+
+    def pipeline(self):
+        return AssetPipeline(Config(), self.images_root, self.manifest_path)
+
+    def test_derive_asset_resizes_images(self):
+        output_path = os.path.join(self.images_root, "hd", "doggo.png")
+
+        self.assertEqual(
+            derive_asset(
+                os.path.join(self.images_root, "4k", "doggo.png"), output_path, 1 / 3
+            ),
+            (output_path, None),
+        )
+        self.assertEqual(pygame.image.load(output_path).get_size(), (100, 50))
+
+    def test_derive_asset_reports_errors(self):
+        output_path = os.path.join(self.images_root, "hd", "missing.png")
+
+        _, error = derive_asset(
+            os.path.join(self.images_root, "4k", "missing.png"), output_path, 0.5
+        )
+
+        self.assertIsNotNone(error)
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_run_derives_every_resolution(self):
+        report = self.pipeline().run(jobs=1)
+
+        self.assertEqual(len(report["derived"]), 6)
+        self.assertEqual(report["failed"], [])
+        self.assertEqual(
+            pygame.image.load(
+                os.path.join(self.images_root, "fullhd", "doggo.png")
+            ).get_size(),
+            (150, 75),
+        )
+        with open(os.path.join(self.images_root, "hd", "icon.icns"), "rb") as icon:
+            self.assertEqual(icon.read(), b"icns")
+
+    def test_run_only_reprocesses_changed_masters(self):
+        self.pipeline().run(jobs=1)
+
+        self.assertEqual(self.pipeline().run(jobs=1)["derived"], [])
+        self.save_image("doggo.png", (600, 300), (0, 0, 255))
+        report = self.pipeline().run(jobs=1)
+        self.assertEqual(report["derived"], ["hd/doggo.png", "fullhd/doggo.png"])
+        self.assertEqual(len(report["cached"]), 4)
+        self.assertEqual(
+            pygame.image.load(
+                os.path.join(self.images_root, "hd", "doggo.png")
+            ).get_size(),
+            (200, 100),
+        )
+
+    def test_run_in_parallel(self):
+        report = self.pipeline().run(["hd"], jobs=2)
+
+        self.assertEqual(
+            sorted(report["derived"]),
+            ["hd/boilerplate.png", "hd/doggo.png", "hd/icon.icns"],
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.images_root, "fullhd")))
+
+    def test_run_rederives_missing_outputs(self):
+        self.pipeline().run(["hd"], jobs=1)
+        os.remove(os.path.join(self.images_root, "hd", "doggo.png"))
+
+        self.assertEqual(
+            self.pipeline().run(["hd"], jobs=1)["derived"], ["hd/doggo.png"]
+        )
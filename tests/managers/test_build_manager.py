@@ -0,0 +1,97 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from managers.build_manager import BuildManifest
+
+
+class TestBuildManifest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.manifest_path = os.path.join(self.root, "out", "build_manifest.json")
+        self.write("main.py", "print('hello')")
+        self.write("images/bg.png", "image")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as written_file:
+            written_file.write(content)
+        return path
+
+    def test_tree_digest_changes_with_contents_and_names(self):
+        manifest = BuildManifest(self.manifest_path)
+        digest = manifest.tree_digest(self.root)
+
+        self.assertEqual(manifest.tree_digest(self.root), digest)
+        self.write("main.py", "print('bye')")
+        changed = manifest.tree_digest(self.root)
+        self.assertNotEqual(changed, digest)
+        os.rename(
+            os.path.join(self.root, "main.py"), os.path.join(self.root, "game.py")
+        )
+        self.assertNotEqual(manifest.tree_digest(self.root), changed)
+
+    def test_tree_digest_filters(self):
+        manifest = BuildManifest(self.manifest_path)
+        digest = manifest.tree_digest(
+            self.root, extensions=(".py",), exclude=[os.path.join(self.root, "out")]
+        )
+
+        self.write("images/other.png", "other")
+        self.write("out/generated.py", "x = 1")
+        self.write(".git/hooks.py", "x = 1")
+        self.assertEqual(
+            manifest.tree_digest(
+                self.root,
+                extensions=(".py",),
+                exclude=[os.path.join(self.root, "out")],
+            ),
+            digest,
+        )
+
+    def test_file_digest_skips_unchanged_files(self):
+        manifest = BuildManifest(self.manifest_path)
+        path = os.path.join(self.root, "main.py")
+        digest = manifest.file_digest(path)
+
+        with mock.patch("builtins.open", side_effect=AssertionError):
+            self.assertEqual(manifest.file_digest(path), digest)
+
+    def test_changes(self):
+        manifest = BuildManifest(self.manifest_path)
+        inputs = {"source": "a", "assets": "b"}
+
+        self.assertEqual(manifest.changes("linux_hd", inputs), ["never built"])
+        manifest.record("linux_hd", inputs, success=False)
+        self.assertEqual(manifest.changes("linux_hd", inputs), ["last build failed"])
+        manifest.record("linux_hd", inputs, success=True)
+        self.assertEqual(manifest.changes("linux_hd", inputs), [])
+        self.assertEqual(
+            manifest.changes("linux_hd", {"source": "a", "assets": "c"}),
+            ["assets changed"],
+        )
+
+    def test_save_and_load(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.source = manifest.tree_digest(self.root)
+        manifest.record("linux_hd", {"source": manifest.source}, success=True)
+
+        self.assertTrue(manifest.save())
+        loaded = BuildManifest(self.manifest_path)
+        self.assertEqual(loaded.source, manifest.source)
+        self.assertEqual(loaded.targets, manifest.targets)
+        self.assertEqual(loaded.files, manifest.files)
+
+    def test_load_ignores_broken_manifest(self):
+        path = self.write("out/build_manifest.json", "not json")
+
+        manifest = BuildManifest(path)
+
+        self.assertIsNone(manifest.source)
+        self.assertEqual(manifest.targets, {})
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from configs import config
+from managers.bundle_manager import StoryBundle
+
+
+class TestStoryBundle(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "story.pnb")
+        self.scenes = {
+            "English": {
+                "start": {
+                    "description": "You wake up.",
+                    "image": f"{config.image_path}doggo.png",
+                    "character_name": "Doggo",
+                },
+                "door": {
+                    "description": "A hallway.",
+                    "image": f"{config.image_path}boilerplate.png",
+                    "character_name": "",
+                },
+            },
+            "Portuguese": {
+                "start": {
+                    "description": "Você acorda.",
+                    "image": f"{config.image_path}doggo.png",
+                    "character_name": "Doggo",
+                },
+                "door": {
+                    "description": "Um corredor.",
+                    "image": f"{config.image_path}boilerplate.png",
+                    "character_name": "",
+                },
+            },
+        }
+        self.choices = {
+            "English": {
+                "start": [("Open the door", "door"), ("Sleep", "end_scene")],
+                "door": [("Go back", "start"), ("Leave", "end_scene")],
+            },
+            "Portuguese": {
+                "start": [("Abrir a porta", "door"), ("Dormir", "end_scene")],
+                "door": [("Voltar", "start"), ("Sair", "end_scene")],
+            },
+        }
+        StoryBundle.write(self.path, self.scenes, self.choices, "ab" * 32)
+        self.bundle = StoryBundle(self.path)
+
+    def tearDown(self):
+        self.bundle.close()
+        self.directory.cleanup()
+
+    def test_header(self):
+        self.assertEqual(self.bundle.languages(), ["English", "Portuguese"])
+        self.assertEqual(self.bundle.scene_count, 2)
+        self.assertEqual(self.bundle.choice_count, 4)
+        self.assertEqual(self.bundle.fingerprint, "ab" * 32)
+
+    def test_scenes_view(self):
+        scenes = self.bundle.scenes_view("Portuguese")
+
+        self.assertEqual(scenes["start"], self.scenes["Portuguese"]["start"])
+        self.assertEqual(scenes["door"], self.scenes["Portuguese"]["door"])
+        self.assertEqual(sorted(scenes), ["door", "start"])
+        self.assertNotIn("end_scene", scenes)
+
+    def test_choices_view(self):
+        choices = self.bundle.choices_view("Portuguese")
+
+        self.assertEqual(choices["start"], self.choices["Portuguese"]["start"])
+        self.assertEqual(choices["door"], self.choices["Portuguese"]["door"])
+
+    def test_views_only_read_requested_scenes(self):
+        scenes = self.bundle.scenes_view("English")
+
+        scenes["door"]
+
+        self.assertEqual(list(scenes._loaded), ["door"])
+
+    def test_open_invalid_file(self):
+        invalid_path = os.path.join(self.directory.name, "invalid.pnb")
+        with open(invalid_path, "wb") as invalid_file:
+            invalid_file.write(b"\0" * 128)
+
+        self.assertRaises(ValueError, StoryBundle, invalid_path)
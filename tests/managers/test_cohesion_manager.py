@@ -0,0 +1,114 @@
+from unittest import TestCase
+
+from managers.cohesion_manager import CohesionAnalyzer
+
+
+def build_story(choices, scenes=None, languages=("English",)):
+    scenes = scenes if scenes is not None else list(choices)
+    return (
+        {
+            language: {
+                scene: {"description": scene, "image": "", "character_name": ""}
+                for scene in scenes
+            }
+            for language in languages
+        },
+        {
+            language: {scene: list(items) for scene, items in choices.items()}
+            for language in languages
+        },
+    )
+
+
+class TestCohesionAnalyzer(TestCase):
+
+    def analyze(self, choices, scenes=None, languages=("English",)):
+        return CohesionAnalyzer(*build_story(choices, scenes, languages)).analyze()
+
+    def test_cohesive_story(self):
+        report = self.analyze(
+            {
+                "start": [("a", "door"), ("b", "start")],
+                "door": [("a", "end_scene"), ("b", "start")],
+            }
+        )
+
+        self.assertTrue(report.is_cohesive)
+        self.assertEqual(str(report), "Story is cohesive")
+
+    def test_missing_start(self):
+        report = self.analyze({"scene1": [("a", "end_scene"), ("b", "scene1")]})
+
+        self.assertTrue(report.missing_start)
+        self.assertTrue(report.no_ending)
+        self.assertFalse(report.is_cohesive)
+
+    def test_dangling_choice(self):
+        report = self.analyze({"start": [("a", "end_scene"), ("b", "nowhere")]})
+
+        self.assertEqual(report.dangling_choices, [("start", "nowhere")])
+
+    def test_unreachable_scene(self):
+        report = self.analyze(
+            {
+                "start": [("a", "end_scene"), ("b", "start")],
+                "island": [("a", "end_scene"), ("b", "start")],
+            }
+        )
+
+        self.assertEqual(report.unreachable_scenes, ["island"])
+
+    def test_scene_without_choices(self):
+        report = self.analyze(
+            {"start": [("a", "end_scene"), ("b", "dead_end")]},
+            scenes=["start", "dead_end"],
+        )
+
+        self.assertEqual(report.scenes_without_choices, ["dead_end"])
+
+    def test_single_choice_scene(self):
+        report = self.analyze({"start": [("a", "end_scene")]})
+
+        self.assertEqual(report.single_choice_scenes, ["start"])
+
+    def test_inescapable_cycle(self):
+        report = self.analyze(
+            {
+                "start": [("a", "end_scene"), ("b", "loop1")],
+                "loop1": [("a", "loop2"), ("b", "loop1")],
+                "loop2": [("a", "loop1"), ("b", "loop2")],
+            }
+        )
+
+        self.assertEqual(
+            [sorted(cycle) for cycle in report.inescapable_cycles],
+            [["loop1", "loop2"]],
+        )
+        self.assertFalse(report.no_ending)
+
+    def test_language_mismatch(self):
+        scenes, choices = build_story(
+            {"start": [("a", "end_scene"), ("b", "start")]},
+            languages=("English", "Portuguese"),
+        )
+        choices["Portuguese"]["start"] = [("a", "start"), ("b", "end_scene")]
+
+        report = CohesionAnalyzer(scenes, choices).analyze()
+
+        self.assertEqual(
+            report.language_mismatches,
+            [("Portuguese", "start", "the choices don't match the story.")],
+        )
+
+    def test_long_story(self):
+        size = 100000
+        choices = {
+            f"scene{index}": [("next", f"scene{index + 1}"), ("back", f"scene{index}")]
+            for index in range(size)
+        }
+        choices["start"] = [("a", "scene0"), ("b", "start")]
+        choices[f"scene{size - 1}"] = [("a", "end_scene"), ("b", "start")]
+
+        report = self.analyze(choices)
+
+        self.assertTrue(report.is_cohesive)
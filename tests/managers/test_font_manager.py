@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+import pygame
+
+from managers.font_manager import FontManager
+
+
+class TestFontManager(TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.font_manager = FontManager(max_texts=2)
+        self.color = (255, 255, 255)
+
+    def test_get_font_reuses_font(self):
+        font = self.font_manager.get_font(None, 20)
+
+        self.assertIs(self.font_manager.get_font(None, 20), font)
+        self.assertIsNot(self.font_manager.get_font(None, 30), font)
+        self.assertEqual(self.font_manager.stats()["fonts"], 2)
+
+    def test_render_caches_surface(self):
+        font = self.font_manager.get_font(None, 20)
+
+        first = self.font_manager.render("Start", font, True, self.color)
+        second = self.font_manager.render("Start", font, True, self.color)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.font_manager.hits, 1)
+        self.assertEqual(self.font_manager.misses, 1)
+
+    def test_render_is_keyed_by_color(self):
+        font = self.font_manager.get_font(None, 20)
+
+        self.font_manager.render("Start", font, True, self.color)
+        self.font_manager.render("Start", font, True, (0, 0, 0))
+
+        self.assertEqual(self.font_manager.misses, 2)
+
+    def test_least_recently_used_text_is_evicted(self):
+        font = self.font_manager.get_font(None, 20)
+
+        self.font_manager.render("Start", font, True, self.color)
+        self.font_manager.render("Load", font, True, self.color)
+        self.font_manager.render("Start", font, True, self.color)
+        self.font_manager.render("Quit", font, True, self.color)
+        self.font_manager.render("Start", font, True, self.color)
+
+        self.assertEqual(self.font_manager.stats()["texts"], 2)
+        self.assertEqual(self.font_manager.hits, 2)
+        self.assertEqual(self.font_manager.misses, 3)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase, mock
+
+import pygame
+
+from configs import RESOLUTION_ENV, Config, config
+from managers.archive_manager import AssetArchive
+from managers.image_manager import ImageManager
+
+
+class TestImageManager(TestCase):
+
+    def setUp(self):
+        self.image_manager = ImageManager()
+        self.doggo = f"{config.image_path}doggo.png"
+        self.boilerplate = f"{config.image_path}boilerplate.png"
+
+    def test_load_caches_surface(self):
+        first = self.image_manager.load(self.doggo)
+        second = self.image_manager.load(self.doggo)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.image_manager.hits, 1)
+        self.assertEqual(self.image_manager.misses, 1)
+
+    def test_load_is_keyed_by_resolution(self):
+        self.image_manager.load(self.doggo, "hd")
+        self.image_manager.load(self.doggo, "4k")
+
+        self.assertEqual(self.image_manager.misses, 2)
+        self.assertEqual(self.image_manager.stats()["images"], 2)
+
+    def test_least_recently_used_image_is_evicted(self):
+        surface = pygame.image.load(self.doggo)
+        self.image_manager.budget = self.image_manager.surface_size(surface) + 1
+
+        self.image_manager.load(self.doggo)
+        self.image_manager.load(self.boilerplate)
+        self.image_manager.load(self.doggo)
+
+        self.assertEqual(self.image_manager.misses, 3)
+        self.assertLessEqual(self.image_manager.used_bytes, self.image_manager.budget)
+
+    def test_image_bigger_than_budget_is_not_cached(self):
+        self.image_manager.budget = 1
+
+        self.image_manager.load(self.doggo)
+
+        self.assertEqual(self.image_manager.used_bytes, 0)
+        self.assertEqual(self.image_manager.stats()["images"], 0)
+
+    def test_load_from_archive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "assets.pna")
+            AssetArchive.write(
+                path,
+                {self.image_manager.archive_name(self.doggo): self.boilerplate},
+            )
+            archive = AssetArchive(path)
+            image_manager = ImageManager(archive=archive)
+
+            surface = image_manager.load(self.doggo)
+
+            self.assertEqual(
+                pygame.image.tobytes(surface, "RGBA"),
+                pygame.image.tobytes(pygame.image.load(self.boilerplate), "RGBA"),
+            )
+            # Images that aren't on the archive are read from their files
+            self.assertIsNotNone(image_manager.load(f"{config.image_path}icon.png"))
+            archive.close()
+
+    def test_archive_is_opened_once_across_threads(self):
+        image_manager = ImageManager()
+        seen = []
+        other_thread = threading.Thread(
+            target=lambda: seen.append(image_manager.archive)
+        )
+
+        def open_archive(path):
+            # Another thread asks for the archive while it's being opened
+            if not other_thread.is_alive():
+                other_thread.start()
+                other_thread.join(0.2)
+            return mock.MagicMock()
+
+        with mock.patch("os.path.exists", return_value=True), mock.patch(
+            "managers.image_manager.AssetArchive", side_effect=open_archive
+        ) as asset_archive:
+            archive = image_manager.archive
+            other_thread.join(5)
+
+        asset_archive.assert_called_once()
+        self.assertIsNotNone(archive)
+        self.assertEqual(seen, [archive])
+
+    def test_load_from_built_resolution_archive(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(
+            os.environ, {RESOLUTION_ENV: "4k"}
+        ):
+            built_config = Config()
+            # A 4k folder whose doggo is the boilerplate, to tell the archive apart from the loose files
+            images = os.path.join(directory, "images")
+            os.makedirs(images)
+            shutil.copy(
+                os.path.join(built_config.image_path, "boilerplate.png"),
+                os.path.join(images, "doggo.png"),
+            )
+            built_config.asset_archive_path = AssetArchive.pack_folder(
+                os.path.join(directory, "assets.pna"),
+                images,
+                prefix=f"resources/images/{built_config.resolution}",
+            )
+            image_manager = ImageManager(config=built_config)
+
+            surface = image_manager.load(f"{built_config.image_path}doggo.png")
+
+            self.assertEqual(built_config.resolution, "4k")
+            self.assertEqual(
+                pygame.image.tobytes(surface, "RGBA"),
+                pygame.image.tobytes(
+                    pygame.image.load(f"{built_config.image_path}boilerplate.png"),
+                    "RGBA",
+                ),
+            )
+            image_manager.archive.close()
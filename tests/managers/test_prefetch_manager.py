@@ -0,0 +1,111 @@
+import time
+from unittest import TestCase
+
+import pygame
+
+from configs import config
+from managers.image_manager import ImageManager
+from managers.prefetch_manager import ImagePrefetcher
+
+
+class TestImagePrefetcher(TestCase):
+
+    def setUp(self):
+        self.image_manager = ImageManager()
+        self.doggo = f"{config.image_path}doggo.png"
+        self.boilerplate = f"{config.image_path}boilerplate.png"
+        self.icon = f"{config.image_path}icon.png"
+        self.scenes = {
+            "start": {"image": self.boilerplate},
+            "park": {"image": self.doggo},
+            "home": {"image": self.icon},
+            "far": {"image": f"{config.image_path}far.png"},
+        }
+        self.choices = {
+            "start": [("Go out", "park"), ("Stay", "start")],
+            "park": [("Go home", "home"), ("Stay", "park")],
+            "home": [("Go far", "far"), ("Leave", "end_scene")],
+        }
+
+    def prefetcher(self, **kwargs):
+        prefetcher = ImagePrefetcher(image_manager=self.image_manager, **kwargs)
+        self.addCleanup(prefetcher.stop)
+        return prefetcher
+
+    def queued(self, prefetcher):
+        requests = []
+        while not prefetcher._requests.empty():
+            requests.append(prefetcher._requests.get_nowait())
+        return [(distance, path) for distance, _, _, path in requests]
+
+    def run_worker(self, prefetcher):
+        # Run the loader synchronously, stopping once every queued request is handled
+        prefetcher._requests.put((1000, 0, None, None))
+        prefetcher.worker()
+
+    def test_reachable_scenes(self):
+        prefetcher = self.prefetcher(depth=2)
+
+        self.assertEqual(
+            prefetcher.reachable_scenes(self.choices, "start"),
+            [("start", 0), ("park", 1), ("home", 2)],
+        )
+
+    def test_watch_queues_closest_scenes_first(self):
+        prefetcher = self.prefetcher(depth=2)
+        prefetcher.start = lambda: None
+
+        prefetcher.watch(self.scenes, self.choices, "start")
+
+        self.assertEqual(
+            self.queued(prefetcher),
+            [(0, self.boilerplate), (1, self.doggo), (2, self.icon)],
+        )
+
+    def test_watch_skips_cached_images(self):
+        prefetcher = self.prefetcher(depth=1)
+        prefetcher.start = lambda: None
+        self.image_manager.load(self.boilerplate)
+
+        prefetcher.watch(self.scenes, self.choices, "start")
+        prefetcher.watch(self.scenes, self.choices, "start")
+
+        self.assertEqual(self.queued(prefetcher), [(1, self.doggo)])
+
+    def test_stale_requests_are_dropped(self):
+        prefetcher = self.prefetcher(depth=1)
+        prefetcher.start = lambda: None
+
+        prefetcher.watch(self.scenes, self.choices, "start")
+        prefetcher.watch(self.scenes, self.choices, "home")
+        self.run_worker(prefetcher)
+        prefetcher.collect()
+
+        self.assertFalse(self.image_manager.cached(self.boilerplate))
+        self.assertFalse(self.image_manager.cached(self.doggo))
+        self.assertTrue(self.image_manager.cached(self.icon))
+
+    def test_budget(self):
+        size = self.image_manager.surface_size(pygame.image.load(self.boilerplate))
+        prefetcher = self.prefetcher(depth=2, budget=size)
+        prefetcher.start = lambda: None
+
+        prefetcher.watch(self.scenes, self.choices, "start")
+        self.run_worker(prefetcher)
+
+        self.assertEqual(prefetcher.collect(), 1)
+        self.assertTrue(self.image_manager.cached(self.boilerplate))
+
+    def test_images_are_loaded_in_background(self):
+        prefetcher = self.prefetcher(depth=2)
+
+        prefetcher.watch(self.scenes, self.choices, "start")
+        deadline = time.monotonic() + 5
+        while prefetcher.prefetched < 3 and time.monotonic() < deadline:
+            prefetcher.collect()
+            time.sleep(0.01)
+
+        self.assertEqual(prefetcher.prefetched, 3)
+        misses = self.image_manager.misses
+        self.image_manager.load(self.doggo)
+        self.assertEqual(self.image_manager.misses, misses)
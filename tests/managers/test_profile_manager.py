@@ -0,0 +1,112 @@
+import os
+import pstats
+import tempfile
+from unittest import TestCase, mock
+
+from managers import profile_manager
+from managers.profile_manager import FrameProfiler
+
+
+class TestFrameProfiler(TestCase):
+
+    def setUp(self):
+        self.profiler = FrameProfiler(size=3)
+        self.profiler.enable()
+
+    def record_frame(self, seconds):
+        self.profiler.begin()
+        self.profiler._frame_start -= seconds
+        self.profiler._lap_start -= seconds
+        self.profiler.lap(profile_manager.SCREEN_MANAGER)
+        self.profiler.lap(profile_manager.PRESENT)
+        self.profiler.end()
+
+    def test_disabled_profiler_records_nothing(self):
+        self.profiler.disable()
+
+        self.record_frame(0.01)
+
+        self.assertEqual(self.profiler.frame_count, 0)
+        self.assertEqual(self.profiler.frames(), [])
+
+    def test_lap_adds_to_phase(self):
+        self.profiler.begin()
+        self.profiler._lap_start -= 0.002
+        self.profiler.lap(profile_manager.EVENTS)
+        self.profiler._lap_start -= 0.003
+        self.profiler.lap(profile_manager.EVENTS)
+        self.profiler.end()
+
+        frame = self.profiler.frames()[0]
+
+        self.assertAlmostEqual(frame["events"], 5, delta=1)
+        self.assertEqual(frame["popup"], 0)
+        self.assertEqual(set(frame), set(profile_manager.PHASES) | {"total"})
+
+    def test_ring_buffer_keeps_last_frames(self):
+        for milliseconds in (10, 20, 30, 40, 50):
+            self.record_frame(milliseconds / 1000)
+
+        frames = self.profiler.frames()
+
+        self.assertEqual(self.profiler.frame_count, 5)
+        self.assertEqual(
+            [round(frame["screen_manager"]) for frame in frames], [30, 40, 50]
+        )
+
+    def test_summary(self):
+        for milliseconds in (10, 20, 30):
+            self.record_frame(milliseconds / 1000)
+
+        summary = self.profiler.summary()
+
+        self.assertAlmostEqual(summary["screen_manager"]["mean"], 20, delta=1)
+        self.assertAlmostEqual(summary["screen_manager"]["max"], 30, delta=1)
+        self.assertGreaterEqual(summary["total"]["p95"], 30)
+        self.assertEqual(summary["popup"]["max"], 0)
+
+    def test_summary_without_frames(self):
+        self.assertEqual(FrameProfiler(size=3).summary()["total"]["mean"], 0)
+
+    def test_toggle_overlay_enables_profiler(self):
+        profiler = FrameProfiler(size=3)
+
+        profiler.toggle_overlay()
+
+        self.assertTrue(profiler.overlay)
+        self.assertTrue(profiler.enabled)
+
+    def test_hiding_overlay_restores_recording(self):
+        profiler = FrameProfiler(size=3)
+        profiler.disable()
+
+        profiler.toggle_overlay()
+        profiler.toggle_overlay()
+
+        self.assertFalse(profiler.overlay)
+        self.assertFalse(profiler.enabled)
+
+        profiler.enable()
+        profiler.toggle_overlay()
+        profiler.toggle_overlay()
+
+        self.assertTrue(profiler.enabled)
+
+    def test_profile_dumps_stats(self):
+        loop = mock.MagicMock()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.prof")
+            with mock.patch.dict(os.environ, {profile_manager.PROFILE_ENV: path}):
+                self.profiler.profile(loop)
+
+            loop.assert_called_once()
+            self.assertTrue(pstats.Stats(path).total_calls)
+
+    def test_profile_without_env(self):
+        loop = mock.MagicMock()
+
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.profiler.profile(loop)
+
+        loop.assert_called_once()
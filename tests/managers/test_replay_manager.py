@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pygame
+
+from managers import replay_manager
+from managers.replay_manager import InputRecorder, InputReplayer
+
+
+class TestInputReplay(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.pnir")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record_and_replay(self):
+        recorder = InputRecorder(self.path, 30)
+        recorder.record(
+            0,
+            [
+                pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0),
+                pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1)),
+            ],
+        )
+        recorder.record(
+            4, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=1)]
+        )
+        recorder.record(9, [pygame.event.Event(pygame.QUIT)])
+        recorder.close()
+
+        replayer = InputReplayer(self.path)
+
+        self.assertEqual(recorder.events, 3)
+        self.assertEqual(replayer.fps, 30)
+        self.assertEqual(replayer.last_frame, 9)
+        self.assertEqual(
+            [event.key for event in replayer.events_for(0)], [pygame.K_DOWN]
+        )
+        self.assertEqual(replayer.events_for(3), [])
+        # Events of frames that were skipped are fed on the next frame
+        events = replayer.events_for(5)
+        self.assertEqual((events[0].key, events[0].mod), (pygame.K_RETURN, 1))
+        self.assertFalse(replayer.finished)
+        self.assertEqual(replayer.events_for(9)[0].type, pygame.QUIT)
+        self.assertTrue(replayer.finished)
+
+    def test_record_frame_times(self):
+        recorder = InputRecorder(self.path, 60)
+        for frame, ticks in enumerate((5000, 5016, 5120, 5137)):
+            recorder.record_frame(frame, ticks)
+        recorder.close()
+
+        replayer = InputReplayer(self.path)
+
+        self.assertEqual(
+            [replayer.ticks_for(frame) for frame in range(6)],
+            [0, 16, 120, 137, 153, 170],
+        )
+
+    def test_replay_version_1_on_fixed_timestep(self):
+        with open(self.path, "wb") as recording:
+            recording.write(replay_manager.HEADER.pack(replay_manager.MAGIC, 1, 50))
+            recording.write(replay_manager.EVENT.pack(3, pygame.QUIT, 0, 0))
+
+        replayer = InputReplayer(self.path)
+
+        self.assertEqual(replayer.ticks_for(10), 200)
+        self.assertEqual(replayer.last_frame, 3)
+
+    def test_replay_invalid_file(self):
+        with open(self.path, "wb") as recording:
+            recording.write(b"not a recording")
+
+        self.assertRaises(ValueError, InputReplayer, self.path)
+
+    def test_replay_truncated_file(self):
+        recorder = InputRecorder(self.path, 30)
+        recorder.record(0, [pygame.event.Event(pygame.QUIT)])
+        recorder.close()
+        with open(self.path, "ab") as recording:
+            recording.write(b"\0")
+
+        self.assertRaises(ValueError, InputReplayer, self.path)
@@ -1,9 +1,16 @@
+import json
 import os
 import shutil
+import sqlite3
 import sys
-from unittest import TestCase
+import tempfile
+import threading
+from unittest import TestCase, mock
 
-from managers.save_manager import SaveAndLoadManager
+from errors.saveandload import NoGameSaved
+from managers import save_manager
+from managers.save_manager import SaveAndLoadManager, SaveStore, SaveWriter
+from managers.snapshot_manager import SessionSnapshot
 
 
 class TestSaveManager(TestCase):
@@ -28,21 +35,13 @@ class TestSaveManager(TestCase):
                 os.path.join(os.path.dirname(sys.executable), "saved_games_test")
             )
         )
-        self.assertTrue(
-            os.listdir(
-                os.path.join(os.path.dirname(sys.executable), "saved_games_test")
-            )
-        )
-        self.assertTrue(
-            os.listdir(
-                os.path.join(os.path.dirname(sys.executable), "saved_games_test")
-            )[0].startswith("save_")
-        )
-        self.assertTrue(
+        self.assertEqual(
             os.listdir(
                 os.path.join(os.path.dirname(sys.executable), "saved_games_test")
-            )[0].endswith(".json")
+            ),
+            [save_manager.SAVE_STORE_NAME],
         )
+        self.assertEqual(self.save_manager.store("saved_games_test").count(), 1)
 
     def test_load_game(self):
         self.save_manager.save_game("state", "saved_games_test")
@@ -51,3 +50,166 @@ class TestSaveManager(TestCase):
         )
 
         self.assertEqual(state, "state")
+
+    def test_load_latest_game(self):
+        self.save_manager.save_game("first", "saved_games_test")
+        self.save_manager.save_game("second", "saved_games_test")
+
+        self.assertEqual(self.save_manager.load_game("saved_games_test"), "second")
+
+    def test_load_session(self):
+        snapshot = SessionSnapshot("hallway", "Spanish", ["start", "hallway"])
+        self.save_manager.save_game(snapshot, "saved_games_test")
+
+        self.assertEqual(self.save_manager.load_session("saved_games_test"), snapshot)
+
+    def test_load_session_of_older_versions(self):
+        self.save_manager.store("saved_games_test").add({"state": "hallway"})
+
+        snapshot = self.save_manager.load_session("saved_games_test")
+
+        self.assertEqual(snapshot.scene, "hallway")
+        self.assertEqual(snapshot.path, ["hallway"])
+
+    def test_load_game_without_saves(self):
+        self.assertRaises(NoGameSaved, self.save_manager.load_game, "saved_games_test")
+
+
+class TestSaveStore(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SaveStore(self.directory.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_saves_by_slot_and_time(self):
+        self.store.add({"state": "a"}, slot="one", created=10)
+        self.store.add({"state": "b"}, slot="two", created=20)
+        self.store.add({"state": "c"}, slot="one", created=30)
+        self.store.add({"state": "d"}, slot="one", created=30)
+
+        self.assertEqual(self.store.latest()["data"], {"state": "d"})
+        self.assertEqual(self.store.latest("two")["data"], {"state": "b"})
+        self.assertEqual(
+            [save["data"]["state"] for save in self.store.saves("one")],
+            ["d", "c", "a"],
+        )
+        self.assertEqual(
+            [save["data"]["state"] for save in self.store.saves(before=30)],
+            ["b", "a"],
+        )
+        self.assertEqual(self.store.slots(), ["one", "two"])
+        self.assertIsNone(self.store.latest("three"))
+
+    def test_prune(self):
+        for created in range(10):
+            self.store.add({"state": str(created)}, created=created)
+        self.store.add({"state": "other"}, slot="other", created=0)
+
+        self.assertEqual(self.store.prune(3, slot="default"), 7)
+        self.assertEqual(
+            [save["data"]["state"] for save in self.store.saves("default")],
+            ["9", "8", "7"],
+        )
+        self.assertEqual(self.store.prune(1), 3)
+        self.assertEqual(self.store.count(), 1)
+
+    def test_migrates_json_saves_once(self):
+        for index, state in enumerate(["old", "new"]):
+            path = os.path.join(self.directory.name, f"save_{index}.json")
+            with open(path, "w") as save_file:
+                json.dump({"state": state}, save_file)
+            os.utime(path, (1000 + index, 1000 + index))
+        with open(os.path.join(self.directory.name, "save_broken.json"), "w") as file:
+            file.write("{")
+
+        self.assertEqual(self.store.latest()["data"], {"state": "new"})
+        self.assertEqual(self.store.count(), 2)
+
+        self.store.close()
+        store = SaveStore(self.directory.name)
+        self.assertEqual(store.count(), 2)
+        store.close()
+
+
+class TestSaveWriter(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.writer = SaveWriter(self.directory.name)
+
+    def tearDown(self):
+        self.writer.stop()
+        SaveAndLoadManager.store(self.directory.name).close()
+        self.directory.cleanup()
+
+    def test_writes_in_background(self):
+        self.writer.submit({"state": "start"})
+
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(self.writer.poll(), [("default", None, 1)])
+        self.assertEqual(self.writer.poll(), [])
+        self.assertEqual(SaveAndLoadManager.load_game(self.directory.name), "start")
+
+    def test_encodes_sessions_in_background(self):
+        snapshot = SessionSnapshot("hallway", "English", ["start", "hallway"])
+
+        self.writer.submit(snapshot, scene_positions={"start": 0, "hallway": 1})
+
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(self.writer.poll(), [("default", None, 1)])
+        self.assertEqual(SaveAndLoadManager.load_session(self.directory.name), snapshot)
+
+    def test_reports_sessions_that_cant_be_encoded(self):
+        self.writer.submit(SessionSnapshot("start", flags={"items": ["key"]}))
+        self.writer.flush(5)
+
+        ((slot, error, _),) = self.writer.poll()
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(self.writer.written, 0)
+
+    def test_coalesces_bursts(self):
+        writing, release = threading.Event(), threading.Event()
+        store = mock.MagicMock()
+
+        def add(data, slot):
+            writing.set()
+            release.wait(5)
+
+        store.add.side_effect = add
+        with mock.patch.object(SaveAndLoadManager, "store", return_value=store):
+            self.writer.submit({"state": "first"})
+            writing.wait(5)
+            for state in ("second", "third", "fourth"):
+                self.writer.submit({"state": state})
+            release.set()
+            self.writer.flush(5)
+
+        self.assertEqual(
+            [call.args[0]["state"] for call in store.add.call_args_list],
+            ["first", "fourth"],
+        )
+        self.assertEqual(self.writer.coalesced, 2)
+        self.assertEqual([requests for _, _, requests in self.writer.poll()], [1, 3])
+
+    def test_reports_failures(self):
+        store = mock.MagicMock()
+        store.add.side_effect = sqlite3.OperationalError("disk I/O error")
+
+        with mock.patch.object(SaveAndLoadManager, "store", return_value=store):
+            self.writer.submit({"state": "start"})
+            self.writer.flush(5)
+
+        ((slot, error, _),) = self.writer.poll()
+        self.assertIsInstance(error, sqlite3.OperationalError)
+        self.assertEqual(self.writer.written, 0)
+
+    def test_stop_writes_queued_saves(self):
+        self.writer.submit({"state": "start"})
+
+        self.writer.stop()
+
+        self.assertEqual(self.writer.written, 1)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from managers.scheduler_manager import Scheduler
+
+
+class TestScheduler(TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.calls = []
+
+    def callback(self, name):
+        return lambda: self.calls.append(name)
+
+    def test_runs_due_timers_in_order(self):
+        self.scheduler.schedule(300, self.callback("c"))
+        self.scheduler.schedule(100, self.callback("a"))
+        self.scheduler.schedule(200, self.callback("b"))
+
+        self.assertEqual(self.scheduler.next_due(), 100)
+        self.assertEqual(self.scheduler.run_due(250), 2)
+        self.assertEqual(self.calls, ["a", "b"])
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.scheduler.next_due(), 300)
+
+    def test_named_timers_replace_each_other(self):
+        self.scheduler.schedule(100, self.callback("first"), name="popup")
+        self.scheduler.schedule(200, self.callback("second"), name="popup")
+
+        self.scheduler.run_due(1000)
+
+        self.assertEqual(self.calls, ["second"])
+        self.assertNotIn("popup", self.scheduler)
+
+    def test_cancel(self):
+        timer = self.scheduler.schedule(100, self.callback("a"))
+        self.scheduler.schedule(100, self.callback("b"), name="b")
+
+        self.assertTrue(self.scheduler.cancel(timer))
+        self.assertTrue(self.scheduler.cancel("b"))
+        self.assertFalse(self.scheduler.cancel("b"))
+        self.assertIsNone(self.scheduler.next_due())
+        self.assertEqual(self.scheduler.run_due(1000), 0)
+
+    def test_repeating_timer(self):
+        self.scheduler.schedule(100, self.callback("tick"), interval=50)
+
+        self.scheduler.run_due(100)
+        self.scheduler.run_due(160)
+        # Late frames don't run the missed ticks
+        self.scheduler.run_due(400)
+
+        self.assertEqual(self.calls, ["tick"] * 3)
+        self.assertEqual(self.scheduler.next_due(), 450)
+
+    def test_callbacks_can_schedule_timers(self):
+        self.scheduler.schedule(
+            100, lambda: self.scheduler.schedule(100, self.callback("later"))
+        )
+
+        self.scheduler.run_due(100)
+        self.assertEqual(self.calls, [])
+        self.scheduler.run_due(100)
+
+        self.assertEqual(self.calls, ["later"])
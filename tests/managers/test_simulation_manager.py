@@ -0,0 +1,143 @@
+from unittest import TestCase
+
+from managers import simulation_manager
+from managers.simulation_manager import PlaythroughSimulator
+
+
+class TestPlaythroughSimulator(TestCase):
+
+    def story(self, choices, scenes=None):
+        scenes = scenes if scenes is not None else list(choices)
+        return (
+            {"English": {scene: {"description": scene} for scene in scenes}},
+            {"English": choices},
+        )
+
+    def test_random_playthroughs(self):
+        simulator = PlaythroughSimulator(
+            *self.story(
+                {
+                    "start": [("Left", "left"), ("Right", "right")],
+                    "left": [("Leave", "end_scene"), ("Back", "start")],
+                    "right": [("Leave", "end_scene"), ("Stay", "right")],
+                }
+            )
+        )
+
+        report = simulator.run(2000, jobs=1, seed=1)
+
+        self.assertEqual(report.playthroughs, 2000)
+        self.assertEqual(report.finished, 2000)
+        self.assertEqual(report.coverage, 1.0)
+        self.assertEqual(set(report.endings), {"left", "right"})
+        self.assertGreaterEqual(report.average_length, 2)
+        self.assertTrue(report.is_playable)
+
+    def test_random_playthroughs_are_repeatable(self):
+        simulator = PlaythroughSimulator(
+            *self.story(
+                {
+                    "start": [("Leave", "end_scene"), ("Stay", "start")],
+                }
+            )
+        )
+
+        first = simulator.run(500, jobs=1, seed=7)
+        second = simulator.run(500, jobs=1, seed=7)
+
+        self.assertEqual(first.total_length, second.total_length)
+
+    def test_random_playthroughs_in_parallel(self):
+        simulator = PlaythroughSimulator(
+            *self.story(
+                {
+                    "start": [("Leave", "end_scene"), ("Stay", "start")],
+                }
+            )
+        )
+
+        report = simulator.run(4000, jobs=2, seed=1)
+
+        self.assertEqual(report.playthroughs, 4000)
+        self.assertEqual(report.endings, {"start": 4000})
+
+    def test_stuck_states(self):
+        simulator = PlaythroughSimulator(
+            *self.story(
+                {
+                    "start": [
+                        ("Dead end", "dead_end"),
+                        ("Nowhere", "nowhere"),
+                        ("Trap", "trap"),
+                    ],
+                    "dead_end": [],
+                    "trap": [("Stay", "trap"), ("Stay", "trap")],
+                    "unplayed": [("Leave", "end_scene"), ("Stay", "unplayed")],
+                },
+            )
+        )
+
+        report = simulator.run(300, jobs=1, seed=3, max_steps=20)
+
+        self.assertEqual(
+            {reason for _, reason in report.stuck},
+            {
+                simulation_manager.NO_CHOICES,
+                simulation_manager.UNDEFINED_SCENE,
+                simulation_manager.TOO_LONG,
+            },
+        )
+        self.assertIn(("nowhere", simulation_manager.UNDEFINED_SCENE), report.stuck)
+        self.assertEqual(report.finished, 0)
+        self.assertEqual(report.unvisited_scenes, ["unplayed"])
+        self.assertEqual(report.unreached_endings, ["unplayed"])
+        self.assertFalse(report.is_playable)
+
+    def test_missing_start(self):
+        simulator = PlaythroughSimulator(
+            *self.story({"other": [("Leave", "end_scene")]})
+        )
+
+        report = simulator.run(10, jobs=1)
+
+        self.assertEqual(
+            report.stuck, {("start", simulation_manager.UNDEFINED_SCENE): 10}
+        )
+
+    def test_exhaustive_playthroughs(self):
+        simulator = PlaythroughSimulator(
+            *self.story(
+                {
+                    "start": [("Left", "left"), ("Right", "right")],
+                    "left": [("Leave", "end_scene"), ("Right", "right")],
+                    "right": [("Leave", "end_scene"), ("Back", "start")],
+                }
+            )
+        )
+
+        report = simulator.explore()
+
+        # start-left-end, start-left-right-end and start-right-end
+        self.assertEqual(report.playthroughs, 3)
+        self.assertEqual(report.finished, 3)
+        self.assertEqual(report.total_length, 2 + 3 + 2)
+        self.assertEqual(report.endings, {"left": 1, "right": 2})
+        self.assertTrue(report.complete)
+
+    def test_exhaustive_playthroughs_limit(self):
+        choices = {
+            f"scene{index}": [
+                ("A", f"scene{index + 1}"),
+                ("B", f"scene{index + 1}"),
+            ]
+            for index in range(30)
+        }
+        choices["start"] = [("A", "scene0"), ("B", "scene0")]
+        choices["scene30"] = [("Leave", "end_scene"), ("Back", "start")]
+        simulator = PlaythroughSimulator(*self.story(choices))
+
+        report = simulator.explore(limit=100)
+
+        self.assertEqual(report.playthroughs, 100)
+        self.assertFalse(report.complete)
+        self.assertIn("stopped early", str(report))
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from managers.snapshot_manager import SessionSnapshot
+
+
+class TestSessionSnapshot(TestCase):
+
+    def setUp(self):
+        self.positions = {f"scene{index}": index for index in range(1000)}
+        self.snapshot = SessionSnapshot(
+            "scene3",
+            "Portuguese",
+            ["scene0", "scene1", "scene2", "scene1", "scene2", "scene3"],
+            {"met_doggo": True, "lost": False, "coins": -12, "name": "Ana"},
+        )
+
+    def test_roundtrip(self):
+        data = self.snapshot.encode(self.positions)
+
+        self.assertEqual(SessionSnapshot.decode(data), self.snapshot)
+
+    def test_roundtrip_compressed(self):
+        path = [f"scene{index % 1000}" for index in range(5000)]
+        snapshot = SessionSnapshot("scene999", "English", path)
+
+        data = snapshot.encode(self.positions, level=6)
+
+        self.assertEqual(SessionSnapshot.decode(data), snapshot)
+        self.assertLess(len(data), 5000)
+
+    def test_roundtrip_far_jumps(self):
+        snapshot = SessionSnapshot(
+            "scene0", None, ["scene0", "scene999", "scene500", "scene0"], {"x": 1.5}
+        )
+
+        data = snapshot.encode(self.positions)
+
+        self.assertEqual(SessionSnapshot.decode(data), snapshot)
+
+    def test_scenes_are_interned(self):
+        path = ["scene1", "scene2"] * 500
+
+        data = SessionSnapshot("scene2", "English", path).encode(self.positions)
+
+        # Each scene id is written once and each choice takes a byte
+        self.assertLess(len(data), 1100)
+
+    def test_unknown_scenes(self):
+        snapshot = SessionSnapshot("later", None, ["scene1", "later"])
+
+        data = snapshot.encode(self.positions)
+
+        self.assertEqual(SessionSnapshot.decode(data), snapshot)
+
+    def test_unsupported_flag(self):
+        snapshot = SessionSnapshot("scene1", flags={"items": ["key"]})
+
+        self.assertRaises(ValueError, snapshot.encode)
+
+    def test_decode_damaged_data(self):
+        data = self.snapshot.encode(self.positions)
+
+        self.assertRaises(ValueError, SessionSnapshot.decode, b"not a snapshot")
+        self.assertRaises(ValueError, SessionSnapshot.decode, data[:-5])
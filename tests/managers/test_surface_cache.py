@@ -0,0 +1,76 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import pygame
+
+from configs import config
+from managers.image_manager import ImageManager
+from managers.surface_cache import RawSurfaceCache
+
+
+class TestRawSurfaceCache(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.raw_cache = RawSurfaceCache(directory=self.directory.name)
+        self.doggo = f"{config.image_path}doggo.png"
+        self.boilerplate = f"{config.image_path}boilerplate.png"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dump_path_mirrors_resources(self):
+        self.assertEqual(
+            self.raw_cache.dump_path(self.doggo),
+            os.path.join(
+                self.directory.name, "resources", "images", "hd", "doggo.png.praw"
+            ),
+        )
+        self.assertIsNone(self.raw_cache.dump_path("/elsewhere/doggo.png"))
+
+    def test_load_dump(self):
+        self.assertIsNone(self.raw_cache.load(self.doggo))
+
+        self.raw_cache.write(self.doggo)
+        surface = self.raw_cache.load(self.doggo)
+
+        self.assertEqual(
+            pygame.image.tobytes(surface, "RGBA"),
+            pygame.image.tobytes(pygame.image.load(self.doggo), "RGBA"),
+        )
+
+    def test_outdated_dump_is_ignored(self):
+        dump_path = self.raw_cache.write(self.doggo)
+        mtime = os.stat(self.doggo).st_mtime_ns
+        os.utime(dump_path, ns=(mtime - 10**9, mtime - 10**9))
+
+        self.assertIsNone(self.raw_cache.load(self.doggo))
+
+    def test_load_without_dumps_doesnt_stat(self):
+        raw_cache = RawSurfaceCache(
+            directory=os.path.join(self.directory.name, "missing")
+        )
+        self.assertIsNone(raw_cache.load(self.doggo))
+
+        with mock.patch("os.stat") as stat:
+            self.assertIsNone(raw_cache.load(self.doggo))
+            self.assertIsNone(raw_cache.load(self.boilerplate))
+
+        stat.assert_not_called()
+
+    def test_write_folders(self):
+        dumps = self.raw_cache.write_folders([config.image_path])
+
+        self.assertEqual(len(dumps), 3)
+        self.raw_cache.clear()
+        self.assertIsNone(self.raw_cache.load(self.doggo))
+
+    def test_image_manager_uses_dumps(self):
+        dumped = pygame.Surface((4, 4))
+        self.raw_cache.load = lambda path: dumped if path == self.doggo else None
+
+        image_manager = ImageManager(raw_cache=self.raw_cache)
+
+        self.assertIs(image_manager.read(self.doggo), dumped)
+        self.assertIsNot(image_manager.read(self.boilerplate), dumped)
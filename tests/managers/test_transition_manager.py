@@ -0,0 +1,135 @@
+from unittest import TestCase
+
+import pygame
+
+from managers.transition_manager import SceneTransition, Tween
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+class TestTween(TestCase):
+
+    def test_progress_depends_on_time_only(self):
+        tween = Tween(1000, 400)
+
+        self.assertEqual(tween.progress(900), 0)
+        self.assertEqual(tween.progress(1100), 0.25)
+        self.assertEqual(tween.progress(1400), 1)
+        self.assertEqual(tween.progress(5000), 1)
+        self.assertFalse(tween.finished(1399))
+        self.assertTrue(tween.finished(1400))
+
+    def test_easing(self):
+        tween = Tween(0, 100, "ease_in_out")
+
+        self.assertLess(tween.progress(25), 0.25)
+        self.assertEqual(tween.progress(50), 0.5)
+        self.assertGreater(tween.progress(75), 0.75)
+
+    def test_unknown_easing(self):
+        with self.assertRaises(ValueError):
+            Tween(0, 100, "bounce")
+
+
+class TestSceneTransition(TestCase):
+
+    def setUp(self):
+        self.screen = pygame.Surface((100, 50))
+        self.transition = SceneTransition()
+
+    def start(self, kind):
+        self.screen.fill(RED)
+        self.assertTrue(self.transition.start(self.screen, kind, 100, 0, "linear"))
+        self.screen.fill(BLUE)
+        self.transition.capture_target(self.screen)
+
+    def test_crossfade(self):
+        self.start("crossfade")
+
+        self.assertTrue(self.transition.draw(self.screen, 50))
+
+        red, _, blue, _ = self.screen.get_at((50, 25))
+        self.assertAlmostEqual(red, 127, delta=2)
+        self.assertAlmostEqual(blue, 128, delta=2)
+
+    def test_fade_goes_through_color(self):
+        self.start("fade")
+
+        self.transition.draw(self.screen, 25)
+        self.assertAlmostEqual(self.screen.get_at((0, 0)).r, 127, delta=2)
+        self.transition.draw(self.screen, 50)
+        self.assertEqual(self.screen.get_at((0, 0))[:3], (0, 0, 0))
+        self.transition.draw(self.screen, 75)
+        self.assertAlmostEqual(self.screen.get_at((0, 0)).b, 127, delta=2)
+
+    def test_fade_goes_through_other_colors(self):
+        self.transition = SceneTransition((255, 255, 255))
+        self.start("fade")
+
+        self.transition.draw(self.screen, 25)
+        self.assertEqual(self.screen.get_at((0, 0)).r, 255)
+        self.assertAlmostEqual(self.screen.get_at((0, 0)).g, 127, delta=2)
+        self.transition.draw(self.screen, 50)
+        self.assertEqual(self.screen.get_at((0, 0))[:3], (255, 255, 255))
+
+    def test_slide(self):
+        self.start("slide")
+
+        self.transition.draw(self.screen, 25)
+
+        self.assertEqual(self.screen.get_at((74, 25))[:3], RED)
+        self.assertEqual(self.screen.get_at((75, 25))[:3], BLUE)
+
+    def test_wipe(self):
+        self.start("wipe")
+
+        self.transition.draw(self.screen, 25)
+
+        self.assertEqual(self.screen.get_at((24, 25))[:3], BLUE)
+        self.assertEqual(self.screen.get_at((25, 25))[:3], RED)
+
+    def test_frames_drawn_over_the_last_one_match_full_frames(self):
+        for kind in ("fade", "crossfade", "wipe"):
+            self.start(kind)
+            for now in range(5, 90, 5):
+                self.transition.draw(self.screen, now)
+            blended = self.screen.copy()
+
+            self.transition.discard_frame()
+            self.transition.draw(self.screen, 85)
+
+            for x in (0, 50, 84, 85, 99):
+                for blended_value, value in zip(
+                    blended.get_at((x, 25)), self.screen.get_at((x, 25))
+                ):
+                    self.assertAlmostEqual(blended_value, value, delta=4, msg=kind)
+
+    def test_ends_on_next_scene(self):
+        self.start("crossfade")
+        self.screen.fill(RED)
+
+        self.assertFalse(self.transition.draw(self.screen, 100))
+
+        self.assertFalse(self.transition.active)
+        self.assertEqual(self.screen.get_at((0, 0))[:3], BLUE)
+
+    def test_cut_isnt_drawn(self):
+        self.assertFalse(self.transition.start(self.screen, "cut", 100, 0))
+        self.assertFalse(self.transition.start(self.screen, "fade", 0, 0))
+        self.assertFalse(self.transition.active)
+
+    def test_unknown_transition(self):
+        with self.assertRaises(ValueError):
+            self.transition.start(self.screen, "spin", 100, 0)
+
+    def test_surfaces_are_reused(self):
+        self.start("fade")
+        source, target = self.transition.source, self.transition.target
+
+        self.start("wipe")
+        self.assertIs(self.transition.source, source)
+        self.assertIs(self.transition.target, target)
+
+        self.transition.start(pygame.Surface((200, 50)), "wipe", 100, 0)
+        self.assertEqual(self.transition.source.get_size(), (200, 50))
@@ -0,0 +1,212 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from managers.translation_manager import TranslationCache, TranslationManager
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text, src, dest):
+        self.calls += 1
+        return f"{dest}:{text}"
+
+
+class SlowBatchBackend:
+    """
+    A local backend answering batches from many threads, like a remote translator would.
+
+    Each batch waits on `barrier` (if given) until as many batches as its parties are being translated at once.
+    """
+
+    name = "slow"
+
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        if self.barrier is not None:
+            self.barrier.wait()
+        with self.lock:
+            self.batches.append((tuple(texts), src, dest))
+        return [f"{dest}:{text}" for text in texts]
+
+
+class FailingBatchBackend(SlowBatchBackend):
+    """
+    A backend that can't translate to one of the languages.
+    """
+
+    def __init__(self, failing_dest):
+        super().__init__()
+        self.failing_dest = failing_dest
+
+    def translate_batch(self, texts, src, dest):
+        if dest == self.failing_dest:
+            raise ConnectionError("translator unavailable")
+        return super().translate_batch(texts, src, dest)
+
+
+class ShortBatchBackend(SlowBatchBackend):
+    """
+    A backend that drops the last translation of each batch.
+    """
+
+    def translate_batch(self, texts, src, dest):
+        return super().translate_batch(texts, src, dest)[:-1]
+
+
+class TestTranslationManager(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "translations.sqlite3")
+        self.backend = FakeBackend()
+        self.translation_manager = TranslationManager(
+            backend=self.backend, cache=TranslationCache(self.cache_path)
+        )
+
+    def tearDown(self):
+        self.translation_manager.cache.close()
+        self.directory.cleanup()
+
+    def test_translate_calls_backend_once(self):
+        first = self.translation_manager.translate("Start", "en", "pt")
+        second = self.translation_manager.translate("Start", "en", "pt")
+
+        self.assertEqual(first, "pt:Start")
+        self.assertEqual(second, "pt:Start")
+        self.assertEqual(self.backend.calls, 1)
+
+    def test_translate_same_language_skips_backend(self):
+        self.assertEqual(
+            self.translation_manager.translate("Start", "en", "en"), "Start"
+        )
+        self.assertEqual(self.backend.calls, 0)
+
+    def test_cache_persists_between_runs(self):
+        self.translation_manager.translate("Start", "en", "pt")
+        self.translation_manager.cache.close()
+
+        backend = FakeBackend()
+        translation_manager = TranslationManager(
+            backend=backend, cache=TranslationCache(self.cache_path)
+        )
+
+        self.assertEqual(translation_manager.translate("Start", "en", "pt"), "pt:Start")
+        self.assertEqual(backend.calls, 0)
+        self.assertEqual(translation_manager.cache.stats()["hit_rate"], 1.0)
+        self.assertEqual(translation_manager.cache.stats()["entries"], 1)
+        translation_manager.cache.close()
+
+    def test_cache_is_keyed_by_backend(self):
+        cache = self.translation_manager.cache
+        cache.set("Start", "en", "pt", "other", "Iniciar")
+
+        self.assertIsNone(cache.get("Start", "en", "pt", "fake"))
+        self.assertEqual(cache.get("Start", "en", "pt", "other"), "Iniciar")
+
+    def test_translate_many_deduplicates_and_batches(self):
+        backend = SlowBatchBackend()
+        translation_manager = TranslationManager(
+            backend=backend, cache=self.translation_manager.cache, batch_size=2
+        )
+
+        translations = translation_manager.translate_many(
+            [
+                ("Start", "en", "pt"),
+                ("Load", "en", "pt"),
+                ("Start", "en", "pt"),
+                ("Quit", "en", "pt"),
+                ("Start", "en", "es"),
+                ("Start", "en", "en"),
+            ]
+        )
+
+        self.assertEqual(translations[("Start", "en", "pt")], "pt:Start")
+        self.assertEqual(translations[("Start", "en", "es")], "es:Start")
+        self.assertEqual(translations[("Start", "en", "en")], "Start")
+        self.assertEqual(
+            sorted(len(texts) for texts, _, _ in backend.batches), [1, 1, 2]
+        )
+
+    def test_translate_many_skips_cached_texts(self):
+        backend = SlowBatchBackend()
+        translation_manager = TranslationManager(
+            backend=backend, cache=self.translation_manager.cache
+        )
+        translation_manager.translate_many([("Start", "en", "pt")])
+
+        translation_manager.translate_many(
+            [("Start", "en", "pt"), ("Load", "en", "pt")]
+        )
+
+        self.assertEqual(backend.batches[-1], (("Load",), "en", "pt"))
+
+    def test_translate_many_caches_batches_before_a_failure(self):
+        translation_manager = TranslationManager(
+            backend=FailingBatchBackend("es"),
+            cache=self.translation_manager.cache,
+            batch_size=1,
+        )
+
+        with self.assertRaises(ConnectionError):
+            translation_manager.translate_many(
+                [("Start", "en", "pt"), ("Start", "en", "es"), ("Load", "en", "pt")]
+            )
+
+        self.assertEqual(
+            self.translation_manager.cache.get("Start", "en", "pt", "slow"), "pt:Start"
+        )
+        self.assertEqual(
+            self.translation_manager.cache.get("Load", "en", "pt", "slow"), "pt:Load"
+        )
+        self.assertIsNone(
+            self.translation_manager.cache.get("Start", "en", "es", "slow")
+        )
+
+    def test_translate_many_rejects_incomplete_batches(self):
+        translation_manager = TranslationManager(
+            backend=ShortBatchBackend(), cache=self.translation_manager.cache
+        )
+
+        with self.assertRaisesRegex(ValueError, "1 translations for a batch of 2"):
+            translation_manager.translate_many(
+                [("Start", "en", "pt"), ("Load", "en", "pt")]
+            )
+
+        self.assertIsNone(
+            self.translation_manager.cache.get("Start", "en", "pt", "slow")
+        )
+
+    def test_translate_many_runs_batches_concurrently(self):
+        requests = [
+            (f"text {index}", "en", dest)
+            for dest in ("pt", "es", "fr", "de")
+            for index in range(4)
+        ]
+        # Every batch waits until all of them are being translated, so they only finish if they run at once
+        barrier = threading.Barrier(8, timeout=5)
+        backend = SlowBatchBackend(barrier)
+        translation_manager = TranslationManager(
+            backend=backend,
+            cache=self.translation_manager.cache,
+            batch_size=2,
+            concurrency=8,
+        )
+
+        translations = translation_manager.translate_many(requests)
+
+        self.assertFalse(barrier.broken)
+        self.assertEqual(len(backend.batches), 8)
+        self.assertEqual(translations[("text 3", "en", "de")], "de:text 3")
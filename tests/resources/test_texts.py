@@ -1,3 +1,8 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
 from unittest import TestCase
 from unittest.mock import MagicMock
 
@@ -17,6 +22,121 @@ class TestTexts(TestCase):
             len(self.text_manager.static_texts["menu_items"]["English"]), 5
         )
 
+    def translation_manager(self):
+        translation_manager = MagicMock()
+        translation_manager.sent = []
+
+        def translate_many(requests):
+            requests = list(requests)
+            translation_manager.sent.extend(requests)
+            return {(text, src, dest): f"{dest}:{text}" for text, src, dest in requests}
+
+        translation_manager.translate_many.side_effect = translate_many
+        return translation_manager
+
+    def test_text_manager_translates_lazily(self):
+        translation_manager = self.translation_manager()
+        text_manager = TextManager(translation_manager=translation_manager)
+
+        translation_manager.translate_many.assert_not_called()
+
+        self.assertEqual(
+            text_manager.static_texts["menu_items"]["Portuguese"][0], "pt:Start"
+        )
+        self.assertEqual(
+            text_manager.static_texts["dialogue"]["Portuguese"][1], "pt:Save"
+        )
+        translation_manager.translate_many.assert_called_once()
+
+    def test_text_manager_loads_catalog(self):
+        translation_manager = MagicMock()
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_path = os.path.join(directory, "catalog.json")
+            with open(catalog_path, "w") as catalog_file:
+                json.dump(
+                    {
+                        "fingerprint": self.text_manager.fingerprint(),
+                        "languages": {
+                            "English": {"menu_items": ["Begin"]},
+                            "Portuguese": {
+                                "menu_items": ["Iniciar"],
+                                "about": ["Sobre", "Bem-vindo"],
+                                "help": ["Como jogar", "Use as setas"],
+                                "dialogue": ["Sair", "Salvar"],
+                            },
+                        },
+                    },
+                    catalog_file,
+                )
+
+            text_manager = TextManager(
+                catalog_path=catalog_path, translation_manager=translation_manager
+            )
+
+        self.assertEqual(
+            text_manager.static_texts["menu_items"]["Portuguese"], ["Iniciar"]
+        )
+        self.assertEqual(
+            text_manager.static_texts["dialogue"]["Portuguese"], ("Sair", "Salvar")
+        )
+        self.assertEqual(text_manager.static_texts["menu_items"]["English"][0], "Start")
+        translation_manager.translate_many.assert_not_called()
+
+    def test_text_manager_translates_sections_missing_from_catalog(self):
+        translation_manager = self.translation_manager()
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_path = os.path.join(directory, "catalog.json")
+            with open(catalog_path, "w") as catalog_file:
+                json.dump(
+                    {
+                        "fingerprint": self.text_manager.fingerprint(),
+                        "languages": {"Portuguese": {"menu_items": ["Iniciar"]}},
+                    },
+                    catalog_file,
+                )
+
+            text_manager = TextManager(
+                catalog_path=catalog_path, translation_manager=translation_manager
+            )
+
+        self.assertEqual(
+            text_manager.static_texts["menu_items"]["Portuguese"], ["Iniciar"]
+        )
+        self.assertEqual(
+            text_manager.static_texts["help"]["Portuguese"][0], "pt:How to Play"
+        )
+        self.assertIn(("How to Play", "en", "pt"), translation_manager.sent)
+        self.assertNotIn(("Start", "en", "pt"), translation_manager.sent)
+
+    def test_text_manager_ignores_outdated_catalog(self):
+        translation_manager = self.translation_manager()
+        with tempfile.TemporaryDirectory() as directory:
+            catalog_path = os.path.join(directory, "catalog.json")
+            compiled = TextManager(translation_manager=translation_manager)
+            compiled.texts["English"]["menu_items"][0] = "Begin"
+            compiled.compile_catalog(catalog_path)
+
+            # The text was edited after the catalog was compiled
+            text_manager = TextManager(
+                catalog_path=catalog_path, translation_manager=translation_manager
+            )
+
+        self.assertEqual(text_manager.static_texts["menu_items"]["English"][0], "Start")
+        self.assertEqual(
+            text_manager.static_texts["menu_items"]["Portuguese"][0], "pt:Start"
+        )
+
+    def test_importing_engine_does_not_import_translator(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        code = (
+            f"import sys; sys.path.insert(0, {root!r}); import engine; "
+            "sys.exit('googletrans' in sys.modules)"
+        )
+
+        result = subprocess.run([sys.executable, "-I", "-c", code], cwd=root)
+
+        self.assertEqual(result.returncode, 0)
+
     # def test_text_manager_translation(self):
     #     for item in self.text_manager.static_texts.keys():
     #         self.assertEqual(list(self.text_manager.static_texts[item].keys()),  list(self.config.available_languages.values()))
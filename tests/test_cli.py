@@ -1,11 +1,17 @@
 import os
+import runpy
 import subprocess
-from unittest import TestCase
+import tempfile
+import textwrap
+from unittest import TestCase, mock
 
+import pygame
 from pytest import MonkeyPatch
 
-from cli import build_visual_novel
-from configs import config
+import cli
+from configs import RESOLUTION_ENV, Config, config
+from managers.archive_manager import AssetArchive
+from managers.replay_manager import InputRecorder
 
 
 class TestCli(TestCase):
@@ -23,10 +29,12 @@ class TestCli(TestCase):
             m.setattr(subprocess, "run", lambda *args, **kwargs: None)
             m.setattr(os, "makedirs", lambda *args, **kwargs: None)
             m.setattr(config, "resolution", "hd")
+            m.setattr(cli, "compile_text_catalog", lambda: "texts_catalog.json")
+            m.setattr(cli, "check_cohesion", lambda source_dir: True)
 
             # assert it doesn't raise an error and return None
             self.assertEqual(
-                build_visual_novel(
+                cli.build_visual_novel(
                     self.source_dir,
                     self.output_dir,
                     self.platforms,
@@ -35,3 +43,240 @@ class TestCli(TestCase):
                 ),
                 None,
             )
+
+    def write_story(self, directory, choices):
+        path = os.path.join(directory, "story.py")
+        with open(path, "w") as story_file:
+            story_file.write(
+                textwrap.dedent(
+                    f"""
+                    from engine import Story
+
+                    story = Story()
+                    story.add_scene("start", "You wake up.")
+                    for scene, choice, next_scene in {choices!r}:
+                        story.add_choice(scene, choice, next_scene)
+                    """
+                )
+            )
+        return path
+
+    def test_check_cohesion(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_story(
+                directory,
+                [("start", "Leave", "end_scene"), ("start", "Stay", "start")],
+            )
+
+            self.assertTrue(cli.check_cohesion(path))
+
+    def test_check_cohesion_not_cohesive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_story(
+                directory,
+                [("start", "Leave", "nowhere"), ("start", "Stay", "start")],
+            )
+
+            self.assertFalse(cli.check_cohesion(path))
+
+    def test_simulate_story(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_story(
+                directory,
+                [("start", "Leave", "end_scene"), ("start", "Stay", "start")],
+            )
+
+            self.assertTrue(cli.simulate_story(path, runs=100, jobs=1, seed=1))
+            self.assertTrue(cli.simulate_story(path, exhaustive=True))
+
+    def test_simulate_story_stuck(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_story(
+                directory,
+                [("start", "Leave", "nowhere"), ("start", "Stay", "start")],
+            )
+
+            self.assertFalse(cli.simulate_story(path, runs=100, jobs=1))
+
+    def test_replay_session(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_story(
+                directory,
+                [("start", "Leave", "end_scene"), ("start", "Stay", "start")],
+            )
+            recording = os.path.join(directory, "session.pnir")
+            recorder = InputRecorder(recording, 30)
+            for frame in range(3):
+                recorder.record(
+                    frame, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)]
+                )
+            recorder.close()
+
+            # Nothing is translated, the session is played in English
+            with mock.patch("engine.Story.translate_pending"):
+                result = cli.replay_session(recording, path)
+
+            self.assertEqual(result["game_state"], "in_choice")
+            self.assertIsNone(cli.replay_session(path, path))
+
+    def test_build_visual_novel_aborts_when_not_cohesive(self):
+        with MonkeyPatch().context() as m:
+            run = mock.MagicMock()
+            m.setattr(subprocess, "run", run)
+            m.setattr(cli, "check_cohesion", lambda source_dir: False)
+
+            cli.build_visual_novel(
+                self.source_dir,
+                self.output_dir,
+                self.platforms,
+                self.resolutions,
+                self.languages,
+            )
+
+            run.assert_not_called()
+
+    def test_build_targets_isolated_configs(self):
+        commands = []
+
+        def run(args, **kwargs):
+            commands.append(args)
+            kwargs["stdout"].write("built\n")
+
+        with tempfile.TemporaryDirectory() as directory, MonkeyPatch().context() as m:
+            m.setattr(subprocess, "run", run)
+
+            results = cli.build_targets(
+                self.source_dir,
+                directory,
+                [("linux", resolution) for resolution in self.resolutions],
+                "texts_catalog.json",
+                jobs=1,
+            )
+
+            self.assertTrue(all(result["success"] for result in results))
+            for resolution, command in zip(self.resolutions, commands):
+                work_path = os.path.join(directory, f"build_linux_{resolution}")
+                archive_path = os.path.join(work_path, "assets.pna")
+                self.assertIn(f"--add-data={archive_path}:./resources/", command)
+                archive = AssetArchive(archive_path)
+                self.assertIn(f"resources/images/{resolution}/doggo.png", archive)
+                archive.close()
+                # The game starts on the resolution it was built for
+                hook_path = os.path.join(work_path, "resolution_hook.py")
+                self.assertIn(f"--runtime-hook={hook_path}", command)
+                with mock.patch.dict(os.environ):
+                    os.environ.pop(RESOLUTION_ENV, None)
+                    runpy.run_path(hook_path)
+                    self.assertEqual(Config().resolution, resolution)
+                self.assertIn(f"--workpath={work_path}", command)
+                self.assertIn(f"--specpath={work_path}", command)
+            for result in results:
+                with open(result["log"]) as log_file:
+                    self.assertEqual(log_file.read(), "built\n")
+        self.assertEqual(config.resolution, "hd")
+
+    def test_pyinstaller_args_ship_compiled_story(self):
+        with tempfile.TemporaryDirectory() as directory, MonkeyPatch().context() as m:
+            m.chdir(directory)
+            args = cli.pyinstaller_args(
+                "linux", "hd", "main.py", "dist", "build", "texts_catalog.json"
+            )
+            self.assertFalse(any("story.pnb" in arg for arg in args))
+
+            open("story.pnb", "wb").close()
+            args = cli.pyinstaller_args(
+                "linux", "hd", "main.py", "dist", "build", "texts_catalog.json"
+            )
+            bundle_path = os.path.join(os.path.realpath(directory), "story.pnb")
+            self.assertIn(f"--add-data={bundle_path}:.", args)
+
+    def test_build_targets_reports_failures(self):
+        def run(args, **kwargs):
+            if args[0] == "wine":
+                raise subprocess.CalledProcessError(1, args)
+
+        with tempfile.TemporaryDirectory() as directory, MonkeyPatch().context() as m:
+            m.setattr(subprocess, "run", run)
+
+            results = cli.build_targets(
+                self.source_dir,
+                directory,
+                [(platform, "hd") for platform in self.platforms],
+                "texts_catalog.json",
+                jobs=1,
+            )
+
+        self.assertEqual(
+            [(result["platform"], result["success"]) for result in results],
+            [("linux", True), ("windows", False)],
+        )
+        self.assertEqual(results[1]["error"], "wine exited with code 1")
+
+    def test_build_targets_in_parallel(self):
+        with tempfile.TemporaryDirectory() as directory:
+            results = cli.build_targets(
+                self.source_dir,
+                directory,
+                [("amiga", "hd"), ("amiga", "4k"), ("atari", "hd"), ("atari", "4k")],
+                "texts_catalog.json",
+                jobs=2,
+            )
+
+        self.assertEqual(
+            [(result["platform"], result["resolution"]) for result in results],
+            [("amiga", "hd"), ("amiga", "4k"), ("atari", "hd"), ("atari", "4k")],
+        )
+        self.assertFalse(any(result["success"] for result in results))
+
+    def test_build_visual_novel_skips_unchanged_targets(self):
+        commands = []
+        steps = []
+
+        with tempfile.TemporaryDirectory() as directory, MonkeyPatch().context() as m:
+            catalog_path = os.path.join(directory, "texts_catalog.json")
+            with open(catalog_path, "w") as catalog_file:
+                catalog_file.write("{}")
+            m.setattr(subprocess, "run", lambda args, **kwargs: commands.append(args))
+            m.setattr(
+                cli, "check_cohesion", lambda source_dir: not steps.append("check")
+            )
+            m.setattr(cli, "run_tests", lambda: not steps.append("tests"))
+            m.setattr(cli, "format_code", lambda: steps.append("format"))
+            m.setattr(cli, "compile_text_catalog", lambda: catalog_path)
+
+            def build(force=False):
+                commands.clear()
+                steps.clear()
+                cli.build_visual_novel(
+                    self.source_dir,
+                    directory,
+                    self.platforms,
+                    ["hd"],
+                    self.languages,
+                    jobs=1,
+                    force=force,
+                )
+
+            build()
+            self.assertEqual(len(commands), 2)
+            self.assertEqual(steps, ["check", "tests", "format"])
+
+            # Nothing changed
+            build()
+            self.assertEqual(commands, [])
+            self.assertEqual(steps, [])
+
+            # Only the targets whose output is gone are rebuilt
+            os.rmdir(os.path.join(directory, "dist_windows_hd"))
+            build()
+            self.assertEqual([command[0] for command in commands], ["wine"])
+
+            # The static texts are an input of every target
+            with open(catalog_path, "w") as catalog_file:
+                catalog_file.write('{"English": {}}')
+            build()
+            self.assertEqual(len(commands), 2)
+
+            build(force=True)
+            self.assertEqual(len(commands), 2)
+            self.assertEqual(steps, ["check", "tests", "format"])
@@ -1,9 +1,17 @@
+import os
+import tempfile
 from unittest import TestCase, mock
 from unittest.mock import MagicMock
 
-from configs import config
-from engine import States, Story
+import pygame
+
+from configs import Config, config
+from engine import States, Story, load_story
 from errors.story import StoryCohesionError
+from handlers.screen import ScreenHandler
+from managers.replay_manager import InputRecorder
+from managers.snapshot_manager import SessionSnapshot
+from managers.translation_manager import TranslationCache, TranslationManager
 
 
 class StoryTest(TestCase):
@@ -38,6 +46,52 @@ class StoryTest(TestCase):
 
         self.assertRaises(StoryCohesionError, self.story.check_story)
 
+    def test_check_story_exception_has_report(self):
+        self.story.add_scene("start", "This is the first scene")
+        self.story.add_choice("start", "choice1", "end_scene")
+        self.story.add_choice("start", "choice2", "missing_scene")
+
+        with self.assertRaises(StoryCohesionError) as context:
+            self.story.check_story()
+
+        self.assertEqual(
+            context.exception.report.dangling_choices, [("start", "missing_scene")]
+        )
+        self.assertIn("missing_scene", context.exception.message)
+
+    def test_load_story(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "story.py")
+            with open(path, "w") as story_file:
+                story_file.write(
+                    "from engine import Story\n"
+                    "story = Story()\n"
+                    "story.add_scene('start', 'Hello')\n"
+                    "story.add_choice('start', 'Bye', 'end_scene')\n"
+                    "if __name__ == '__main__':\n"
+                    "    story.run()\n"
+                )
+
+            story = load_story(path)
+
+        # No window is opened: the story is drawn offscreen
+        self.assertTrue(story.headless)
+        self.assertTrue(
+            story.screen is not pygame.display.get_surface()
+            or pygame.display.get_driver() == "dummy"
+        )
+        self.assertFalse(Story.headless_mode)
+        self.assertEqual(story.choices["English"]["start"], [("Bye", "end_scene")])
+        self.assertTrue(story.pending_translations)
+
+    def test_load_story_without_story(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "story.py")
+            with open(path, "w") as story_file:
+                story_file.write("value = 1\n")
+
+            self.assertRaises(ValueError, load_story, path)
+
     def test_add_scene(self):
         expected_scene = ("scene1", "This is the first scene")
 
@@ -46,9 +100,95 @@ class StoryTest(TestCase):
         # languages = self.config.languages
 
         self.assertEqual(list(self.story.scenes.keys()), ["English"])
+        self.assertEqual(self.story.scene_positions, {"scene1": 0})
         # for language in languages:
         #     self.assertEqual(list(self.story.scenes[language].keys())[0], expected_scene[0])
 
+    def test_add_scene_and_choice_queue_translations(self):
+        story = Story()
+        backend = mock.MagicMock()
+        backend.name = "mock"
+        backend.translate_batch.side_effect = lambda texts, src, dest: [
+            f"{dest}:{text}" for text in texts
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            translation_manager = TranslationManager(
+                backend=backend,
+                cache=TranslationCache(os.path.join(directory, "cache.sqlite3")),
+            )
+            with mock.patch("engine.TranslationManagerInstance", translation_manager):
+                story.add_scene("start", "Hello")
+                story.add_choice("start", "Go", "end_scene")
+                story.add_choice("start", "Stay", "start")
+                backend.translate_batch.assert_not_called()
+
+                story.translate_pending()
+            translation_manager.cache.close()
+
+        self.assertEqual(story.scenes["English"]["start"]["description"], "Hello")
+        self.assertEqual(story.scenes["Portuguese"]["start"]["description"], "pt:Hello")
+        self.assertEqual(
+            story.choices["Spanish"]["start"],
+            [("es:Go", "end_scene"), ("es:Stay", "start")],
+        )
+        self.assertEqual(story.pending_translations, [])
+
+    def test_compile_and_load_bundle(self):
+        self.story.add_scene("start", "This is the first scene")
+        self.story.add_choice("start", "choice1", "end_scene")
+        self.story.add_choice("start", "choice2", "start")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.story.compile(os.path.join(directory, "story.pnb"))
+            story = Story(no_translation=True)
+            story.add_scene("start", "This is the first scene")
+            story.add_choice("start", "choice1", "end_scene")
+            story.add_choice("start", "choice2", "start")
+
+            self.assertTrue(story.load_bundle(path))
+            self.assertEqual(
+                story.scenes["English"]["start"], self.story.scenes["English"]["start"]
+            )
+            self.assertEqual(
+                list(story.scene_positions), list(story.bundle.scene_ids())
+            )
+            self.assertEqual(
+                story.choices["English"]["start"],
+                self.story.choices["English"]["start"],
+            )
+            story.bundle.close()
+
+    def test_bundle_matches_story_from_another_location(self):
+        self.story.add_scene("start", "This is the first scene", image="doggo.png")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.story.compile(os.path.join(directory, "story.pnb"))
+            moved_config = Config()
+            moved_config.image_path = os.path.join(directory, "frozen", "images", "")
+            story = Story(config=moved_config, no_translation=True)
+            story.add_scene("start", "This is the first scene", image="doggo.png")
+
+            self.assertTrue(story.load_bundle(path))
+            self.assertEqual(
+                story.scenes["English"]["start"]["image"],
+                f"{moved_config.image_path}doggo.png",
+            )
+            story.bundle.close()
+
+    def test_load_outdated_bundle(self):
+        self.story.add_scene("start", "This is the first scene")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.story.compile(os.path.join(directory, "story.pnb"))
+            story = Story(no_translation=True)
+            story.add_scene("start", "This scene changed")
+
+            self.assertFalse(story.load_bundle(path))
+            self.assertEqual(
+                story.scenes["English"]["start"]["description"], "This scene changed"
+            )
+
     @mock.patch("builders.menu.MenuBuilder.build_language_menu")
     def test_screen_manager_language_menu_flow(self, mock_build_language_menu):
         self.story.current_game_state = self.states.language_menu
@@ -77,6 +217,336 @@ class StoryTest(TestCase):
 
         mock_build_help_screen.assert_any_call()
 
+    def test_can_idle(self):
+        self.story.dirty = False
+
+        self.assertTrue(self.story.can_idle())
+
+        self.story.popup_info = {"start_time": 0, "duration": 3000}
+
+        self.assertFalse(self.story.can_idle())
+
+    def test_wait_next_frame_updates_frame_stats(self):
+        self.story.popup_info = {"start_time": 0, "duration": 3000}
+
+        self.story.wait_next_frame()
+
+        self.assertEqual(self.story.frame_stats()["frame_count"], 1)
+        self.assertEqual(self.story.frame_stats()["idle_frames"], 0)
+
+    def test_wait_next_frame_idle_keeps_event(self):
+        self.story.dirty = False
+        pygame.event.clear()
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN)
+
+        with mock.patch("pygame.event.wait", return_value=event):
+            self.story.wait_next_frame()
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_DOWN))
+
+        self.assertEqual(self.story.frame_stats()["idle_frames"], 1)
+        self.assertEqual(
+            [e.type for e in self.story.poll_events()],
+            [pygame.KEYDOWN, pygame.KEYUP],
+        )
+
+    def test_wait_next_frame_doesnt_idle_with_queued_events(self):
+        self.story.dirty = False
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_DOWN))
+
+        with mock.patch("pygame.event.wait") as wait:
+            self.story.wait_next_frame()
+
+        wait.assert_not_called()
+        self.assertEqual(
+            [e.type for e in self.story.poll_events()],
+            [pygame.KEYDOWN, pygame.KEYUP],
+        )
+
+    @mock.patch("pygame.display.flip")
+    @mock.patch("engine.Story.screen_manager")
+    def test_render_frame_skips_clean_frames(self, mock_screen_manager, mock_flip):
+        self.story.render_frame()
+        self.story.render_frame()
+
+        mock_screen_manager.assert_called_once()
+        mock_flip.assert_called_once()
+        self.assertFalse(self.story.needs_redraw())
+
+    @mock.patch("pygame.display.update")
+    @mock.patch("pygame.display.flip")
+    @mock.patch("engine.Story.screen_manager")
+    def test_render_frame_updates_dirty_rects(
+        self, mock_screen_manager, mock_flip, mock_update
+    ):
+        rects = [pygame.Rect(0, 0, 10, 10)]
+        self.story.dirty = False
+        self.story.mark_dirty(rects)
+
+        self.story.render_frame()
+
+        # Only the dirty areas are drawn again
+        mock_screen_manager.assert_not_called()
+        mock_flip.assert_not_called()
+        mock_update.assert_called_once_with(rects)
+
+    def test_render_frame_redraws_only_dirty_choices(self):
+        story = self.headless_story()
+        story.selected_language = "English"
+        story.current_game_state = "in_choice"
+        story.render_frame()
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN)
+        ScreenHandler.handle_game_choice_screen(story, event)
+
+        with mock.patch("engine.Story.screen_manager") as mock_screen_manager:
+            story.render_frame()
+
+        mock_screen_manager.assert_not_called()
+        self.assertEqual(
+            [button.text_color for button in story.choices_items],
+            [config.colors["white"], config.colors["active_pink"]],
+        )
+        self.assertFalse(story.needs_redraw())
+
+    @mock.patch("engine.Story.screen_manager")
+    def test_render_frame_rebuilds_screen_under_popup(self, mock_screen_manager):
+        self.story.dirty = False
+        self.story.popup_info = {"start_time": 0, "duration": 3000}
+        self.story.mark_dirty([pygame.Rect(0, 0, 10, 10)])
+
+        with mock.patch("builders.popup.PopupBuilder.draw_popup", return_value=True):
+            self.story.render_frame()
+
+        mock_screen_manager.assert_called_once()
+
+    def test_headless_story_renders_every_state(self):
+        story = Story(no_translation=True, headless=True)
+        story.add_scene("start", "You wake up.", "Doggo", "doggo.png")
+        story.add_choice("start", "Leave", "end_scene")
+        story.add_choice("start", "Stay", "start")
+        story.selected_language = "English"
+        states = [
+            self.states.language_menu,
+            self.states.main_menu,
+            self.states.about,
+            self.states.help,
+            self.states.game,
+            "in_choice",
+        ]
+
+        for state in states:
+            story.current_game_state = state
+            story.screen.fill((1, 2, 3))
+            story.mark_dirty()
+
+            story.render_frame()
+
+            # Something was drawn over the fill color
+            self.assertNotEqual(
+                pygame.image.tobytes(story.screen, "RGB"),
+                bytes((1, 2, 3)) * story.width * story.height,
+            )
+        self.assertEqual(len(story.choices_items), 2)
+
+    @mock.patch("pygame.display.flip")
+    def test_headless_story_on_offscreen_surface_isnt_presented(self, mock_flip):
+        self.story.screen = pygame.Surface((10, 10))
+
+        self.story.present()
+
+        mock_flip.assert_not_called()
+
+    def test_f3_toggles_profiler_overlay(self):
+        story = Story(no_translation=True, headless=True)
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+
+        story.pre_game_event_handler()
+        story.render_frame()
+
+        self.assertTrue(story.profiler.overlay)
+        self.assertTrue(story.needs_redraw())
+
+    def test_main_loop_records_frames(self):
+        self.story.profiler.enable()
+        self.story.render_frame = MagicMock()
+        self.story.wait_next_frame = MagicMock(
+            side_effect=lambda: setattr(self.story, "running", False)
+        )
+
+        self.story.main_loop()
+
+        self.assertEqual(self.story.profiler.frame_count, 1)
+
+    def headless_story(self):
+        story = Story(no_translation=True, headless=True)
+        story.add_scene("start", "You wake up.")
+        story.add_choice("start", "Stay", "start")
+        story.add_choice("start", "Leave", "hallway")
+        story.add_scene("hallway", "You find a hallway.")
+        story.add_choice("hallway", "Go back", "start")
+        story.add_choice("hallway", "Get out", "end_scene")
+        return story
+
+    def test_record_and_replay_session(self):
+        keys = [pygame.K_RETURN, pygame.K_RETURN, pygame.K_RETURN, pygame.K_DOWN]
+        keys += [pygame.K_RETURN, pygame.K_RETURN]
+        story = self.headless_story()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.pnir")
+            story.recorder = InputRecorder(path, story.fps)
+            pygame.event.clear()
+            for key in keys:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+                story.render_frame()
+                story.pre_game_event_handler()
+                story.frame_count += 2
+            story.recorder.close()
+
+            replayed = self.headless_story()
+            result = replayed.replay(path)
+
+        self.assertEqual(story.current_scene, "hallway")
+        self.assertEqual(result["scene"], story.current_scene)
+        self.assertEqual(result["game_state"], story.current_game_state)
+        self.assertEqual(result["frame_count"], story.frame_count - 1)
+        self.assertIsNone(replayed.replayer)
+
+    def test_replay_uses_recorded_frame_times(self):
+        story = self.headless_story()
+        frame_ticks = [1000, 1016, 1250, 1266]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.pnir")
+            recorder = InputRecorder(path, story.fps)
+            for frame, ticks in enumerate(frame_ticks):
+                recorder.record_frame(frame, ticks)
+            recorder.record(3, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP)])
+            recorder.close()
+
+            seen = []
+            with mock.patch.object(
+                Story, "render_frame", lambda story: seen.append(story.ticks())
+            ):
+                story.replay(path)
+
+        self.assertEqual(seen, [0, 16, 250, 266])
+
+    def test_replay_doesnt_touch_saved_games(self):
+        story = self.headless_story()
+        keys = [pygame.K_RETURN, pygame.K_RETURN, pygame.K_s]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.pnir")
+            recorder = InputRecorder(path, story.fps)
+            for frame, key in enumerate(keys):
+                recorder.record(
+                    frame, [pygame.event.Event(pygame.KEYDOWN, key=key, mod=0)]
+                )
+            recorder.close()
+
+            with mock.patch(
+                "managers.save_manager.SaveStore.add", autospec=True
+            ) as add:
+                story.replay(path)
+
+        self.assertEqual(add.call_count, 1)
+        self.assertNotEqual(
+            add.call_args.args[0].directory, os.path.abspath("saved_games")
+        )
+        self.assertFalse(os.path.exists(add.call_args.args[0].directory))
+        self.assertEqual(story.save_directory, "saved_games")
+
+    def test_save_game_encodes_on_writer(self):
+        story = self.headless_story()
+        story.save_writer = mock.MagicMock()
+        story.add_scene("hallway", "A hallway")
+        story.current_scene = "hallway"
+
+        with mock.patch.object(SessionSnapshot, "encode") as encode:
+            story.save_game()
+
+        encode.assert_not_called()
+        story.save_writer.submit.assert_called_once_with(
+            story.snapshot(), scene_positions=story.scene_positions
+        )
+
+    def test_collect_saves_shows_popup(self):
+        self.story.save_writer = MagicMock()
+        self.story.save_writer.poll.return_value = [("default", None, 1)]
+
+        self.story.collect_saves()
+
+        self.assertIsNotNone(self.story.popup_info)
+        self.story.save_writer.poll.return_value = [
+            ("default", OSError("disk full"), 1)
+        ]
+
+        with mock.patch("engine.Story.show_popup") as show_popup:
+            self.story.collect_saves()
+
+        show_popup.assert_called_once_with("save_failed")
+
+    def test_snapshot_and_restore(self):
+        story = self.headless_story()
+        story.selected_language = "English"
+        story.current_scene = "hallway"
+        story.history = ["start", "hallway"]
+        story.flags = {"lights_on": True}
+        snapshot = SessionSnapshot.decode(
+            story.snapshot().encode(story.scene_positions, 6)
+        )
+        restored = self.headless_story()
+
+        restored.restore(snapshot)
+
+        self.assertEqual(restored.current_scene, "hallway")
+        self.assertEqual(restored.selected_language, "English")
+        self.assertEqual(restored.history, ["start", "hallway"])
+        self.assertEqual(restored.flags, {"lights_on": True})
+
+    def test_popup_is_hidden_by_scheduler(self):
+        self.story.show_popup("save_success")
+        shown_at = self.story.ticks()
+
+        self.assertIn("popup", self.story.scheduler)
+        self.story.scheduler.run_due(shown_at + self.story.popup_info["duration"])
+
+        self.assertIsNone(self.story.popup_info)
+        self.assertTrue(self.story.dirty)
+
+    def test_wait_next_frame_idles_until_next_timer(self):
+        self.story.dirty = False
+        pygame.event.clear()
+        self.story.after(30, lambda: None)
+
+        with mock.patch(
+            "pygame.event.wait", return_value=pygame.event.Event(pygame.NOEVENT)
+        ) as wait:
+            self.story.wait_next_frame()
+
+        self.assertLessEqual(wait.call_args.args[0], 30)
+        self.assertEqual(self.story.frame_stats()["idle_frames"], 1)
+
+    @mock.patch.object(config, "transition", "wipe")
+    @mock.patch("engine.Story.screen_manager")
+    def test_render_frame_draws_transition(self, mock_screen_manager):
+        self.story.start_transition()
+
+        self.story.render_frame()
+        self.story.render_frame()
+
+        # The next scene is only drawn once, then the transition is drawn from its frames
+        mock_screen_manager.assert_called_once()
+        self.assertTrue(self.story.needs_redraw())
+
+        with mock.patch("engine.Story.ticks", return_value=self.story.ticks() + 1000):
+            self.story.render_frame()
+        self.assertFalse(self.story.transition.active)
+        self.assertFalse(self.story.needs_redraw())
+
     # @mock.patch('engine.StoryFlow.run_flow')
     # def test_screen_manager_language_menu_flow(self, mock_story_flow):
     #     self.story.current_game_state = self.states.game